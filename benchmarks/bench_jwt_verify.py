@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+JWT Verify Benchmark
+verify_token'ın yerel doğrulama yolunun saniyedeki doğrulama sayısını ölçer.
+
+Senaryolar:
+  - cached key:   önceden oluşturulmuş HMAC anahtarı ile imza + exp kontrolü
+  - string key:   her çağrıda secret'tan anahtar oluşturma (cache'siz)
+  - bad signature / expired: I/O'suz reddetme yolu
+
+Kullanım:
+    python benchmarks/bench_jwt_verify.py [--iterations 20000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jose import jwt
+
+from jwt_verifier import JWTVerifier
+
+SECRET = "benchmark-jwt-secret-with-at-least-32-chars"
+
+
+def make_token(secret: str = SECRET, exp_offset: int = 3600) -> str:
+    return jwt.encode(
+        {
+            "sub": "8f14e45f-ceea-467f-a0e6-7f1c2b1a9d3e",
+            "email": "bench@example.com",
+            "aud": "authenticated",
+            "role": "authenticated",
+            "exp": int(time.time()) + exp_offset,
+        },
+        secret,
+        algorithm="HS256",
+    )
+
+
+def measure(label: str, func, token: str, iterations: int):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func(token)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<16} {iterations / elapsed:10.0f} verifications/s "
+        f"({elapsed / iterations * 1e6:6.1f}µs each)"
+    )
+
+
+def main(iterations: int):
+    print(f"📊 JWT verification benchmark - {iterations} iterations per scenario")
+    verifier = JWTVerifier(secret=SECRET, algorithms=["HS256"], audience=None)
+    valid = make_token()
+
+    def string_key(token: str):
+        return jwt.decode(
+            token, SECRET, algorithms=["HS256"], options={"verify_aud": False}
+        )
+
+    assert verifier.verify(valid) is not None
+    measure("cached key", verifier.verify, valid, iterations)
+    measure("string key", string_key, valid, iterations)
+    measure("bad signature", verifier.verify, make_token(secret="x" * 40), iterations)
+    measure("expired", verifier.verify, make_token(exp_offset=-60), iterations)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.iterations)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+LLM HTTP Pool Benchmark
+/api/chat başına paylaşılan bağlantı havuzunun TCP+TLS handshake tasarrufunu ölçer.
+
+Her /api/chat çağrısı iki LLM isteği yapar (Gemini + GPT-OSS). Karşılaştırma:
+  - fresh:  her çağrıda yeni httpx.AsyncClient (eski davranış)
+  - pooled: startup'ta açılan tek, keep-alive havuzlu client
+
+Kullanım:
+    python benchmarks/bench_llm_http_pool.py [--calls 50]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_server import StubServer
+from real_data_collector import RealDataCollector
+
+
+def make_collector(server: StubServer) -> RealDataCollector:
+    collector = RealDataCollector()
+    collector.openrouter_url = f"{server.base_url}/api/v1/chat/completions"
+    collector.gemini_base_url = f"{server.base_url}/v1beta"
+    collector.http_verify = server.client_ssl_context()
+    return collector
+
+
+async def chat_call(collector: RealDataCollector) -> float:
+    """Tek bir /api/chat eşdeğeri (iki paralel LLM isteği)"""
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        await collector.collect_startup_data({"locations": ["Global"]}, "ping")
+    return (time.perf_counter() - started) * 1000
+
+
+async def run_fresh(server: StubServer, calls: int) -> list:
+    collector = make_collector(server)
+    timings = []
+    for _ in range(calls):
+        collector._http_client = collector._create_http_client()
+        timings.append(await chat_call(collector))
+        await collector.aclose()
+    return timings
+
+
+async def run_pooled(server: StubServer, calls: int) -> list:
+    collector = make_collector(server)
+    with contextlib.redirect_stdout(io.StringIO()):
+        await collector.startup()
+    timings = [await chat_call(collector) for _ in range(calls)]
+    await collector.aclose()
+    return timings
+
+
+def report(label: str, timings: list, connections: int, calls: int):
+    print(
+        f"{label:<8} mean={statistics.mean(timings):7.2f}ms "
+        f"p50={statistics.median(timings):7.2f}ms "
+        f"max={max(timings):7.2f}ms "
+        f"connections={connections} ({connections / calls:.2f}/chat)"
+    )
+
+
+async def main(calls: int):
+    print(f"📊 LLM HTTP pool benchmark - {calls} /api/chat calls against local TLS stub")
+
+    server = StubServer()
+    await server.start()
+    fresh = await run_fresh(server, calls)
+    fresh_connections = server.connections
+    await server.stop()
+
+    server = StubServer()
+    await server.start()
+    pooled = await run_pooled(server, calls)
+    pooled_connections = server.connections
+    await server.stop()
+
+    report("fresh", fresh, fresh_connections, calls)
+    report("pooled", pooled, pooled_connections, calls)
+    saved = statistics.mean(fresh) - statistics.mean(pooled)
+    print(f"✅ Handshake savings per /api/chat call: {saved:.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--calls", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls))
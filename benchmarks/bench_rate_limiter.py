@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter Benchmark
+Kota kontrolü + artırma maliyetini eski timestamp listesi ile dakikalık
+bucket'lı SlidingWindowCounter arasında, penceredeki istek sayısına göre
+karşılaştırır. Eski yolun maliyeti doluluğa göre artar, yenisi sabittir.
+
+Kullanım:
+    python benchmarks/bench_rate_limiter.py [--iterations 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rate_limiter import SlidingWindowCounter
+
+FILL_LEVELS = [0, 10, 100, 1000, 10000]
+
+
+class LegacyQuota:
+    """Eski RealDataCollector davranışı: 24 saatlik timestamp listesi"""
+
+    def __init__(self, timestamps):
+        self.request_counts = {"google": list(timestamps)}
+
+    def check(self, service: str, daily_limit: int = 10**9) -> bool:
+        window_start = time.time() - 86400
+        requests_in_window = [
+            req_time
+            for req_time in self.request_counts[service]
+            if isinstance(req_time, (int, float)) and req_time > window_start
+        ]
+        return len(requests_in_window) < daily_limit
+
+    def increment(self, service: str):
+        self.request_counts[service].append(time.time())
+        current_time = time.time()
+        self.request_counts[service] = [
+            req_time
+            for req_time in self.request_counts[service]
+            if current_time - req_time < 86400
+        ]
+        # Benchmark doluluğu sabit kalsın
+        self.request_counts[service].pop(0)
+
+
+def run(iterations: int):
+    print(f"📊 Quota check + increment - {iterations} iterations per fill level")
+    print(f"{'requests in window':>20} {'legacy list':>14} {'sliding window':>16}")
+    for fill in FILL_LEVELS:
+        now = time.time()
+        timestamps = [now - 86000 * i / max(fill, 1) for i in range(fill)]
+
+        legacy = LegacyQuota(timestamps + [now])
+
+        def legacy_step():
+            legacy.check("google")
+            legacy.increment("google")
+
+        counter = SlidingWindowCounter(86400)
+        for ts in sorted(timestamps):
+            counter._clock = lambda ts=ts: ts
+            counter.add()
+        counter._clock = time.time
+
+        def counter_step():
+            counter.count() < 10**9
+            counter.add()
+
+        legacy_ns = (
+            min(timeit.repeat(legacy_step, number=iterations, repeat=3))
+            / iterations
+            * 1e9
+        )
+        counter_ns = (
+            min(timeit.repeat(counter_step, number=iterations, repeat=3))
+            / iterations
+            * 1e9
+        )
+        print(f"{fill:>20} {legacy_ns / 1000:>11.2f} µs {counter_ns / 1000:>13.2f} µs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.iterations)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Route Matcher Benchmark
+Middleware'in public endpoint kontrolünü eski (her istekte liste kurup
+startswith taraması) ve derlenmiş RouteMatcher yolu ile karşılaştırır.
+
+Kullanım:
+    python benchmarks/bench_route_matcher.py [--iterations 200000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from route_matcher import RouteMatcher
+
+# main.py'deki kurallarla aynı
+PUBLIC_ROUTES = [
+    "GET /",
+    "GET /api/health",
+    "GET /api/metrics",
+    "GET /api/data-sources/status",
+    "POST /api/auth/login",
+    "POST /api/auth/register",
+    "POST /api/auth/refresh",
+    "POST /api/auth/logout",
+    "POST /api/admin/setup",
+    "/api/companies/**",
+    "/api/pipeline/**",
+    "/api/weeks/**",
+    "/api/chat/**",
+    "/api/leads/**",
+    "/api/project-management/**",
+    "/api/tenders/**",
+    "GET /docs/**",
+    "GET /redoc",
+    "GET /openapi.json",
+]
+
+SAMPLE_REQUESTS = [
+    ("GET", "/api/health"),
+    ("GET", "/api/tenders/5f0c1f2e-8a5b-4d9e-9a55-7f4b1c2d3e4f/pdf"),
+    ("POST", "/api/chat"),
+    ("GET", "/api/users/profile"),
+    ("PUT", "/api/admin/users/5f0c1f2e-8a5b-4d9e-9a55-7f4b1c2d3e4f"),
+    ("GET", "/api/project-management/weeks"),
+]
+
+
+def legacy_is_public(method: str, path: str, skip_root: bool = False) -> bool:
+    """Eski middleware davranışı: liste her istekte kurulur
+
+    "/" öneki her yolu eşlediği için tarama ilk elemanda biter;
+    skip_root=True listenin tamamının taranma maliyetini ölçer.
+    """
+    public_endpoints = [
+        "/",
+        "/api/health",
+        "/api/auth/login",
+        "/api/auth/register",
+        "/api/admin/setup",
+        "/api/companies",
+        "/api/pipeline",
+        "/api/weeks",
+        "/api/chat",
+        "/api/chat/history",
+        "/api/leads",
+        "/api/project-management",
+        "/api/tenders",
+        "/docs",
+        "/openapi.json",
+    ]
+    if skip_root:
+        public_endpoints = public_endpoints[1:]
+    return any(path.startswith(endpoint) for endpoint in public_endpoints)
+
+
+def run(iterations: int):
+    matcher = RouteMatcher(PUBLIC_ROUTES)
+
+    def legacy():
+        for method, path in SAMPLE_REQUESTS:
+            legacy_is_public(method, path)
+
+    def legacy_full_scan():
+        for method, path in SAMPLE_REQUESTS:
+            legacy_is_public(method, path, skip_root=True)
+
+    def compiled():
+        for method, path in SAMPLE_REQUESTS:
+            matcher.matches(method, path)
+
+    checks = iterations * len(SAMPLE_REQUESTS)
+
+    def per_check(func) -> float:
+        return min(timeit.repeat(func, number=iterations, repeat=3)) / checks * 1e9
+
+    print(f"📊 Public route check - {checks} checks")
+    print(f"legacy list scan          {per_check(legacy):8.1f} ns/request")
+    print(f"legacy scan without '/'   {per_check(legacy_full_scan):8.1f} ns/request")
+    print(f"RouteMatcher              {per_check(compiled):8.1f} ns/request")
+    for method, path in SAMPLE_REQUESTS:
+        print(
+            f"  {method:<4} {path:<60} legacy={legacy_is_public(method, path)!s:<5} "
+            f"matcher={matcher.matches(method, path)}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--iterations", type=int, default=200000)
+    args = parser.parse_args()
+    run(args.iterations)
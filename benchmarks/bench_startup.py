@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+main.py'nin import süresini ve import sırasında Supabase'e giden istek
+sayısını, gecikmeli yerel bir PostgREST stub'ına karşı ölçer.
+
+Kullanım:
+    python benchmarks/bench_startup.py [--module main] [--latency-ms 100] [--runs 3]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Dict
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+from benchmarks.stub_server import StubServer
+
+
+def postgrest_stub_response(method: str, path: str, body: bytes):
+    """Tablo probe'ları için boş PostgREST yanıtı"""
+    return 200, []
+
+
+async def measure_import(module: str = "main", latency: float = 0.1) -> Dict:
+    """Modülü temiz bir process'te import et; süre ve istek sayısını döndür"""
+    server = StubServer(postgrest_stub_response, use_tls=False, latency=latency)
+    await server.start()
+    env = {
+        **os.environ,
+        "SUPABASE_URL": server.base_url,
+        "SUPABASE_ANON_KEY": "bench-anon-key",
+        "SUPABASE_SERVICE_ROLE_KEY": "",
+    }
+    try:
+        started = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-c",
+            f"import {module}",
+            cwd=PROJECT_ROOT,
+            env=env,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await process.communicate()
+        seconds = time.perf_counter() - started
+    finally:
+        await server.stop()
+
+    if process.returncode != 0:
+        raise RuntimeError(
+            f"import {module} failed:\n{stderr.decode(errors='replace')}"
+        )
+    return {"seconds": seconds, "requests": server.requests}
+
+
+async def main(module: str, latency_ms: float, runs: int):
+    print(
+        f"📊 Startup benchmark - import {module}, "
+        f"{latency_ms:.0f}ms simulated Supabase latency, {runs} runs"
+    )
+    results = [await measure_import(module, latency_ms / 1000) for _ in range(runs)]
+    timings = [r["seconds"] * 1000 for r in results]
+    print(
+        f"import {module:<8} mean={statistics.mean(timings):8.1f}ms "
+        f"min={min(timings):8.1f}ms requests={results[-1]['requests']}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.module, args.latency_ms, args.runs))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tender Upsert Benchmark
+POST /api/tenders kaydının eski (bul + güncelle + tekrar oku) yolu ile tek
+istekli upsert yolunu, gecikmeli yerel bir PostgREST stub'ına karşı karşılaştırır.
+
+Kullanım:
+    python benchmarks/bench_tender_upsert.py [--saves 50] [--latency-ms 20]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_ANON_KEY", "bench-anon-key")
+
+from benchmarks.stub_server import StubServer
+from supabase_database import AsyncSupabaseDatabaseManager
+
+
+def postgrest_stub_response(method: str, path: str, body: bytes):
+    """tenders tablosu için minimal PostgREST yanıtları"""
+    row = {"id": "tender-1", "deal_id": "deal-1", "company_name": "Acme"}
+    if body:
+        row.update(json.loads(body))
+    return (201 if method == "POST" else 200), [row]
+
+
+async def timed_saves(save, saves: int) -> list:
+    timings = []
+    for i in range(saves):
+        tender = {"deal_id": "deal-1", "company_name": "Acme", "notes": f"rev {i}"}
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = await save(tender)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert result and result["id"] == "tender-1"
+    return timings
+
+
+async def run(label: str, latency: float, saves: int, method_name: str):
+    server = StubServer(postgrest_stub_response, use_tls=False, latency=latency)
+    await server.start()
+    manager = AsyncSupabaseDatabaseManager(server.base_url, "bench-anon-key")
+    timings = await timed_saves(getattr(manager, method_name), saves)
+    await manager.aclose()
+    await server.stop()
+
+    print(
+        f"{label:<14} mean={statistics.mean(timings):7.2f}ms "
+        f"p50={statistics.median(timings):7.2f}ms "
+        f"requests/save={server.requests / saves:.1f}"
+    )
+    return statistics.mean(timings)
+
+
+async def main(saves: int, latency_ms: float):
+    print(
+        f"📊 Tender save benchmark - {saves} saves, "
+        f"{latency_ms:.0f}ms simulated PostgREST latency"
+    )
+    latency = latency_ms / 1000
+    before = await run("lookup+update", latency, saves, "_save_tender_by_lookup")
+    after = await run("upsert", latency, saves, "upsert_tender")
+    print(
+        f"✅ Upsert saves {before - after:.2f}ms per save ({before / after:.1f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--saves", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.saves, args.latency_ms))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Import Profile
+`python -X importtime` çıktısını temiz bir process'te toplayıp modülün
+import süresini en pahalı bağımlılıklarıyla birlikte raporlar.
+
+Kullanım:
+    python benchmarks/profile_imports.py [--module main] [--top 15]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# "import time:  self [us] | cumulative | imported package" satırları
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def parse_importtime(output: str) -> List[Dict]:
+    """-X importtime çıktısını (modül, self, cumulative, derinlik) kayıtlarına çevir"""
+    entries = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append(
+                {
+                    "module": name,
+                    "self_us": int(self_us),
+                    "cumulative_us": int(cumulative_us),
+                    "depth": len(indent) // 2,
+                }
+            )
+    return entries
+
+
+def profile_imports(module: str = "main", env: Optional[Dict] = None) -> Dict:
+    """Modülü -X importtime ile import et ve profili döndür"""
+    process_env = {
+        "SUPABASE_URL": "http://127.0.0.1:9",
+        "SUPABASE_ANON_KEY": "profile-anon-key",
+        **os.environ,
+        **(env or {}),
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        env=process_env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        timeout=120,
+    )
+    entries = parse_importtime(result.stderr)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    root = next((e for e in reversed(entries) if e["module"] == module), None)
+    return {
+        "module": module,
+        "total_us": root["cumulative_us"] if root else 0,
+        "entries": entries,
+        "modules": {e["module"] for e in entries},
+    }
+
+
+def main(module: str, top: int):
+    profile = profile_imports(module)
+    entries = profile["entries"]
+    print(
+        f"📊 import {module}: {profile['total_us'] / 1000:.1f}ms, {len(entries)} modules"
+    )
+
+    print(f"\nDirect imports by cumulative time (top {top}):")
+    direct = [e for e in entries if e["depth"] == 1]
+    for entry in sorted(direct, key=lambda e: -e["cumulative_us"])[:top]:
+        print(f"  {entry['cumulative_us'] / 1000:8.1f}ms  {entry['module']}")
+
+    print(f"\nModules by self time (top {top}):")
+    for entry in sorted(entries, key=lambda e: -e["self_us"])[:top]:
+        print(f"  {entry['self_us'] / 1000:8.1f}ms  {entry['module']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    main(args.module, args.top)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Local Stub Server
+Benchmark'lar için yerel HTTP(S) stub sunucusu.
+
+Sabit bir JSON yanıtı döner, keep-alive destekler ve kabul edilen TCP
+bağlantılarını sayar. TLS için geçici self-signed sertifika üretir.
+Responder bir liste döndürürse yanıt chunked Server-Sent Events olarak
+(her öğe bir `data:` olayı, aralarında stream_delay beklenerek) yazılır.
+"""
+
+import asyncio
+import datetime
+import ipaddress
+import json
+import os
+import ssl
+import tempfile
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+
+def generate_self_signed_cert(directory: str) -> Tuple[str, str]:
+    """127.0.0.1 / localhost için self-signed sertifika üret"""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(
+            x509.SubjectAlternativeName(
+                [
+                    x509.DNSName("localhost"),
+                    x509.IPAddress(ipaddress.ip_address("127.0.0.1")),
+                ]
+            ),
+            critical=False,
+        )
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+
+    cert_path = os.path.join(directory, "stub-cert.pem")
+    key_path = os.path.join(directory, "stub-key.pem")
+    with open(cert_path, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+    return cert_path, key_path
+
+
+STUB_STREAM_TOKENS = ["stub", " streamed", " answer"]
+
+
+def llm_stub_response(
+    method: str, path: str, body: bytes
+) -> Tuple[int, Union[Dict, List]]:
+    """OpenRouter / Gemini formatında sahte LLM yanıtı (stream istekleri dahil)"""
+    if "streamGenerateContent" in path:
+        return 200, [
+            {"candidates": [{"content": {"parts": [{"text": token}]}}]}
+            for token in STUB_STREAM_TOKENS
+        ]
+    if body and json.loads(body).get("stream"):
+        return 200, [
+            {"choices": [{"delta": {"content": token}}]} for token in STUB_STREAM_TOKENS
+        ] + ["[DONE]"]
+    if "generateContent" in path:
+        return 200, {"candidates": [{"content": {"parts": [{"text": "stub answer"}]}}]}
+    return 200, {"choices": [{"message": {"content": "stub answer"}}]}
+
+
+class StubServer:
+    """Keep-alive destekli minimal HTTP/1.1 stub sunucusu"""
+
+    def __init__(
+        self,
+        responder: Callable[
+            [str, str, bytes], Tuple[int, Union[Dict, List]]
+        ] = llm_stub_response,
+        use_tls: bool = True,
+        latency: float = 0.0,
+        stream_delay: float = 0.0,
+    ):
+        self.responder = responder
+        self.use_tls = use_tls
+        self.latency = latency
+        self.stream_delay = stream_delay
+        self.connections = 0
+        self.requests = 0
+        self.port: Optional[int] = None
+        self.cert_path: Optional[str] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tmpdir: Optional[tempfile.TemporaryDirectory] = None
+
+    @property
+    def base_url(self) -> str:
+        scheme = "https" if self.use_tls else "http"
+        return f"{scheme}://127.0.0.1:{self.port}"
+
+    def client_ssl_context(self) -> ssl.SSLContext:
+        """Stub sertifikasına güvenen client SSL context'i"""
+        return ssl.create_default_context(cafile=self.cert_path)
+
+    async def start(self):
+        ssl_context = None
+        if self.use_tls:
+            self._tmpdir = tempfile.TemporaryDirectory()
+            self.cert_path, key_path = generate_self_signed_cert(self._tmpdir.name)
+            ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            ssl_context.load_cert_chain(self.cert_path, key_path)
+
+        self._server = await asyncio.start_server(
+            self._handle, "127.0.0.1", 0, ssl=ssl_context
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = request_line.split(" ", 2)
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        key, value = line.split(":", 1)
+                        headers[key.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", "0"))
+                body = await reader.readexactly(length) if length else b""
+
+                self.requests += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+
+                status, payload = self.responder(method, path, body)
+                if isinstance(payload, list):
+                    await self._write_events(writer, status, payload)
+                    continue
+                data = json.dumps(payload).encode("utf-8")
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} OK\r\n"
+                        "Content-Type: application/json\r\n"
+                        f"Content-Length: {len(data)}\r\n"
+                        "Connection: keep-alive\r\n\r\n"
+                    ).encode("latin-1")
+                    + data
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ssl.SSLError):
+            pass
+        except asyncio.CancelledError:
+            # Event loop kapanırken yarım kalan bağlantılar
+            pass
+        finally:
+            writer.close()
+
+    async def _write_events(
+        self, writer: asyncio.StreamWriter, status: int, events: List
+    ):
+        """Olayları chunked SSE yanıtı olarak tek tek yaz"""
+        writer.write(
+            (
+                f"HTTP/1.1 {status} OK\r\n"
+                "Content-Type: text/event-stream\r\n"
+                "Transfer-Encoding: chunked\r\n"
+                "Connection: keep-alive\r\n\r\n"
+            ).encode("latin-1")
+        )
+        for event in events:
+            data = event if isinstance(event, str) else json.dumps(event)
+            chunk = f"data: {data}\n\n".encode("utf-8")
+            writer.write(f"{len(chunk):x}\r\n".encode("latin-1") + chunk + b"\r\n")
+            await writer.drain()
+            if self.stream_delay:
+                await asyncio.sleep(self.stream_delay)
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
@@ -0,0 +1,306 @@
+"""
+Chat Jobs
+Uzun LLM çağrıları için process içi asenkron iş kuyruğu
+
+- submit(): iş sınırlı asyncio.Queue'ya konur ve hemen döner; kuyruk
+  doluysa ChatJobQueueFull fırlatılır (backpressure, endpoint'te 503)
+- CHAT_JOB_WORKERS adet worker işleri sırayla çalıştırır; model yanıtları
+  geldikçe işin kısmi sonuçlarına eklenir
+- Biten işler CHAT_JOB_TTL saniye (en fazla CHAT_JOB_MAX_STORED adet)
+  saklanır ve job id ile sorgulanır
+- Opsiyonel webhook: iş bitince sonucu callback_url'e POST eder; yalnızca
+  CHAT_JOB_WEBHOOK_HOSTS listesindeki host'lara izin verilir (SSRF)
+
+Not: İşler process başınadır; birden fazla worker process varsa job id'yi
+oluşturan process'e sorulmalıdır (sticky session).
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from metrics import (
+    CHAT_JOB_QUEUE_DEPTH,
+    CHAT_JOB_RUN_SECONDS,
+    CHAT_JOB_WAIT_SECONDS,
+    CHAT_JOBS,
+)
+
+logger = logging.getLogger(__name__)
+
+CHAT_JOB_WORKERS = int(os.getenv("CHAT_JOB_WORKERS", "4"))
+CHAT_JOB_QUEUE_SIZE = int(os.getenv("CHAT_JOB_QUEUE_SIZE", "100"))
+CHAT_JOB_TTL = float(os.getenv("CHAT_JOB_TTL", "3600"))
+CHAT_JOB_MAX_STORED = int(os.getenv("CHAT_JOB_MAX_STORED", "1000"))
+CHAT_JOB_WEBHOOK_HOSTS = frozenset(
+    host.strip().lower()
+    for host in os.getenv("CHAT_JOB_WEBHOOK_HOSTS", "").split(",")
+    if host.strip()
+)
+CHAT_JOB_WEBHOOK_TIMEOUT = float(os.getenv("CHAT_JOB_WEBHOOK_TIMEOUT", "10"))
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class ChatJobQueueFull(Exception):
+    """Kuyruk dolu; istemci daha sonra tekrar denemeli"""
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+
+
+class ChatJob:
+    """Tek bir chat işinin durumu ve (kısmi) sonuçları"""
+
+    __slots__ = (
+        "id",
+        "message",
+        "callback_url",
+        "status",
+        "llm_analysis",
+        "error",
+        "webhook",
+        "created_at",
+        "started_at",
+        "finished_at",
+    )
+
+    def __init__(self, message: str, callback_url: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.message = message
+        self.callback_url = callback_url
+        self.status = QUEUED
+        self.llm_analysis: List[Dict] = []
+        self.error: Optional[str] = None
+        self.webhook: Optional[str] = "pending" if callback_url else None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (COMPLETED, FAILED)
+
+    def add_result(self, model: str, responses: List[Dict]):
+        """Gelen model yanıtını kısmi sonuçlara ekle"""
+        self.llm_analysis.extend(responses)
+
+    def to_dict(self) -> Dict:
+        """API yanıtı için işin görünümü"""
+        wait = run = None
+        if self.started_at is not None:
+            wait = round(self.started_at - self.created_at, 3)
+            run = round((self.finished_at or time.time()) - self.started_at, 3)
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "message": self.message,
+            "llm_responses": len(self.llm_analysis),
+            "llm_analysis": list(self.llm_analysis),
+            "error": self.error,
+            "webhook": self.webhook,
+            "created_at": _isoformat(self.created_at),
+            "started_at": _isoformat(self.started_at),
+            "finished_at": _isoformat(self.finished_at),
+            "wait_seconds": wait,
+            "run_seconds": run,
+        }
+
+
+class ChatJobQueue:
+    """Sınırlı kuyruk + sabit sayıda asyncio worker ile chat işleri
+
+    runner(job) işin nihai LLM yanıtlarını döndürür (kısmi sonuçlar için
+    job.add_result'ı kullanabilir); on_complete(job) başarılı işlerden sonra
+    çağrılır (ör. chat geçmişine kayıt).
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[ChatJob], Awaitable[List[Dict]]],
+        on_complete: Optional[Callable[[ChatJob], Awaitable[None]]] = None,
+        workers: int = CHAT_JOB_WORKERS,
+        max_queue: int = CHAT_JOB_QUEUE_SIZE,
+        ttl: float = CHAT_JOB_TTL,
+        max_stored: int = CHAT_JOB_MAX_STORED,
+        webhook_hosts: frozenset = CHAT_JOB_WEBHOOK_HOSTS,
+    ):
+        self.runner = runner
+        self.on_complete = on_complete
+        self.workers = workers
+        self.max_queue = max_queue
+        self.ttl = ttl
+        # Bekleyen ve çalışan işler her zaman saklanabilsin
+        self.max_stored = max(max_stored, max_queue + workers)
+        self.webhook_hosts = webhook_hosts
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._jobs: "OrderedDict[str, ChatJob]" = OrderedDict()
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self.running = 0
+        self.rejected = 0
+
+    def start(self):
+        """Worker'ları başlat (zaten çalışıyorsa bir şey yapmaz)"""
+        if self._tasks:
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [
+            asyncio.ensure_future(self._worker()) for _ in range(self.workers)
+        ]
+        logger.info(
+            "🧵 Chat job workers started (workers=%s, max_queue=%s)",
+            self.workers,
+            self.max_queue,
+        )
+
+    async def aclose(self):
+        """Worker'ları durdur; bekleyen ve çalışan işler başarısız sayılır"""
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for job in self._jobs.values():
+            if not job.finished:
+                job.status, job.error = FAILED, "Server shutting down"
+                job.finished_at = time.time()
+        if self._queue is not None:
+            self._queue = None
+            CHAT_JOB_QUEUE_DEPTH.set(0)
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    def validate_callback_url(self, url: str) -> str:
+        """Webhook adresini doğrula (izinli host ve http/https), değilse ValueError"""
+        if not self.webhook_hosts:
+            raise ValueError("Webhooks are disabled (CHAT_JOB_WEBHOOK_HOSTS is empty)")
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            raise ValueError("callback_url must be an http(s) URL")
+        if parsed.hostname.lower() not in self.webhook_hosts:
+            raise ValueError("callback_url host is not allowed")
+        return url
+
+    def submit(self, message: str, callback_url: Optional[str] = None) -> ChatJob:
+        """İşi kuyruğa koy ve hemen döndür (kuyruk doluysa ChatJobQueueFull)"""
+        if callback_url is not None:
+            self.validate_callback_url(callback_url)
+        self.start()
+        self._prune()
+        job = ChatJob(message, callback_url)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            CHAT_JOBS.inc("rejected")
+            logger.warning("⚠️ Chat job queue full (%s)", self.max_queue)
+            raise ChatJobQueueFull(
+                f"Chat job queue is full ({self.max_queue})"
+            ) from None
+        self._jobs[job.id] = job
+        CHAT_JOBS.inc("queued")
+        CHAT_JOB_QUEUE_DEPTH.set(self._queue.qsize())
+        return job
+
+    def get(self, job_id: str) -> Optional[ChatJob]:
+        """İşi döndür (süresi dolmuş ya da bilinmeyen id için None)"""
+        self._prune()
+        return self._jobs.get(job_id)
+
+    def _prune(self):
+        """Süresi dolan biten işleri, yer yoksa en eski biten işleri sil"""
+        now = time.time()
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished and now - job.finished_at >= self.ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+        if len(self._jobs) >= self.max_stored:
+            for job_id in [
+                job_id for job_id, job in self._jobs.items() if job.finished
+            ]:
+                del self._jobs[job_id]
+                if len(self._jobs) < self.max_stored:
+                    break
+
+    async def _worker(self):
+        queue = self._queue
+        while True:
+            job = await queue.get()
+            CHAT_JOB_QUEUE_DEPTH.set(queue.qsize())
+            try:
+                await self._run(job)
+            finally:
+                queue.task_done()
+
+    async def _run(self, job: ChatJob):
+        job.status = RUNNING
+        job.started_at = time.time()
+        CHAT_JOB_WAIT_SECONDS.observe(job.started_at - job.created_at)
+        self.running += 1
+        started = time.perf_counter()
+        try:
+            job.llm_analysis = list(await self.runner(job))
+            job.status = COMPLETED
+        except asyncio.CancelledError:
+            job.status, job.error = FAILED, "Server shutting down"
+            raise
+        except Exception as e:
+            logger.error("❌ Chat job %s failed: %s", job.id, e)
+            job.status, job.error = FAILED, str(e)
+        finally:
+            self.running -= 1
+            job.finished_at = time.time()
+            CHAT_JOB_RUN_SECONDS.observe(time.perf_counter() - started, job.status)
+        CHAT_JOBS.inc(job.status)
+        logger.info("✅ Chat job %s %s", job.id, job.status)
+
+        if job.status == COMPLETED and self.on_complete is not None:
+            try:
+                await self.on_complete(job)
+            except Exception as e:
+                logger.warning("⚠️ Chat job %s on_complete failed: %s", job.id, e)
+        if job.callback_url:
+            await self._deliver_webhook(job)
+
+    async def _deliver_webhook(self, job: ChatJob):
+        """Sonucu callback_url'e POST et (tek deneme; sonuç job.webhook'ta)"""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(timeout=CHAT_JOB_WEBHOOK_TIMEOUT)
+        try:
+            response = await self._http_client.post(
+                job.callback_url, json=job.to_dict()
+            )
+            job.webhook = "delivered" if response.status_code < 400 else "failed"
+        except httpx.HTTPError as e:
+            logger.warning("⚠️ Chat job %s webhook failed: %s", job.id, e)
+            job.webhook = "failed"
+        CHAT_JOBS.inc(f"webhook_{job.webhook}")
+
+    def stats(self) -> Dict:
+        """Kuyruk durumunu döndür"""
+        return {
+            "workers": len(self._tasks),
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "running": self.running,
+            "stored_jobs": len(self._jobs),
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,211 @@
+"""
+Circuit Breaker
+LLM sağlayıcıları için devre kesici ve gözlenen gecikmeye göre uyarlanan timeout
+
+- CircuitBreaker: art arda LLM_BREAKER_FAILURES hata (ya da
+  LLM_BREAKER_SLOW_CALL_SECONDS'tan yavaş çağrı) sonrası açılır; açıkken
+  çağrılar upstream'e gitmeden reddedilir. LLM_BREAKER_RECOVERY_SECONDS
+  sonra yarı açık duruma geçer ve tek bir deneme (probe) çağrısına izin
+  verir: başarılıysa kapanır, başarısızsa tekrar açılır
+- AdaptiveTimeout: son başarılı çağrıların p99'u x LLM_TIMEOUT_MULTIPLIER,
+  [LLM_TIMEOUT_MIN, LLM_TIMEOUT_MAX] aralığına sıkıştırılır; yeterli örnek
+  yoksa LLM_TIMEOUT_DEFAULT kullanılır
+
+Not: Durum process başınadır ve kilitsizdir (asyncio tek thread'de çalışır).
+"""
+
+import logging
+import os
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from metrics import LLM_CIRCUIT_STATE
+
+logger = logging.getLogger(__name__)
+
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_RECOVERY_SECONDS = float(os.getenv("LLM_BREAKER_RECOVERY_SECONDS", "30"))
+LLM_BREAKER_SLOW_CALL_SECONDS = float(os.getenv("LLM_BREAKER_SLOW_CALL_SECONDS", "20"))
+
+LLM_TIMEOUT_DEFAULT = float(os.getenv("LLM_TIMEOUT_DEFAULT", "30"))
+LLM_TIMEOUT_MIN = float(os.getenv("LLM_TIMEOUT_MIN", "5"))
+LLM_TIMEOUT_MAX = float(os.getenv("LLM_TIMEOUT_MAX", "30"))
+LLM_TIMEOUT_MULTIPLIER = float(os.getenv("LLM_TIMEOUT_MULTIPLIER", "2.0"))
+LLM_TIMEOUT_MIN_SAMPLES = int(os.getenv("LLM_TIMEOUT_MIN_SAMPLES", "20"))
+LLM_TIMEOUT_WINDOW = int(os.getenv("LLM_TIMEOUT_WINDOW", "200"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+# Gauge değerleri
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Devre açıkken yapılan çağrı"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit open for {name} (retry in {retry_after:.1f}s)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Art arda hata sayısına göre açılan, yarı açık probe ile kapanan devre kesici"""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = LLM_BREAKER_FAILURES,
+        recovery_time: float = LLM_BREAKER_RECOVERY_SECONDS,
+        slow_call_seconds: float = LLM_BREAKER_SLOW_CALL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.slow_call_seconds = slow_call_seconds
+        self._clock = clock
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self.consecutive_failures = 0
+        self.opened_count = 0
+        self.rejected = 0
+        LLM_CIRCUIT_STATE.set(STATE_VALUES[CLOSED], name)
+
+    @property
+    def state(self) -> str:
+        """Güncel durum (açık devre recovery_time sonunda yarı açık sayılır)"""
+        if (
+            self._state == OPEN
+            and self._clock() - self._opened_at >= self.recovery_time
+        ):
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def retry_after(self) -> float:
+        """Açık devrenin yarı açığa geçmesine kalan süre"""
+        if self._state != OPEN:
+            return 0.0
+        return max(0.0, self.recovery_time - (self._clock() - self._opened_at))
+
+    def allow(self) -> bool:
+        """Çağrıya izin ver (yarı açıkta aynı anda tek probe)"""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    def check(self):
+        """allow() False ise CircuitOpenError fırlat"""
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_after())
+
+    def record_success(self, duration: float = 0.0):
+        """Başarılı çağrı; eşikten yavaşsa hata sayılır"""
+        if self.slow_call_seconds and duration >= self.slow_call_seconds:
+            logger.warning("🐢 %s slow call: %.1fs", self.name, duration)
+            self.record_failure()
+            return
+        self._probing = False
+        self.consecutive_failures = 0
+        if self._state != CLOSED:
+            logger.info("✅ %s circuit closed", self.name)
+            self._transition(CLOSED)
+
+    def record_failure(self):
+        """Başarısız çağrı; eşikte (ya da probe başarısızsa) devreyi aç"""
+        self._probing = False
+        self.consecutive_failures += 1
+        if self._state == HALF_OPEN or (
+            self._state == CLOSED
+            and self.consecutive_failures >= self.failure_threshold
+        ):
+            logger.warning(
+                "🔌 %s circuit opened after %s failures",
+                self.name,
+                self.consecutive_failures,
+            )
+            self._opened_at = self._clock()
+            self.opened_count += 1
+            self._transition(OPEN)
+
+    def release(self):
+        """Sonucu bilinmeyen (iptal edilen) çağrı; probe hakkını geri ver"""
+        self._probing = False
+
+    def _transition(self, state: str):
+        self._state = state
+        LLM_CIRCUIT_STATE.set(STATE_VALUES[state], self.name)
+
+    def stats(self) -> Dict:
+        """Devre durumunu döndür"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened_count": self.opened_count,
+            "rejected": self.rejected,
+            "retry_after_seconds": round(self.retry_after(), 3),
+        }
+
+
+class AdaptiveTimeout:
+    """Son çağrıların p99'una göre uyarlanan timeout"""
+
+    def __init__(
+        self,
+        default: float = LLM_TIMEOUT_DEFAULT,
+        minimum: float = LLM_TIMEOUT_MIN,
+        maximum: float = LLM_TIMEOUT_MAX,
+        multiplier: float = LLM_TIMEOUT_MULTIPLIER,
+        min_samples: int = LLM_TIMEOUT_MIN_SAMPLES,
+        window: int = LLM_TIMEOUT_WINDOW,
+    ):
+        self.default = default
+        self.minimum = minimum
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self._samples: deque = deque(maxlen=window)
+        self._cached: Optional[float] = None
+
+    def observe(self, duration: float):
+        """Çağrı süresini kaydet
+
+        Timeout'a uğrayan çağrılar timeout değeriyle kaydedilir; sağlayıcı
+        kalıcı olarak yavaşlarsa p99 yukarı kayar ve timeout da büyür.
+        """
+        self._samples.append(duration)
+        self._cached = None
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+    def timeout(self) -> float:
+        """Güncel timeout (saniye)"""
+        if self._cached is None:
+            if len(self._samples) < self.min_samples:
+                value = self.default
+            else:
+                value = self.percentile(0.99) * self.multiplier
+            self._cached = min(self.maximum, max(self.minimum, value))
+        return self._cached
+
+    def stats(self) -> Dict:
+        """Timeout ve gecikme yüzdeliklerini döndür"""
+        p50, p99 = self.percentile(0.5), self.percentile(0.99)
+        return {
+            "timeout_seconds": round(self.timeout(), 3),
+            "samples": len(self._samples),
+            "p50_seconds": round(p50, 3) if p50 is not None else None,
+            "p99_seconds": round(p99, 3) if p99 is not None else None,
+        }
@@ -4,15 +4,12 @@ Cleanup duplicate tender records in Supabase database.
 Keeps only the newest record for each deal_id.
 """
 
-from supabase_database import SupabaseDatabaseManager
+from supabase_database import db
 from collections import defaultdict
 
 def cleanup_duplicate_tenders():
     """Remove duplicate tender records, keeping only the newest for each deal_id"""
     
-    # Initialize database manager
-    db = SupabaseDatabaseManager()
-    
     try:
         # Get all tender records
         print("🔍 Fetching all tender records...")
@@ -0,0 +1,303 @@
+"""
+Company Store
+companies.json için append-only log + bellek içi id index'i ile gömülü kayıt deposu
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+from file_store import atomic_write_json, file_lock
+
+logger = logging.getLogger(__name__)
+
+# Dosya yolları
+COMPANIES_LOG_FILE = os.getenv("COMPANIES_LOG_FILE", "companies.jsonl")
+COMPANIES_JSON_FILE = os.getenv("COMPANIES_JSON_FILE", "companies.json")
+
+# Ölü kayıt sayısı bu eşiği ve canlı kayıt sayısını aşınca log sıkıştırılır
+COMPACT_MIN_GARBAGE = int(os.getenv("COMPANIES_COMPACT_MIN_GARBAGE", "500"))
+
+
+class CompanyStore:
+    """Append-only log üzerinde id index'li şirket deposu
+
+    Her yazma log'a tek bir JSON satırı ekler (put/del), okuma bellekteki
+    index'ten yapılır; ekleme, güncelleme ve silme O(1)'dir. Log'daki ölü
+    kayıtlar birikince dosya yeniden yazılarak sıkıştırılır. Id'ler
+    monoton artar, silinen bir id tekrar kullanılmaz.
+
+    Log yoksa mevcut companies.json içeri aktarılır; sıkıştırma sırasında
+    companies.json da güncel liste ile yeniden yazılır.
+
+    Birden fazla worker aynı log'u paylaşabilir: yazmalar dosya kilidi
+    altında yapılır ve her işlemden önce diğer worker'ların eklediği satırlar
+    (ya da sıkıştırılmış yeni dosya) index'e yansıtılır.
+    """
+
+    def __init__(
+        self,
+        log_path: str = COMPANIES_LOG_FILE,
+        json_path: Optional[str] = COMPANIES_JSON_FILE,
+        compact_min_garbage: int = COMPACT_MIN_GARBAGE,
+    ):
+        self.log_path = log_path
+        self.json_path = json_path
+        self.compact_min_garbage = compact_min_garbage
+        self._lock = threading.RLock()
+        self._index: Dict[int, Dict] = {}
+        self._next_id = 1
+        self._garbage = 0
+        self._corrupt = 0
+        # Log'un index'e yansıtılmış kısmı (inode, byte offset)
+        self._inode: Optional[int] = None
+        self._offset = 0
+        with file_lock(self.log_path):
+            self._load()
+
+    def _load(self):
+        """Log'u index'e oynat; log yoksa JSON dosyasını içeri aktar"""
+        if os.path.exists(self.log_path):
+            self._refresh()
+            if self._corrupt or self._has_torn_tail():
+                # Bozuk satırlar yeni eklemelerle birleşmesin diye log yeniden yazılır
+                self.compact()
+        elif self.json_path and os.path.exists(self.json_path):
+            self.import_json(self.json_path)
+
+    def _reset(self):
+        self._index = {}
+        self._garbage = 0
+        self._corrupt = 0
+        self._inode = None
+        self._offset = 0
+
+    def _refresh(self):
+        """Diğer process'lerin log'a eklediklerini index'e uygula
+
+        Dosya önce açılır, inode/boyut açık handle'dan okunur: eşzamanlı bir
+        sıkıştırma path'i değiştirse de okunan içerik tek bir dosyaya aittir.
+        """
+        try:
+            f = open(self.log_path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            st = os.fstat(f.fileno())
+            if st.st_ino != self._inode or st.st_size < self._offset:
+                # Log başka bir worker tarafından sıkıştırılmış: baştan oku
+                next_id = self._next_id
+                self._reset()
+                self._next_id = next_id
+                self._inode = st.st_ino
+            if st.st_size == self._offset:
+                return
+            f.seek(self._offset)
+            chunk = f.read(st.st_size - self._offset)
+        # Yalnızca tamamlanmış satırlar tüketilir
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].decode("utf-8").splitlines():
+            self._apply(line)
+        self._offset += end
+
+    def _has_torn_tail(self) -> bool:
+        try:
+            return os.path.getsize(self.log_path) > self._offset
+        except FileNotFoundError:
+            return False
+
+    def _apply(self, line: str):
+        """Tek bir log satırını index'e uygula"""
+        line = line.strip()
+        if not line:
+            return
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            # Yarım yazılmış son satır (crash) atlanır
+            self._corrupt += 1
+            return
+
+        op = entry.get("op")
+        if op == "meta":
+            self._next_id = max(self._next_id, int(entry.get("next_id", 1)))
+            return
+
+        company_id = int(entry["id"])
+        self._next_id = max(self._next_id, company_id + 1)
+        if company_id in self._index:
+            self._garbage += 1
+        if op == "put":
+            self._index[company_id] = entry["data"]
+        elif op == "del" and self._index.pop(company_id, None) is not None:
+            self._garbage += 1
+
+    def _append(self, entry: Dict):
+        """Log'a tek satır ekle (dosya kilidi tutulurken çağrılır)"""
+        if self._has_torn_tail():
+            # Çökmüş bir yazıcıdan kalan yarım satır
+            self.compact()
+        data = (json.dumps(entry, ensure_ascii=False, default=str) + "\n").encode(
+            "utf-8"
+        )
+        with open(self.log_path, "ab") as f:
+            f.write(data)
+            f.flush()
+            if self._inode is None:
+                self._inode = os.fstat(f.fileno()).st_ino
+        self._offset += len(data)
+
+    def all(self) -> List[Dict]:
+        """Tüm şirketleri ekleme sırasıyla döndür"""
+        with self._lock:
+            self._refresh()
+            return list(self._index.values())
+
+    def get(self, company_id: int) -> Optional[Dict]:
+        """Id ile şirket getir"""
+        with self._lock:
+            self._refresh()
+            return self._index.get(company_id)
+
+    def insert(self, company: Dict) -> int:
+        """Yeni şirket ekle ve atanan id'yi döndür"""
+        with self._lock, file_lock(self.log_path):
+            self._refresh()
+            company_id = self._next_id
+            self._next_id += 1
+            record = {
+                "id": company_id,
+                **{k: v for k, v in company.items() if k != "id"},
+            }
+            self._append({"op": "put", "id": company_id, "data": record})
+            self._index[company_id] = record
+            return company_id
+
+    def update(self, company_id: int, changes: Dict) -> bool:
+        """Şirket alanlarını güncelle"""
+        with self._lock, file_lock(self.log_path):
+            self._refresh()
+            current = self._index.get(company_id)
+            if current is None:
+                return False
+            record = {**current, **changes, "id": company_id}
+            self._append({"op": "put", "id": company_id, "data": record})
+            self._index[company_id] = record
+            self._garbage += 1
+            self._maybe_compact()
+            return True
+
+    def delete(self, company_id: int) -> bool:
+        """Şirketi sil"""
+        with self._lock, file_lock(self.log_path):
+            self._refresh()
+            if company_id not in self._index:
+                return False
+            self._append({"op": "del", "id": company_id})
+            del self._index[company_id]
+            self._garbage += 2
+            self._maybe_compact()
+            return True
+
+    # asyncio sürümleri: flock beklemesi, log okuma ve sıkıştırma (fsync)
+    # event loop'u bloklamasın diye worker thread'de çalışır
+
+    async def aall(self) -> List[Dict]:
+        """all'ın asyncio sürümü"""
+        return await asyncio.to_thread(self.all)
+
+    async def aget(self, company_id: int) -> Optional[Dict]:
+        """get'in asyncio sürümü"""
+        return await asyncio.to_thread(self.get, company_id)
+
+    async def ainsert(self, company: Dict) -> int:
+        """insert'ün asyncio sürümü"""
+        return await asyncio.to_thread(self.insert, company)
+
+    async def aupdate(self, company_id: int, changes: Dict) -> bool:
+        """update'in asyncio sürümü"""
+        return await asyncio.to_thread(self.update, company_id, changes)
+
+    async def adelete(self, company_id: int) -> bool:
+        """delete'in asyncio sürümü"""
+        return await asyncio.to_thread(self.delete, company_id)
+
+    def _maybe_compact(self):
+        if self._garbage > max(self.compact_min_garbage, len(self._index)):
+            self.compact()
+
+    def compact(self):
+        """Log'u yalnızca canlı kayıtlarla yeniden yaz ve JSON'u dışa aktar"""
+        with self._lock, file_lock(self.log_path):
+            self._refresh()
+            lines = [json.dumps({"op": "meta", "next_id": self._next_id})]
+            for company_id, record in self._index.items():
+                entry = {"op": "put", "id": company_id, "data": record}
+                lines.append(json.dumps(entry, ensure_ascii=False, default=str))
+            data = ("\n".join(lines) + "\n").encode("utf-8")
+
+            tmp_path = f"{self.log_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.log_path)
+            self._inode = os.stat(self.log_path).st_ino
+            self._offset = len(data)
+            self._garbage = 0
+            self._corrupt = 0
+            self.export_json()
+            logger.info("🗜️ Company log compacted: %s companies", len(self._index))
+
+    def import_json(self, path: str) -> int:
+        """companies.json formatındaki listeyi içeri aktar (id'ler korunur)"""
+        with open(path, "r", encoding="utf-8") as f:
+            companies = json.load(f)
+
+        with self._lock, file_lock(self.log_path):
+            for company in companies:
+                company_id = company.get("id")
+                if not isinstance(company_id, int) or company_id in self._index:
+                    company_id = self._next_id
+                self._next_id = max(self._next_id, company_id + 1)
+                self._index[company_id] = {**company, "id": company_id}
+            self.compact()
+        logger.info("📥 Imported %s companies from %s", len(companies), path)
+        return len(companies)
+
+    def export_json(self, path: Optional[str] = None):
+        """Canlı kayıtları companies.json formatında dışa aktar"""
+        path = path or self.json_path
+        if not path:
+            return
+        with self._lock:
+            companies = list(self._index.values())
+        atomic_write_json(path, companies)
+
+    def stats(self) -> Dict:
+        """Depo istatistiklerini döndür"""
+        with self._lock:
+            return {
+                "companies": len(self._index),
+                "next_id": self._next_id,
+                "garbage": self._garbage,
+            }
+
+
+# Global company store instance (import'ta dosya I/O yapılmaz; ilk
+# kullanımda ya da startup'ta oluşturulur)
+_company_store: Optional[CompanyStore] = None
+_company_store_guard = threading.Lock()
+
+
+def get_company_store() -> CompanyStore:
+    """Global şirket deposunu döndür (ilk çağrıda log index'e yüklenir)"""
+    global _company_store
+    if _company_store is None:
+        with _company_store_guard:
+            if _company_store is None:
+                _company_store = CompanyStore()
+    return _company_store
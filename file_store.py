@@ -0,0 +1,249 @@
+"""
+File Store
+Çok worker'lı uvicorn altında JSON dosyaları için güvenli okuma/yazma katmanı
+
+- Advisory lock (fcntl.flock, `<dosya>.lock`) ile process'ler arası sıralama
+- Geçici dosya + os.replace ile atomik yazma (okuyucular yarım dosya görmez)
+- Group commit: aynı anda gelen güncellemeler tek kilit + tek flush ile yazılır
+  (thread'ler için update/replace/clear; asyncio handler'ları için
+  aupdate/areplace/aclear - flush event loop dışında, thread'de yapılır)
+- Batch içinde hata veren bir güncelleme (veriyi yerinde değiştirmiş olsa
+  bile) diğerleriyle birlikte yazılmaz; başarılı güncellemeler kopyalanmaz,
+  yalnızca hata olduğunda dosya yeniden okunup tekrar uygulanır
+- Bozuk JSON dosyası default değere çevrilmez: okuma hata verir ve dosyanın
+  üzerine yazılmaz
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: yalnızca process içi kilit kullanılır
+    fcntl = None
+
+
+class _PathLock:
+    """Path başına re-entrant kilit; flock yalnızca en dıştaki girişte alınır"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.depth = 0
+        self.handle = None
+
+
+# Aynı process içindeki thread'ler için path başına kilit
+_path_locks: Dict[str, _PathLock] = {}
+_path_locks_guard = threading.Lock()
+
+
+def _path_lock(path: str) -> _PathLock:
+    key = os.path.abspath(path)
+    with _path_locks_guard:
+        return _path_locks.setdefault(key, _PathLock())
+
+
+@contextmanager
+def file_lock(path: str):
+    """Dosya için process'ler arası exclusive advisory lock (re-entrant)"""
+    state = _path_lock(path)
+    with state.lock:
+        if state.depth == 0 and fcntl is not None:
+            state.handle = open(f"{path}.lock", "a")
+            fcntl.flock(state.handle.fileno(), fcntl.LOCK_EX)
+        state.depth += 1
+        try:
+            yield
+        finally:
+            state.depth -= 1
+            if state.depth == 0 and state.handle is not None:
+                fcntl.flock(state.handle.fileno(), fcntl.LOCK_UN)
+                state.handle.close()
+                state.handle = None
+
+
+def atomic_write_json(path: str, data: Any, indent: Optional[int] = 2):
+    """JSON'u geçici dosyaya yazıp atomik olarak yerine taşı"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_json(path: str, default: Any = None) -> Any:
+    """JSON dosyasını oku (yazmalar atomik olduğundan kilit gerekmez)
+
+    Yalnızca dosya yoksa default döner; bozuk içerik json.JSONDecodeError
+    fırlatır, böylece üzerine default'tan türetilmiş veri yazılmaz.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+class _PendingWrite:
+    """Group commit kuyruğundaki tek bir güncelleme"""
+
+    __slots__ = ("op", "done", "value", "error")
+
+    def __init__(self, op: Callable[[Any], Tuple[Any, Any]]):
+        self.op = op
+        self.done = False
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+    def result(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class JSONFileStore:
+    """Tek bir JSON dosyası için kilitli, atomik ve group-commit'li depo
+
+    `update(fn)` dosyanın güncel içeriğini kilit altında okur, `fn(data)` ile
+    yerinde değiştirir ve sonucu döndürür. Bir flush sürerken gelen
+    güncellemeler kuyrukta birikir ve bir sonraki flush'ta birlikte yazılır.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        default_factory: Callable[[], Any] = dict,
+        indent: Optional[int] = 2,
+    ):
+        self.path = path
+        self.default_factory = default_factory
+        self.indent = indent
+        self._cond = threading.Condition()
+        self._pending: List[_PendingWrite] = []
+        self._flushing = False
+        # Event loop başına bekleyen async güncellemeler ve onları yazan task
+        self._async_pending: Dict[asyncio.AbstractEventLoop, List[Tuple]] = {}
+        self._async_flushers: Dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+        self.flushes = 0
+        self.updates = 0
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def read(self) -> Any:
+        """Dosyanın güncel içeriğini döndür"""
+        data = read_json(self.path)
+        return self.default_factory() if data is None else data
+
+    def update(self, fn: Callable[[Any], Any]) -> Any:
+        """İçeriği kilit altında yerinde değiştir, fn'nin sonucunu döndür"""
+        return self._submit(lambda data: (data, fn(data)))
+
+    def replace(self, data: Any):
+        """Tüm içeriği verilen değerle değiştir"""
+        self._submit(lambda _: (data, None))
+
+    def clear(self):
+        """İçeriği varsayılan (boş) değere sıfırla"""
+        self._submit(lambda _: (self.default_factory(), None))
+
+    async def aupdate(self, fn: Callable[[Any], Any]) -> Any:
+        """update'in asyncio sürümü: event loop'u bloklamaz, eşzamanlı
+        çağrılar tek flush'ı paylaşır"""
+        return await self._asubmit(lambda data: (data, fn(data)))
+
+    async def areplace(self, data: Any):
+        """replace'in asyncio sürümü"""
+        await self._asubmit(lambda _: (data, None))
+
+    async def aclear(self):
+        """clear'ın asyncio sürümü"""
+        await self._asubmit(lambda _: (self.default_factory(), None))
+
+    async def _asubmit(self, op: Callable[[Any], Tuple[Any, Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        pending, future = _PendingWrite(op), loop.create_future()
+        self._async_pending.setdefault(loop, []).append((pending, future))
+        if loop not in self._async_flushers:
+            self._async_flushers[loop] = loop.create_task(self._async_flush(loop))
+        return await future
+
+    async def _async_flush(self, loop: asyncio.AbstractEventLoop):
+        """Loop'ta biriken güncellemeleri yaz; flush sürerken gelenler bir
+        sonraki turda birlikte yazılır"""
+        try:
+            while self._async_pending.get(loop):
+                batch = self._async_pending.pop(loop)
+                await asyncio.to_thread(self._flush, [pending for pending, _ in batch])
+                for pending, future in batch:
+                    if future.done():  # çağıran iptal edildi
+                        continue
+                    if pending.error is not None:
+                        future.set_exception(pending.error)
+                    else:
+                        future.set_result(pending.value)
+        finally:
+            self._async_flushers.pop(loop, None)
+
+    def _submit(self, op: Callable[[Any], Tuple[Any, Any]]) -> Any:
+        pending = _PendingWrite(op)
+        with self._cond:
+            self._pending.append(pending)
+            while self._flushing and not pending.done:
+                self._cond.wait()
+            if pending.done:
+                return pending.result()
+            # Bu thread lider olur ve birikmiş tüm güncellemeleri yazar
+            self._flushing = True
+            batch, self._pending = self._pending, []
+
+        try:
+            self._flush(batch)
+        finally:
+            with self._cond:
+                self._flushing = False
+                self._cond.notify_all()
+        return pending.result()
+
+    def _flush(self, batch: List[_PendingWrite]):
+        try:
+            with file_lock(self.path):
+                data = self.read()
+                applied = []
+                for pending in batch:
+                    try:
+                        data, pending.value = pending.op(data)
+                        applied.append(pending)
+                    except Exception as e:
+                        pending.error = e
+                        # Hata veren güncelleme veriyi yerinde değiştirmiş
+                        # olabilir: dosyayı (kilit altında, değişmedi) yeniden
+                        # okuyup yalnızca başarılı olanları tekrar uygula
+                        data = self.read()
+                        for done in applied:
+                            data, done.value = done.op(data)
+                if applied:
+                    atomic_write_json(self.path, data, indent=self.indent)
+                    self.flushes += 1
+                    self.updates += len(applied)
+        except Exception as e:
+            for pending in batch:
+                if pending.error is None:
+                    pending.error = e
+        finally:
+            for pending in batch:
+                pending.done = True
@@ -0,0 +1,89 @@
+"""
+JWT Verifier
+Supabase access token'larının imza ve süre kontrolünü process içinde yapar
+"""
+
+import logging
+import os
+from functools import lru_cache
+from typing import Dict, Optional, Sequence
+
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
+
+logger = logging.getLogger(__name__)
+
+# JWT ayarları - yalnızca Supabase projesinin JWT secret'ı; uygulamanın kendi
+# JWT_SECRET'ı farklı olabilir ve geçerli Supabase token'larını reddettirir
+JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+JWT_AUDIENCE = os.getenv("JWT_AUDIENCE")
+JWT_LEEWAY = int(os.getenv("JWT_LEEWAY", "0"))
+
+
+@lru_cache(maxsize=8)
+def _construct_key(secret: str, algorithm: str) -> Key:
+    """Secret'tan imza anahtarını bir kez oluştur"""
+    return jwk.construct(secret, algorithm)
+
+
+class JWTVerifier:
+    """HS256 imzası ve exp claim'i için yerel doğrulayıcı
+
+    Secret tanımlı değilse imza kontrol edilemez; bu durumda hiçbir token
+    kabul edilmez (fail closed).
+    """
+
+    def __init__(
+        self,
+        secret: Optional[str] = JWT_SECRET,
+        algorithms: Sequence[str] = (JWT_ALGORITHM,),
+        audience: Optional[str] = JWT_AUDIENCE,
+        leeway: int = JWT_LEEWAY,
+    ):
+        self.secret = secret
+        self.algorithms = list(algorithms)
+        self.audience = audience
+        self.leeway = leeway
+        self._options = {
+            "verify_aud": audience is not None,
+            "require_exp": True,
+            "leeway": leeway,
+        }
+
+    @property
+    def verifies_signature(self) -> bool:
+        return bool(self.secret)
+
+    @property
+    def key(self) -> Optional[Key]:
+        if not self.secret:
+            return None
+        return _construct_key(self.secret, self.algorithms[0])
+
+    def verify(self, token: str) -> Optional[Dict]:
+        """Token geçerliyse claim'leri, değilse None döndür"""
+        if not self.verifies_signature or not token or token.count(".") != 2:
+            return None
+
+        try:
+            claims = jwt.decode(
+                token,
+                self.key,
+                algorithms=self.algorithms,
+                audience=self.audience,
+                options=self._options,
+            )
+        except (JWTError, ValueError, TypeError):
+            return None
+
+        if not claims.get("sub"):
+            return None
+        return claims
+
+
+# Global verifier instance
+jwt_verifier = JWTVerifier()
+
+if not jwt_verifier.verifies_signature:
+    logger.warning("⚠️ SUPABASE_JWT_SECRET not set - all access tokens are rejected")
@@ -0,0 +1,265 @@
+"""
+Lead Ingest
+POST /api/leads/bulk için akış halinde NDJSON/CSV ayrıştırma, doğrulama ve
+toplu ekleme
+"""
+
+import codecs
+import csv
+import json
+import logging
+import os
+import re
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from real_data_config import DATA_QUALITY_STANDARDS
+
+logger = logging.getLogger(__name__)
+
+# Tek istekte eklenecek satır sayısı
+LEAD_INGEST_BATCH_SIZE = int(os.getenv("LEAD_INGEST_BATCH_SIZE", "500"))
+
+# Tek bir satırın (NDJSON) ya da kaydın (CSV) üst sınırı
+LEAD_INGEST_MAX_LINE_BYTES = int(os.getenv("LEAD_INGEST_MAX_LINE_BYTES", "65536"))
+
+# Yanıtta döndürülecek en fazla satır hatası
+LEAD_INGEST_MAX_ERRORS = int(os.getenv("LEAD_INGEST_MAX_ERRORS", "100"))
+
+# collected_leads tablosunun yazılabilir kolonları
+LEAD_COLUMNS = (
+    "company_name",
+    "contact_person",
+    "email",
+    "phone",
+    "industry",
+    "company_size",
+    "location",
+    "funder",
+    "notes",
+    "source",
+    "status",
+)
+
+# Standartlardaki alan adı -> tablo kolonu
+_FIELD_ALIASES = {"name": "company_name"}
+
+_NOT_AVAILABLE = "N/A"
+_URL = re.compile(r"^https?://[^\s/$.?#][^\s]*$", re.IGNORECASE)
+_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+FORMATS = ("ndjson", "csv")
+
+
+class LeadIngestError(ValueError):
+    """Yükleme gövdesi işlenemediğinde (format, satır boyutu)"""
+
+
+def detect_format(content_type: Optional[str], requested: Optional[str] = None) -> str:
+    """İstenen format ya da Content-Type'tan ndjson/csv seç"""
+    if requested:
+        requested = requested.lower()
+        if requested not in FORMATS:
+            raise LeadIngestError(f"Unsupported format: {requested}")
+        return requested
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in ("text/csv", "application/csv"):
+        return "csv"
+    if media_type in (
+        "application/x-ndjson",
+        "application/ndjson",
+        "application/jsonl",
+        "application/jsonlines",
+    ):
+        return "ndjson"
+    raise LeadIngestError(
+        "Content-Type must be application/x-ndjson or text/csv (or pass ?format=)"
+    )
+
+
+async def iter_ndjson(
+    chunks: AsyncIterator[bytes], max_line_bytes: int = LEAD_INGEST_MAX_LINE_BYTES
+) -> AsyncIterator[Tuple[int, Optional[Dict], Optional[str]]]:
+    """Byte parçalarından (satır no, kayıt, hata) üret; gövde tamponlanmaz"""
+    buffer = b""
+    line_no = 0
+    async for chunk in chunks:
+        buffer += chunk
+        lines = buffer.split(b"\n")
+        buffer = lines.pop()
+        if len(buffer) > max_line_bytes:
+            raise LeadIngestError(
+                f"Line {line_no + len(lines) + 1} exceeds {max_line_bytes} bytes"
+            )
+        for line in lines:
+            line_no += 1
+            parsed = _parse_ndjson_line(line)
+            if parsed is not None:
+                yield (line_no, *parsed)
+    if buffer.strip():
+        parsed = _parse_ndjson_line(buffer)
+        if parsed is not None:
+            yield (line_no + 1, *parsed)
+
+
+def _parse_ndjson_line(line: bytes) -> Optional[Tuple[Optional[Dict], Optional[str]]]:
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        record = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        return None, f"Invalid JSON: {e}"
+    if not isinstance(record, dict):
+        return None, "Each line must be a JSON object"
+    return record, None
+
+
+async def iter_csv(
+    chunks: AsyncIterator[bytes], max_line_bytes: int = LEAD_INGEST_MAX_LINE_BYTES
+) -> AsyncIterator[Tuple[int, Optional[Dict], Optional[str]]]:
+    """Başlık satırlı CSV'den (satır no, kayıt, hata) üret
+
+    Tırnak içindeki satır sonları desteklenir: bir kayıt, tırnak sayısı çift
+    olana kadar satır satır biriktirilir.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    header: Optional[List[str]] = None
+    pending = ""
+    text = ""
+    line_no = 0
+
+    def parse(record: str) -> List[str]:
+        return next(csv.reader([record]), [])
+
+    async def records():
+        nonlocal pending, text, line_no
+        async for chunk in chunks:
+            text += decoder.decode(chunk)
+            lines = text.split("\n")
+            text = lines.pop()
+            for line in lines:
+                line_no += 1
+                pending += line + "\n"
+                if pending.count('"') % 2 == 0:
+                    yield line_no, pending
+                    pending = ""
+            if len(pending) + len(text) > max_line_bytes:
+                raise LeadIngestError(
+                    f"Record at line {line_no + 1} exceeds {max_line_bytes} bytes"
+                )
+        text += decoder.decode(b"", final=True)
+        if text:
+            line_no += 1
+            pending += text
+        if pending:
+            yield line_no, pending
+
+    async for record_line, record in records():
+        values = parse(record.rstrip("\r\n"))
+        if not any(value.strip() for value in values):
+            continue
+        if header is None:
+            header = [value.strip() for value in values]
+            continue
+        if len(values) != len(header):
+            yield record_line, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield record_line, dict(zip(header, values)), None
+
+
+def validate_lead(record: Dict) -> Tuple[Optional[Dict], List[str]]:
+    """Kaydı DATA_QUALITY_STANDARDS'a göre doğrula ve tablo satırına çevir"""
+    standards = DATA_QUALITY_STANDARDS
+    filters = standards["search_filters"]
+    values = {}
+    for key, value in record.items():
+        key = _FIELD_ALIASES.get(str(key).strip(), str(key).strip())
+        if isinstance(value, str):
+            value = value.strip()
+        if value not in (None, ""):
+            values[key] = value
+
+    errors = []
+    for field in standards["company_info"]["required_fields"]:
+        column = _FIELD_ALIASES.get(field, field)
+        if column in LEAD_COLUMNS and column not in values:
+            errors.append(f"{field} is required")
+
+    name = values.get("company_name")
+    if name is not None and (not isinstance(name, str) or name == _NOT_AVAILABLE):
+        errors.append("name must be a company name")
+    for field in ("industry", "company_size", "funding_stage"):
+        value = values.get(field)
+        if (
+            value is not None
+            and value != _NOT_AVAILABLE
+            and value not in filters[field]
+        ):
+            errors.append(f"{field} must be one of {filters[field]}")
+    website = values.get("website")
+    if (
+        website is not None
+        and website != _NOT_AVAILABLE
+        and not _URL.match(str(website))
+    ):
+        errors.append("website must be a valid URL or N/A")
+    email = values.get("email")
+    if email is not None and not _EMAIL.match(str(email)):
+        errors.append("email is not valid")
+
+    if errors:
+        return None, errors
+    row = {column: values[column] for column in LEAD_COLUMNS if column in values}
+    row.setdefault("source", "bulk_import")
+    return row, []
+
+
+async def ingest_leads(
+    rows: AsyncIterator[Tuple[int, Optional[Dict], Optional[str]]],
+    insert_batch: Callable[[List[Dict]], Awaitable[int]],
+    batch_size: int = LEAD_INGEST_BATCH_SIZE,
+    max_errors: int = LEAD_INGEST_MAX_ERRORS,
+) -> Dict:
+    """Satırları doğrulayıp batch'ler halinde ekle, özet rapor döndür"""
+    started = time.perf_counter()
+    report = {"received": 0, "inserted": 0, "failed": 0, "batches": 0, "errors": []}
+
+    def add_error(row_no: int, error: str):
+        report["failed"] += 1
+        if len(report["errors"]) < max_errors:
+            report["errors"].append({"row": row_no, "error": error})
+
+    batch: List[Tuple[int, Dict]] = []
+
+    async def flush():
+        try:
+            report["inserted"] += await insert_batch([row for _, row in batch])
+        except Exception as e:
+            logger.error("❌ Lead batch insert error: %s", e)
+            for row_no, _ in batch:
+                add_error(row_no, f"Batch insert failed: {e}")
+        report["batches"] += 1
+        batch.clear()
+
+    async for row_no, record, error in rows:
+        report["received"] += 1
+        if error is None:
+            row, errors = validate_lead(record)
+            error = "; ".join(errors) if errors else None
+        if error is not None:
+            add_error(row_no, error)
+            continue
+        batch.append((row_no, row))
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+
+    elapsed = time.perf_counter() - started
+    report["errors_truncated"] = report["failed"] > len(report["errors"])
+    report["duration_ms"] = round(elapsed * 1000, 2)
+    report["rows_per_second"] = (
+        round(report["received"] / elapsed, 1) if elapsed else 0.0
+    )
+    return report
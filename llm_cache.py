@@ -0,0 +1,296 @@
+"""
+LLM Response Cache
+Aynı soru için LLM yanıtlarını tekrar kullanan TTL + byte bütçeli LRU cache
+
+- Anahtar: model + normalize edilmiş mesaj + filtreler (sha256)
+- Bellek katmanı: OrderedDict, toplam boyut LLM_CACHE_MAX_BYTES ile sınırlı
+- Opsiyonel disk katmanı (LLM_CACHE_DIR): restart sonrası ve worker'lar
+  arasında paylaşılır; kayıtlar atomik JSON dosyaları olarak yazılır
+- Yalnızca başarılı yanıtlar cache'lenir; hata/limit yanıtları cache'lenmez
+- SingleFlight: aynı anahtar için eşzamanlı istekler tek upstream çağrısını
+  paylaşır (cache dolmadan gelen aynı sorular kota harcamaz)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from file_store import atomic_write_json, read_json
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "900"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", "")
+
+
+def normalize_message(message: str) -> str:
+    """Boşlukları sadeleştir ve büyük/küçük harf farkını kaldır"""
+    return " ".join(message.split()).casefold()
+
+
+class LLMResponseCache:
+    """Model + mesaj + filtre anahtarlı, TTL ve byte bütçeli LRU cache
+
+    Süreler duvar saatiyle tutulur; disk kayıtları restart sonrası da
+    aynı süre sonunda düşer. ttl <= 0 cache'i kapatır.
+    """
+
+    def __init__(
+        self,
+        ttl: float = LLM_CACHE_TTL,
+        max_bytes: int = LLM_CACHE_MAX_BYTES,
+        disk_dir: Optional[str] = LLM_CACHE_DIR or None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (expires_at, size, value)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @staticmethod
+    def key(model: str, message: str, filters: Optional[Dict] = None) -> str:
+        """Cache anahtarı üret"""
+        filters_json = json.dumps(filters or {}, sort_keys=True, default=str)
+        raw = "\0".join((model, filters_json, normalize_message(message)))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Cache'lenmiş yanıtı döndür (her öğe `cached: True` ile işaretlenir)"""
+        if not self.enabled:
+            return None
+        now = self._clock()
+        cached = self._get_memory(key, now)
+        if cached is not None:
+            return cached
+        return self._load_disk_record(key, self._read_disk(key, now))
+
+    async def aget(self, key: str) -> Optional[List[Dict]]:
+        """get'in asyncio sürümü: disk katmanı event loop dışında okunur"""
+        if not self.enabled:
+            return None
+        now = self._clock()
+        cached = self._get_memory(key, now)
+        if cached is not None:
+            return cached
+        record = None
+        if self.disk_dir:
+            record = await asyncio.to_thread(self._read_disk, key, now)
+        return self._load_disk_record(key, record)
+
+    def set(self, key: str, value: List[Dict]):
+        """Yanıtı cache'le (bütçeyi aşan tek kayıtlar cache'lenmez)"""
+        if not self.enabled:
+            return
+        expires_at = self._store_memory(key, value)
+        self._write_disk(key, expires_at, value)
+
+    async def aset(self, key: str, value: List[Dict]):
+        """set'in asyncio sürümü: disk katmanı event loop dışında yazılır"""
+        if not self.enabled:
+            return
+        expires_at = self._store_memory(key, value)
+        if self.disk_dir:
+            await asyncio.to_thread(self._write_disk, key, expires_at, value)
+
+    def clear(self):
+        """Bellek katmanını temizle"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def prune_disk(self) -> int:
+        """Süresi dolmuş disk kayıtlarını sil, silinen sayısını döndür"""
+        if not self.disk_dir:
+            return 0
+        now, removed = self._clock(), 0
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.disk_dir, name)
+            try:
+                record = read_json(path)
+            except ValueError:  # yarım kalmış / bozuk kayıt
+                record = None
+            if not isinstance(record, dict) or record.get("expires_at", 0) <= now:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+
+    def stats(self) -> Dict:
+        """Cache istatistiklerini döndür"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4)
+                if lookups
+                else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "disk_enabled": bool(self.disk_dir),
+            }
+
+    def _get_memory(self, key: str, now: float) -> Optional[List[Dict]]:
+        """Bellek katmanından oku; süresi dolmuş kaydı sil"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._mark_cached(entry[2])
+            self._drop(key)
+            self.expirations += 1
+        return None
+
+    def _load_disk_record(
+        self, key: str, record: Optional[Dict[str, Any]]
+    ) -> Optional[List[Dict]]:
+        """Disk kaydını belleğe al (kayıt yoksa kaçak say)"""
+        with self._lock:
+            if record is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, record["expires_at"], record["value"])
+        return self._mark_cached(record["value"])
+
+    def _store_memory(self, key: str, value: List[Dict]) -> float:
+        expires_at = self._clock() + self.ttl
+        with self._lock:
+            self._store(key, expires_at, value)
+        return expires_at
+
+    @staticmethod
+    def _mark_cached(value: List[Dict]) -> List[Dict]:
+        return [dict(item, cached=True) for item in value]
+
+    def _store(self, key: str, expires_at: float, value: List[Dict]):
+        """Bellek katmanına yaz ve LRU ile bütçeye in (lock tutulurken çağrılır)"""
+        size = len(json.dumps(value, default=str).encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        self._drop(key)
+        self._entries[key] = (expires_at, size, value)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _read_disk(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        if not self.disk_dir:
+            return None
+        try:
+            record = read_json(self._disk_path(key))
+        except ValueError:  # bozuk kayıt: cache kaçağı say
+            return None
+        if not isinstance(record, dict) or record.get("expires_at", 0) <= now:
+            return None
+        return record
+
+    def _write_disk(self, key: str, expires_at: float, value: List[Dict]):
+        if not self.disk_dir:
+            return
+        try:
+            atomic_write_json(
+                self._disk_path(key),
+                {"expires_at": expires_at, "value": value},
+                indent=None,
+            )
+        except OSError as e:
+            logger.warning("⚠️ LLM cache disk write failed: %s", e)
+
+
+class SingleFlight:
+    """Anahtar başına tek bir uçuştaki (in-flight) asyncio çağrısı
+
+    İlk çağıran upstream işini bir Task olarak başlatır; aynı anahtarla
+    gelen diğerleri aynı Task'ı bekler ve sonucu (ya da hatayı) paylaşır.
+    Bekleyenlerden biri iptal edilirse Task diğerleri için sürer; son
+    bekleyen de iptal edilirse Task iptal edilir.
+    """
+
+    def __init__(self):
+        # key -> [task, bekleyen sayısı]
+        self._calls: Dict[str, list] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._calls
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """factory() sonucunu döndür; aynı anahtar uçuştaysa ona katıl"""
+        call = self._calls.get(key)
+        if call is None:
+            self.calls += 1
+            task = asyncio.ensure_future(factory())
+            call = self._calls[key] = [task, 0]
+            task.add_done_callback(lambda _: self._release(key, task))
+        else:
+            self.coalesced += 1
+        task = call[0]
+        call[1] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and call[1] == 1:
+                task.cancel()
+            raise
+        finally:
+            call[1] -= 1
+
+    def _release(self, key: str, task: asyncio.Task):
+        call = self._calls.get(key)
+        if call is not None and call[0] is task:
+            del self._calls[key]
+
+    def stats(self) -> Dict:
+        """Single-flight istatistiklerini döndür"""
+        return {
+            "in_flight": len(self._calls),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+        }
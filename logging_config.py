@@ -0,0 +1,92 @@
+"""
+Logging Config
+Kuyruk tabanlı, bloklamayan uygulama logger'ı
+
+- Modüller `logging.getLogger(__name__)` ile kendi logger'ını kullanır
+- Kayıtlar QueueHandler ile kuyruğa bırakılır; biçimlendirme ve yazma
+  arka plandaki QueueListener thread'inde yapılır
+- Seviye LOG_LEVEL ile belirlenir; kapalı seviyelerdeki çağrılar mesajı
+  hiç biçimlendirmez (`logger.debug("... %s", payload)`)
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from typing import Dict, Optional
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv(
+    "LOG_FORMAT", "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+)
+
+# Kuyruk dolarsa (yazıcı geride kalırsa) yeni kayıtlar düşürülür, istek beklemez
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Kaydı biçimlendirmeden kuyruğa bırakan, dolu kuyrukta düşüren handler"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Mesaj arka planda biçimlendirilir; yalnızca traceback burada
+        # metne çevrilir (frame'ler thread'ler arası taşınmasın)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_handler: Optional[NonBlockingQueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(level: Optional[str] = None, stream=None) -> logging.Logger:
+    """Root logger'ı kuyruk + arka plan yazıcı ile yapılandır (idempotent)"""
+    global _handler, _listener
+    root = logging.getLogger()
+    root.setLevel((level or LOG_LEVEL).upper())
+    if _listener is not None:
+        return root
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue: queue.Queue = queue.Queue(LOG_QUEUE_SIZE)
+    _handler = NonBlockingQueueHandler(log_queue)
+    _listener = logging.handlers.QueueListener(log_queue, output)
+    _listener.start()
+    root.addHandler(_handler)
+    atexit.register(shutdown_logging)
+    return root
+
+
+def shutdown_logging():
+    """Kuyruktaki kayıtları yaz ve arka plan thread'ini durdur"""
+    global _handler, _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    logging.getLogger().removeHandler(_handler)
+    _handler = None
+    _listener = None
+
+
+def logging_stats() -> Dict:
+    """Logger kuyruk istatistiklerini döndür"""
+    return {
+        "level": logging.getLevelName(logging.getLogger().level),
+        "queued": _handler.queue.qsize() if _handler else 0,
+        "dropped": _handler.dropped if _handler else 0,
+    }
@@ -4,15 +4,26 @@ Gerçek veri kaynakları kullanan lead discovery sistemi
 """
 
 import asyncio
+import importlib
 import json
+import logging
 import os
 from datetime import datetime
 import time
 from typing import Dict, List, Optional
 
-from fastapi import BackgroundTasks, Depends, FastAPI, Form, HTTPException, status
+from fastapi import (
+    BackgroundTasks,
+    Depends,
+    FastAPI,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    status,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
 
@@ -43,15 +54,70 @@ class Field:
         return self.default
 
 
-import httpx
+# Kuyruk tabanlı logger (LOG_LEVEL), modül logger'larından önce kurulur
+from logging_config import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
 
 # Real data services
+from chat_jobs import ChatJob, ChatJobQueue, ChatJobQueueFull
 from real_data_collector import RealDataCollector
 from real_data_config import get_data_source_status, validate_configuration
 from supabase_auth import auth_service
 
 # Database and repositories
-from supabase_database import db
+from company_store import get_company_store
+from lead_ingest import LeadIngestError, detect_format, ingest_leads, iter_csv, iter_ndjson
+from file_store import JSONFileStore
+from metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    HTTP_IN_FLIGHT,
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUESTS,
+    REGISTRY as METRICS_REGISTRY,
+)
+from route_matcher import RouteMatcher
+from supabase_database import async_db, parse_fields
+
+# Dosya tabanlı depolar (kilitli, atomik yazma)
+chat_history_store = JSONFileStore("chat_history.json", default_factory=list)
+archived_weeks_store = JSONFileStore("archived_weeks.json", default_factory=list)
+
+
+# Cleanup ve özet listeler için tender projeksiyonu
+TENDER_SUMMARY_COLUMNS = ("id", "company_name", "deal_id")
+
+
+# Liste endpoint'leri için sayfa boyutu üst sınırı
+MAX_PAGE_SIZE = 500
+
+# X-Forwarded-For'a istemci IP'sini ekleyen güvenilir proxy sayısı (0: başlık
+# yok sayılır). İstemci IP'si sağdan bu sıradaki giriştir; soldaki girişleri
+# istemci kendisi gönderebilir
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+
+
+def parse_fields_or_400(fields: Optional[str], required=("id",)):
+    """`?fields=` parametresini kolon listesine çevir, geçersizse 400 döndür"""
+    try:
+        return parse_fields(fields, required)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def fetch_page(
+    table_name: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    columns=None,
+    filters: Dict = None,
+):
+    """Keyset sayfası getir, geçersiz cursor için 400 döndür"""
+    try:
+        return await async_db.get_page(table_name, filters, limit, cursor, columns)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 # Status mapping function to standardize pipeline statuses
@@ -88,7 +154,7 @@ def calculate_sales_cycle(pipeline_data: list) -> float:
             return 0.0
 
     except Exception as e:
-        print(f" Sales cycle calculation error: {e}")
+        logger.error("Sales cycle calculation error: %s", e)
         return 0.0
 
 
@@ -128,6 +194,39 @@ app.add_middleware(
 )
 
 
+# Auth gerektirmeyen route'lar; başlangıçta bir kez derlenir (bkz. route_matcher)
+PUBLIC_ROUTES = [
+    "GET /",
+    "GET /api/health",
+    "GET /api/metrics",
+    "GET /api/data-sources/status",
+    "POST /api/auth/login",
+    "POST /api/auth/register",
+    "POST /api/auth/refresh",
+    "POST /api/auth/logout",
+    "POST /api/admin/setup",
+    "/api/companies/**",
+    "/api/pipeline/**",
+    "/api/weeks/**",
+    "/api/chat/**",
+    "/api/leads/**",
+    "/api/project-management/**",
+    "/api/tenders/**",
+    "GET /docs/**",
+    "GET /redoc",
+    "GET /openapi.json",
+]
+public_routes = RouteMatcher(PUBLIC_ROUTES)
+
+
+async def verify_access_token(token: str) -> Optional[Dict]:
+    """Token'ı doğrula; cache kaçağında profil sorgusu thread'de yapılır"""
+    payload = auth_service.token_cache.get(token)
+    if payload is None:
+        payload = await asyncio.to_thread(auth_service.verify_token, token)
+    return payload
+
+
 # JWT Token Validation Middleware
 @app.middleware("http")
 async def jwt_token_validation_middleware(request, call_next):
@@ -139,30 +238,9 @@ async def jwt_token_validation_middleware(request, call_next):
         return response
 
     # Public endpoints that don't require authentication
-    public_endpoints = [
-        "/",
-        "/api/health",
-        "/api/auth/login",
-        "/api/auth/register",
-        "/api/admin/setup",
-        "/api/companies",
-        "/api/pipeline",
-        "/api/weeks",
-        "/api/chat",
-        "/api/chat/history",
-        "/api/leads",
-        "/api/project-management",
-        "/api/tenders",
-        "/docs",
-        "/openapi.json",
-    ]
-
-    # Check if the endpoint requires authentication
-    print(f" Request path: {request.url.path}")
-    print(f" Request method: {request.method}")
-    
-    if any(request.url.path.startswith(endpoint) for endpoint in public_endpoints):
-        print(f" Public endpoint, skipping auth: {request.url.path}")
+    logger.debug("Request: %s %s", request.method, request.url.path)
+    if public_routes.matches(request.method, request.url.path):
+        logger.debug("Public endpoint, skipping auth: %s", request.url.path)
         response = await call_next(request)
         return response
 
@@ -177,13 +255,13 @@ async def jwt_token_validation_middleware(request, call_next):
     token = auth_header.split(" ")[1]
     try:
         # Validate token
-        payload = auth_service.verify_token(token)
+        payload = await verify_access_token(token)
         user_id = payload.get("sub")
         if not user_id:
             return JSONResponse(status_code=401, content={"detail": "Invalid token"})
 
-        # Check if user exists and is active
-        user = auth_service.get_user_by_id(user_id)
+        # Check if user exists and is active (profil verify_token'dan gelir)
+        user = payload.get("profile")
         if not user or not user.get("is_active", False):
             return JSONResponse(
                 status_code=401, content={"detail": "User not found or inactive"}
@@ -201,6 +279,27 @@ async def jwt_token_validation_middleware(request, call_next):
         )
 
 
+# Request Metrics Middleware (en dışta: auth dahil tüm süreyi ölçer)
+@app.middleware("http")
+async def request_metrics_middleware(request, call_next):
+    """Route bazında gecikme, status ve eşzamanlı istek metriklerini kaydet"""
+    HTTP_IN_FLIGHT.inc()
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        HTTP_IN_FLIGHT.dec()
+        # Route şablonu (ör. /api/tenders/{tender_id}) etiket sayısını sınırlı tutar
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        HTTP_REQUESTS.inc(request.method, route, status_code)
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started, request.method, route
+        )
+
+
 # Data models
 class DiscoveryFilters(BaseModel):
     locations: List[str] = Field(default_factory=list, description="Target locations")
@@ -255,45 +354,45 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     """Mevcut kullanıcıyı getir"""
     try:
-        print(f" get_current_user called with token: {token[:50]}...")
+        logger.debug("get_current_user called with token: %s...", token[:12])
 
         # Token'ı doğrula
-        payload = auth_service.verify_token(token)
-        print(f" verify_token result: {payload}")
+        payload = await verify_access_token(token)
+        logger.debug("verify_token result: %s", payload)
 
         if payload is None:  # None kontrolü ekle
-            print(" Payload is None")
+            logger.debug("Payload is None")
             raise HTTPException(status_code=401, detail="Invalid token")
 
         if not isinstance(payload, dict):
-            print(f" Payload is not a dict: {type(payload)}")
+            logger.debug("Payload is not a dict: %s", type(payload))
             raise HTTPException(status_code=401, detail="Invalid token payload")
 
         user_id: str = payload.get("sub")
-        print(f" User ID from payload: {user_id}")
+        logger.debug("User ID from payload: %s", user_id)
         if user_id is None:
-            print(" User ID is None")
+            logger.warning("User ID is None")
             raise HTTPException(status_code=401, detail="Invalid token")
 
         # Kullanıcıyı getir
-        user = auth_service.get_user_by_id(user_id)
-        print(f" User from database: {user}")
+        user = await asyncio.to_thread(auth_service.get_user_by_id, user_id)
+        logger.debug("User from database: %s", user)
         if user is None:
-            print(" User not found in database")
+            logger.warning("User not found in database")
             raise HTTPException(status_code=401, detail="User not found")
 
         if not isinstance(user, dict):
-            print(f" User is not a dict: {type(user)}")
+            logger.warning("User is not a dict: %s", type(user))
             raise HTTPException(status_code=401, detail="Invalid user data")
 
         if not user.get("is_active", False):
-            print(" User is not active")
+            logger.warning("User is not active")
             raise HTTPException(status_code=400, detail="Inactive user")
 
-        print(f" User validated successfully: {user.get('email')}")
+        logger.debug("User validated successfully: %s", user.get('email'))
         return user
     except Exception as e:
-        print(f" get_current_user error: {e}")
+        logger.error("get_current_user error: %s", e)
         import traceback
 
         traceback.print_exc()
@@ -336,6 +435,26 @@ def require_role(required_role: str):
 real_data_collector = RealDataCollector()
 
 
+async def run_chat_job(job: ChatJob) -> List[Dict]:
+    """Arka plan chat işi: model yanıtları geldikçe işin kısmi sonuçlarına eklenir"""
+    default_filters = {"locations": ["Global"], "year": "2024"}
+    collection_results = await real_data_collector.collect_startup_data(
+        default_filters, job.message, on_result=job.add_result
+    )
+    if collection_results.get("error"):
+        raise RuntimeError(collection_results["error"])
+    return collection_results.get("llm_analysis", [])
+
+
+async def save_chat_job(job: ChatJob):
+    """Tamamlanan chat işini chat geçmişine kaydet"""
+    await save_chat_exchange(job.message, job.llm_analysis)
+
+
+# Uzun LLM çağrıları için sınırlı, process içi iş kuyruğu
+chat_jobs = ChatJobQueue(run_chat_job, on_complete=save_chat_job)
+
+
 # Logging
 def log_scan_result(
     request: DiscoveryRequest, response: DiscoveryResponse, duration: float
@@ -354,7 +473,7 @@ def log_scan_result(
             f.write(log_entry.json() + "\n")
 
     except Exception as e:
-        print(f"Logging error: {e}")
+        logger.error("Logging error: %s", e)
 
 
 def calculate_data_quality(response: DiscoveryResponse) -> float:
@@ -395,19 +514,44 @@ async def startup_event():
         # Logs dizinini oluştur
         os.makedirs("logs", exist_ok=True)
 
+        # LLM çağrıları için paylaşılan bağlantı havuzunu aç
+        await real_data_collector.startup()
+        # Şirket log'unu index'e yükle (import sırasında değil)
+        await asyncio.to_thread(get_company_store)
+        chat_jobs.start()
+
+        # Tablo kontrolü ve PDF motorları arka planda: sunucu bunları
+        # beklemeden dinlemeye başlar
+        app.state.background_tasks = [
+            asyncio.create_task(async_db.init_database()),
+            asyncio.create_task(warm_pdf_engines()),
+        ]
+
         # Yapılandırmayı doğrula
         validate_configuration()
-        print(" Configuration validated successfully")
+        logger.info("Configuration validated successfully")
 
         # Veri kaynaklarının durumunu kontrol et
         status = get_data_source_status()
-        print(f"📊 Data sources status: {status}")
+        logger.info("📊 Data sources status: %s", status)
 
     except Exception as e:
-        print(f" Startup error: {e}")
+        logger.error("Startup error: %s", e)
         raise e
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Uygulama kapanırken paylaşılan bağlantıları kapat, şirketleri dışa aktar"""
+    get_company_store().export_json()
+    for task in getattr(app.state, "background_tasks", []):
+        if not task.done():
+            task.cancel()
+    await chat_jobs.aclose()
+    await async_db.aclose()
+    await real_data_collector.aclose()
+
+
 @app.get("/")
 async def root():
     """API root endpoint"""
@@ -435,6 +579,12 @@ async def health_check():
     }
 
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """Prometheus formatında istek, veritabanı ve LLM metrikleri"""
+    return Response(content=METRICS_REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.get("/api/data-sources/status")
 async def get_data_sources_status():
     """Veri kaynaklarının durumunu getir"""
@@ -442,6 +592,7 @@ async def get_data_sources_status():
         "status": "success",
         "data": get_data_source_status(),
         "collection_status": real_data_collector.get_collection_status(),
+        "chat_jobs": chat_jobs.stats(),
     }
 
 
@@ -449,18 +600,14 @@ async def get_data_sources_status():
 async def setup_admin_user():
     """İlk admin kullanıcısını oluştur"""
     try:
-        # Admin kullanıcısı var mı kontrol et
-        existing_admin = auth_service.get_all_users()
-        if existing_admin:
-            admin_users = [
-                user for user in existing_admin if user.get("is_admin", False)
-            ]
-            if admin_users:
-                return {
-                    "status": "success",
-                    "message": "Admin user already exists",
-                    "admin_count": len(admin_users),
-                }
+        # Admin kullanıcısı var mı kontrol et (sunucu tarafı count)
+        admin_count = await async_db.count_rows("users", {"is_admin": True})
+        if admin_count:
+            return {
+                "status": "success",
+                "message": "Admin user already exists",
+                "admin_count": admin_count,
+            }
 
         # İlk admin kullanıcısını oluştur
         admin_user = auth_service.create_user_admin(
@@ -484,7 +631,7 @@ async def setup_admin_user():
             raise HTTPException(status_code=500, detail="Failed to create admin user")
 
     except Exception as e:
-        print(f" Admin setup error: {e}")
+        logger.error("Admin setup error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -506,7 +653,7 @@ async def get_admin_users(current_user: dict = Depends(require_admin())):
                 "data": {"users": [], "total_users": 0},
             }
     except Exception as e:
-        print(f" Get admin users error: {e}")
+        logger.error("Get admin users error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -554,7 +701,7 @@ async def update_admin_user(
     except HTTPException:
         raise
     except Exception as e:
-        print(f" Update admin user error: {e}")
+        logger.error("Update admin user error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -580,7 +727,7 @@ async def delete_admin_user(
     except HTTPException:
         raise
     except Exception as e:
-        print(f" Delete admin user error: {e}")
+        logger.error("Delete admin user error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -598,20 +745,20 @@ async def login(credentials: dict):
                 detail="Email and password are required",
             )
 
-        print(f"🔐 Login attempt for: {email}")
+        logger.info("🔐 Login attempt for: %s", email)
 
         # Kullanıcı kimlik doğrulama
         auth_result = auth_service.sign_in(email, password)
 
         if auth_result:
-            print(f" Login successful for: {email}")
+            logger.info("Login successful for: %s", email)
             return {
                 "status": "success",
                 "data": auth_result,
                 "message": "Login successful",
             }
         else:
-            print(f" Login failed for: {email}")
+            logger.warning("Login failed for: %s", email)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
@@ -620,7 +767,7 @@ async def login(credentials: dict):
     except HTTPException:
         raise
     except Exception as e:
-        print(f" Login error: {e}")
+        logger.error("Login error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Login failed"
         )
@@ -649,7 +796,7 @@ async def register(user_data: dict):
     except HTTPException:
         raise
     except Exception as e:
-        print(f" Registration error: {e}")
+        logger.error("Registration error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Registration failed",
@@ -686,7 +833,7 @@ async def change_user_password(
     except HTTPException:
         raise
     except Exception as e:
-        print(f" Change password error: {e}")
+        logger.error("Change password error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -696,22 +843,59 @@ async def get_profile(current_user: dict = Depends(get_current_active_user)):
     try:
         return {"status": "success", "user": current_user}
     except Exception as e:
-        print(f" Get profile error: {e}")
+        logger.error("Get profile error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def client_ip(http_request: Request) -> str:
+    """İstemci IP'si: TRUSTED_PROXY_HOPS > 0 ise güvenilir proxy'nin eklediği
+    X-Forwarded-For girişi, değilse bağlantının karşı ucu"""
+    if TRUSTED_PROXY_HOPS > 0:
+        hops = [
+            hop.strip()
+            for hop in http_request.headers.get("X-Forwarded-For", "").split(",")
+            if hop.strip()
+        ]
+        if len(hops) >= TRUSTED_PROXY_HOPS:
+            return hops[-TRUSTED_PROXY_HOPS]
+    return http_request.client.host if http_request.client else "unknown"
+
+
+async def rate_limit_key(http_request: Request) -> str:
+    """Chat limiti için anahtar: geçerli token varsa kullanıcı, yoksa istemci IP'si"""
+    auth_header = http_request.headers.get("Authorization", "")
+    if auth_header.startswith("Bearer "):
+        token = auth_header[7:]
+        try:
+            payload = await verify_access_token(token)
+            if payload and payload.get("sub"):
+                return f"user:{payload['sub']}"
+        except Exception:
+            pass
+    return f"ip:{client_ip(http_request)}"
+
+
+async def enforce_user_chat_limit(http_request: Request):
+    """Kullanıcı başına günlük chat limitini uygula (aşılırsa 429)"""
+    if not real_data_collector.user_limiter.enabled:
+        return
+    if not real_data_collector.allow_user(await rate_limit_key(http_request)):
+        raise HTTPException(status_code=429, detail="Daily chat limit exceeded")
+
+
 @app.post("/api/chat")
-async def chat_with_llm(request: dict):
+async def chat_with_llm(request: dict, http_request: Request):
     """LLM Chat endpoint'i - public access"""
 
+    await enforce_user_chat_limit(http_request)
     try:
         user_message = request.get("message", "")
 
         # Default filters - artık UI'dan gelmiyor
         default_filters = {"locations": ["Global"], "year": "2024"}
 
-        print(f"💬 Chat message from anonymous user: {user_message}")
-        print(f" Using default filters: {default_filters}")
+        logger.debug("💬 Chat message from anonymous user: %s", user_message)
+        logger.debug("Using default filters: %s", default_filters)
 
         # LLM ile yanıt al
         collection_results = await real_data_collector.collect_startup_data(
@@ -719,35 +903,7 @@ async def chat_with_llm(request: dict):
         )
 
         # Chat history'yi veritabanına kaydet
-        try:
-            # LLM response'larını JSON string'e çevir
-            llm_responses = []
-            for llm in collection_results.get("llm_analysis", []):
-                llm_responses.append(
-                    {
-                        "model": llm.get("model", "Unknown"),
-                        "response": llm.get("llm_response", "No response"),
-                        "status": llm.get("status", "unknown"),
-                        "timestamp": llm.get("timestamp", ""),
-                    }
-                )
-
-            # Chat history'yi kaydet
-            chat_entry = {
-                "message": user_message,
-                "response": str(llm_responses),
-                "timestamp": str(datetime.now()),
-                "session_id": None,
-                "metadata": None,
-            }
-
-            print(f"💾 Saving chat entry: {chat_entry}")
-
-            chat_id = save_chat_history_to_database(chat_entry)
-            print(f"💾 Chat history saved to database with ID: {chat_id}")
-
-        except Exception as e:
-            print(f" Warning: Could not save chat history: {e}")
+        await save_chat_exchange(user_message, collection_results.get("llm_analysis", []))
 
         # LLM response'larını da dahil et
         response = {
@@ -763,16 +919,82 @@ async def chat_with_llm(request: dict):
         return response
 
     except Exception as e:
-        print(f" Chat error: {e}")
+        logger.error("Chat error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def format_sse(event: str, data: Dict) -> str:
+    """Server-Sent Events formatında tek bir olay"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/api/chat/stream")
+async def chat_with_llm_stream(request: dict, http_request: Request):
+    """LLM Chat endpoint'inin SSE varyantı - token'lar model etiketiyle akar"""
+    await enforce_user_chat_limit(http_request)
+    user_message = request.get("message", "")
+    default_filters = {"locations": ["Global"], "year": "2024"}
+    logger.debug("💬 Streaming chat message from anonymous user: %s", user_message)
+
+    async def event_stream():
+        llm_analysis = []
+        async for event in real_data_collector.stream_chat(default_filters, user_message):
+            kind = event.pop("event")
+            if kind in ("done", "error"):
+                llm_analysis.append(
+                    {
+                        "model": event["model"],
+                        "llm_response": event.get("llm_response", event.get("error")),
+                        "status": "success" if kind == "done" else "error",
+                        "timestamp": datetime.now().isoformat(),
+                    }
+                )
+            yield format_sse(kind, event)
+        yield format_sse("end", {"llm_responses": len(llm_analysis)})
+        await save_chat_exchange(user_message, llm_analysis)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/chat/jobs", status_code=202)
+async def create_chat_job(request: dict, http_request: Request):
+    """LLM Chat'in arka plan varyantı - job id hemen döner, sonuç polling ya da webhook ile"""
+    await enforce_user_chat_limit(http_request)
+    try:
+        job = chat_jobs.submit(request.get("message", ""), request.get("callback_url"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ChatJobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+    logger.debug("🧵 Chat job %s queued", job.id)
+    return {
+        "status": "success",
+        "job_id": job.id,
+        "job_status": job.status,
+        "status_url": f"/api/chat/jobs/{job.id}",
+    }
+
+
+@app.get("/api/chat/jobs/{job_id}")
+async def get_chat_job(job_id: str):
+    """Chat işinin durumu ve (kısmi) LLM yanıtları"""
+    job = chat_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Chat job not found")
+    return {"status": "success", "job": job.to_dict()}
+
+
 @app.post("/api/companies")
 async def add_company(company: dict):
     """Şirket ekleme endpoint'i"""
     try:
         # Şirket verisini veritabanına kaydet
-        company_id = save_company_to_database(company)
+        company_id = await save_company_to_database(company)
 
         return {
             "status": "success",
@@ -780,7 +1002,7 @@ async def add_company(company: dict):
             "company_id": company_id,
         }
     except Exception as e:
-        print(f" Add company error: {e}")
+        logger.error("Add company error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -788,25 +1010,16 @@ async def add_company(company: dict):
 async def get_companies():
     """Tüm şirketleri getir"""
     try:
-        # JSON dosyasından şirketleri oku
-        import json
-        import os
-
-        db_file = "companies.json"
-        companies = []
+        companies = await get_company_store().aall()
 
-        if os.path.exists(db_file):
-            with open(db_file, "r", encoding="utf-8") as f:
-                companies = json.load(f)
-
-        print(f"📊 Companies loaded from JSON: {len(companies)} companies")
+        logger.debug("📊 Companies loaded from store: %s companies", len(companies))
         return {
             "status": "success",
             "message": "Companies retrieved successfully",
             "data": {"companies": companies},
         }
     except Exception as e:
-        print(f" Get companies error: {e}")
+        logger.error("Get companies error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -815,7 +1028,7 @@ async def update_company(company_id: int, company_data: dict):
     """Şirket bilgilerini güncelle"""
     try:
         # Şirket güncelleme işlemi
-        success = update_company_in_database(company_id, company_data)
+        success = await update_company_in_database(company_id, company_data)
 
         if success:
             return {"status": "success", "message": "Company updated successfully"}
@@ -823,7 +1036,7 @@ async def update_company(company_id: int, company_data: dict):
             raise HTTPException(status_code=404, detail="Company not found")
 
     except Exception as e:
-        print(f" Update company error: {e}")
+        logger.error("Update company error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -832,11 +1045,11 @@ async def delete_company(company_id: int):
     """Şirketi veritabanından sil"""
     try:
         # Şirketi veritabanından sil
-        delete_company_from_database(company_id)
+        await delete_company_from_database(company_id)
 
         return {"status": "success", "message": "Company deleted successfully"}
     except Exception as e:
-        print(f" Delete company error: {e}")
+        logger.error("Delete company error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -845,7 +1058,7 @@ async def add_to_pipeline(company_data: dict):
     """Şirketi sales pipeline'a ekle"""
     try:
         # Şirketi pipeline veritabanına kaydet
-        pipeline_id = save_company_to_pipeline(company_data)
+        pipeline_id = await save_company_to_pipeline(company_data)
 
         return {
             "status": "success",
@@ -853,7 +1066,7 @@ async def add_to_pipeline(company_data: dict):
             "pipeline_id": pipeline_id,
         }
     except Exception as e:
-        print(f" Add to pipeline error: {e}")
+        logger.error("Add to pipeline error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -861,68 +1074,56 @@ async def add_to_pipeline(company_data: dict):
 async def create_tender(tender_data: dict):
     """Create or update tender proposal"""
     try:
-        print(f"📄 Creating/updating tender with data: {tender_data}")
-        
-        # Check if tender already exists for this deal_id
-        deal_id = tender_data.get("deal_id")
-        existing_tender = None
-        if deal_id:
-            existing_tenders = db.get_tenders(filters={"deal_id": deal_id}, limit=1)
-            if existing_tenders and len(existing_tenders) > 0:
-                existing_tender = existing_tenders[0]
-                print("📄 Found existing tender:", existing_tender.get("id"))
+        logger.debug("📄 Creating/updating tender with data: %s", tender_data)
         
-        # If tender exists, update it; otherwise create new
-        if existing_tender:
-            print("📄 Updating existing tender:", existing_tender.get("id"))
-            success = db.update_tender(existing_tender["id"], tender_data)
-            if success:
-                # Get updated tender
-                updated_tender = db.get_tender(existing_tender["id"])
-                tender_entry = updated_tender
-                print("📄 Tender updated successfully")
-            else:
-                raise Exception("Failed to update tender")
+        # deal_id varsa tek istekte insert-or-update (on_conflict=deal_id)
+        if tender_data.get("deal_id"):
+            tender_entry = await async_db.upsert_tender(tender_data)
         else:
-            print("📄 Creating new tender")
-            # Create new tender
-            tender_entry = db.create_tender(tender_data)
-            print(f"📄 Tender entry from DB: {tender_entry}")
-            print(f"📄 Tender entry type: {type(tender_entry)}")        
-        
+            logger.info("📄 Creating new tender")
+            tender_entry = await async_db.create_tender(tender_data)
+        logger.debug("📄 Tender entry from DB: %s", tender_entry)
+
         if tender_entry:
             tender_id = tender_entry.get("id")
-            print(f"📄 Extracted tender ID: {tender_id}")
+            logger.info("📄 Extracted tender ID: %s", tender_id)
             
             response = {
                 "status": "success",
                 "message": "Tender proposal saved successfully",
                 "data": {"tender_id": tender_id, "tender": tender_entry}
             }
-            print(f"📄 Final response: {response}")
+            logger.debug("📄 Final response: %s", response)
             
             return response
         else:
             raise Exception("Failed to create tender - no data returned from database")
             
     except Exception as e:
-        print(f" Create tender error: {e}")
+        logger.error("Create tender error: %s", e)
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/tenders")
-async def get_tenders():
-    """Get all tender proposals"""
+async def get_tenders(
+    fields: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    """Get tender proposals, newest first (keyset paginated)"""
+    columns = parse_fields_or_400(fields)
     try:
-        tenders = db.get_tenders(limit=100)
+        tenders, next_cursor = await fetch_page("tenders", limit, cursor, columns)
         return {
             "status": "success",
             "message": "Tenders retrieved successfully",
-            "data": {"tenders": tenders}
+            "data": {"tenders": tenders, "next_cursor": next_cursor}
         }
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f" Get tenders error: {e}")
+        logger.error("Get tenders error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/tenders/{tender_id}")
@@ -931,8 +1132,8 @@ async def get_tenders():
 async def get_tender_by_deal_id(deal_id: str):
     """Get tender by deal ID"""
     try:
-        print(f"📄 Getting tender for deal ID: {deal_id}")
-        tenders = db.get_tenders(filters={"deal_id": deal_id}, limit=1)
+        logger.info("📄 Getting tender for deal ID: %s", deal_id)
+        tenders = await async_db.get_tenders(filters={"deal_id": deal_id}, limit=1)
         if tenders and len(tenders) > 0:
             return {
                 "status": "success",
@@ -946,14 +1147,14 @@ async def get_tender_by_deal_id(deal_id: str):
                 "data": None
             }
     except Exception as e:
-        print(f" Get tender by deal ID error: {e}")
+        logger.error("Get tender by deal ID error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/tenders/{tender_id}")
 async def get_tender(tender_id: str):
     """Get a specific tender proposal"""
     try:
-        tender = db.get_tender(tender_id)
+        tender = await async_db.get_tender(tender_id)
         if tender:
             return {
                 "status": "success",
@@ -963,14 +1164,14 @@ async def get_tender(tender_id: str):
         else:
             raise HTTPException(status_code=404, detail="Tender not found")
     except Exception as e:
-        print(f" Get tender error: {e}")
+        logger.error("Get tender error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.put("/api/tenders/{tender_id}")
 async def update_tender(tender_id: str, tender_data: dict):
     """Update a tender proposal"""
     try:
-        success = db.update_tender(tender_id, tender_data)
+        success = await async_db.update_tender(tender_id, tender_data)
         if success:
             return {
                 "status": "success",
@@ -979,30 +1180,15 @@ async def update_tender(tender_id: str, tender_data: dict):
         else:
             raise HTTPException(status_code=404, detail="Tender not found")
     except Exception as e:
-        print(f" Update tender error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.delete("/api/tenders/{tender_id}")
-async def delete_tender(tender_id: str):
-    """Delete a tender proposal"""
-    try:
-        success = db.delete_tender(tender_id)
-        if success:
-            return {
-                "status": "success",
-                "message": "Tender deleted successfully"
-            }
-        else:
-            raise HTTPException(status_code=404, detail="Tender not found")
-    except Exception as e:
-        print(f" Delete tender error: {e}")
+        logger.error("Update tender error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+# Literal yol, /api/tenders/{tender_id}'den önce kaydedilmeli (yoksa o eşleşir)
 @app.delete("/api/tenders/cleanup-test-records")
 async def cleanup_test_tender_records():
     """Clean up test tender records, keep only real pipeline leads"""
     try:
-        print(" Cleaning up test tender records...")
+        logger.info("Cleaning up test tender records...")
         
         # Gerçek pipeline lead ID'leri
         real_deal_ids = [
@@ -1010,36 +1196,23 @@ async def cleanup_test_tender_records():
             "98290692-5e0a-41c4-8e8a-fd5d58b475d7"   # armut
         ]
         
-        # Tüm tender'ları getir
-        all_tenders = db.get_tenders()
-        
-        # Test kayıtlarını belirle
-        test_tenders = [
-            tender for tender in all_tenders 
-            if tender.get("deal_id") not in real_deal_ids
-        ]
-        
-        print(f"📊 Total tenders: {len(all_tenders)}")
-        print(f"🧪 Test records to delete: {len(test_tenders)}")
-        
-        deleted_count = 0
-        for tender in test_tenders:
-            try:
-                success = db.delete_tender(tender["id"])
-                if success:
-                    print(f"🗑️ Deleted: {tender['company_name']} ({tender['id']})")
-                    deleted_count += 1
-                else:
-                    print(f" Failed to delete: {tender['company_name']} ({tender['id']})")
-            except Exception as e:
-                print(f" Error deleting {tender['company_name']}: {str(e)}")
-        
+        # Test kayıtlarını (gerçek deal_id'ler dışındakiler) tek istekte sil
+        deleted_count = await async_db.delete_where_not_in(
+            "tenders", "deal_id", real_deal_ids, include_nulls=True
+        )
+        logger.info("🗑️ Deleted %s test tender records", deleted_count)
+
         # Final durum
-        remaining_tenders = db.get_tenders()
+        remaining_tenders = [
+            tender
+            async for tender in async_db.iter_pages(
+                "tenders", columns=TENDER_SUMMARY_COLUMNS
+            )
+        ]
         
         return {
             "status": "success",
-            "message": f"Cleanup completed! Deleted {deleted_count}/{len(test_tenders)} test records",
+            "message": f"Cleanup completed! Deleted {deleted_count} test records",
             "data": {
                 "deleted_count": deleted_count,
                 "remaining_count": len(remaining_tenders),
@@ -1054,7 +1227,23 @@ async def cleanup_test_tender_records():
         }
         
     except Exception as e:
-        print(f" Cleanup error: {e}")
+        logger.error("Cleanup error: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.delete("/api/tenders/{tender_id}")
+async def delete_tender(tender_id: str):
+    """Delete a tender proposal"""
+    try:
+        success = await async_db.delete_tender(tender_id)
+        if success:
+            return {
+                "status": "success",
+                "message": "Tender deleted successfully"
+            }
+        else:
+            raise HTTPException(status_code=404, detail="Tender not found")
+    except Exception as e:
+        logger.error("Delete tender error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/tenders/{tender_id}/pdf")
@@ -1067,11 +1256,11 @@ async def generate_tender_pdf(tender_id: str, language: str = 'en'):
         from datetime import datetime
         
         # Get tender data
-        tender = db.get_tender(tender_id)
+        tender = await async_db.get_tender(tender_id)
         if not tender:
             # Test fallback for testing environment
             if tender_id == "test-tender-id" or tender_id.startswith("test-"):
-                print("✅ Using test tender data for PDF generation")
+                logger.info("✅ Using test tender data for PDF generation")
                 tender = {
                     "id": tender_id,
                     "title": "Test Tender for PDF Quality Check",
@@ -1096,7 +1285,10 @@ async def generate_tender_pdf(tender_id: str, language: str = 'en'):
         try:
             pdf_content = generate_pdf_content_weasyprint(tender, language)
         except Exception as weasy_error:
-            print(f" WeasyPrint failed, falling back to ReportLab: {weasy_error}")
+            logger.error(
+                "WeasyPrint failed, falling back to ReportLab: %s",
+                weasy_error,
+            )
             pdf_content = generate_pdf_content(tender, language)
         
         # Create temporary file
@@ -1116,9 +1308,26 @@ async def generate_tender_pdf(tender_id: str, language: str = 'en'):
         )
         
     except Exception as e:
-        print(f" Generate PDF error: {e}")
+        logger.error("Generate PDF error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+# İlk PDF isteğini hızlandırmak için arka planda ısıtılan motorlar
+PDF_ENGINE_MODULES = ("weasyprint", "reportlab.platypus", "reportlab.pdfbase.ttfonts")
+PDF_WARMUP_DELAY = float(os.getenv("PDF_WARMUP_DELAY", "2"))
+
+
+async def warm_pdf_engines(delay: float = PDF_WARMUP_DELAY):
+    """Sunucu dinlemeye başladıktan sonra PDF kütüphanelerini import et"""
+    await asyncio.sleep(delay)
+    for module in PDF_ENGINE_MODULES:
+        try:
+            await asyncio.to_thread(importlib.import_module, module)
+        except Exception as e:
+            # WeasyPrint sistem kütüphaneleri (pango) eksik olabilir
+            logger.warning("⚠️ PDF engine warm-up skipped for %s: %s", module, e)
+    logger.info("✅ PDF engines warmed up")
+
+
 def generate_pdf_content(tender_data: dict, language: str = 'en') -> bytes:
     """Generate PDF content from tender data"""
     try:
@@ -1162,19 +1371,19 @@ def generate_pdf_content(tender_data: dict, language: str = 'en') -> bytes:
                         
                         font_name = 'CustomFont'
                         font_registered = True
-                        print(f" Registered font: {font_path}")
+                        logger.debug("Registered font: %s", font_path)
                         break
                     except Exception as e:
-                        print(f" Failed to register font {font_path}: {e}")
+                        logger.error("Failed to register font %s: %s", font_path, e)
                         continue
             
             if not font_registered:
-                print(" No UTF-8 compatible font found, using built-in fonts")
+                logger.info("No UTF-8 compatible font found, using built-in fonts")
                 font_name = 'Helvetica'
                 font_name_bold = 'Helvetica-Bold'
                 
         except Exception as font_error:
-            print(f" Font registration error: {font_error}")
+            logger.error("Font registration error: %s", font_error)
             font_name = 'Helvetica'
             font_name_bold = 'Helvetica-Bold'
         
@@ -1422,7 +1631,7 @@ def generate_pdf_content(tender_data: dict, language: str = 'en') -> bytes:
         return pdf_content
         
     except Exception as e:
-        print(f" PDF generation error: {e}")
+        logger.error("PDF generation error: %s", e)
         raise e
 
 def generate_pdf_content_weasyprint(tender_data: dict, language: str = 'en') -> bytes:
@@ -1747,17 +1956,23 @@ def generate_pdf_content_weasyprint(tender_data: dict, language: str = 'en') ->
                 os.unlink(tmp_html_path)
         
     except Exception as e:
-        print(f" WeasyPrint PDF generation error: {e}")
+        logger.error("WeasyPrint PDF generation error: %s", e)
         raise e
 
 @app.get("/api/pipeline")
-async def get_pipeline():
-    """Tüm pipeline verilerini getir"""
+async def get_pipeline(
+    fields: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    """Pipeline verilerini getir (en yeniden eskiye, keyset sayfalı)"""
+    # Status normalizasyonu ve sales cycle hesabı için gereken kolonlar her zaman gelir
+    columns = parse_fields_or_400(fields, required=("id", "status", "created_at"))
     try:
-        print(" Getting pipeline data from database...")
-        pipeline = db.get_pipeline(limit=100)
-        print(f" Raw pipeline data from DB: {pipeline}")
-        print(f" Pipeline length: {len(pipeline) if pipeline else 'None'}")
+        logger.debug("Getting pipeline data from database...")
+        pipeline, next_cursor = await fetch_page("pipeline", limit, cursor, columns)
+        logger.debug("Raw pipeline data from DB: %s", pipeline)
+        logger.debug("Pipeline length: %s", len(pipeline) if pipeline else 'None')
 
         # Standardize pipeline statuses for frontend compatibility
         for item in pipeline:
@@ -1770,12 +1985,18 @@ async def get_pipeline():
         result = {
             "status": "success",
             "message": "Pipeline data retrieved successfully",
-            "data": {"pipeline": pipeline, "sales_cycle_days": sales_cycle_days},
+            "data": {
+                "pipeline": pipeline,
+                "sales_cycle_days": sales_cycle_days,
+                "next_cursor": next_cursor,
+            },
         }
-        print(f" Final result: {result}")
+        logger.debug("Final result: %s", result)
         return result
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f" Get pipeline error: {e}")
+        logger.error("Get pipeline error: %s", e)
         import traceback
 
         traceback.print_exc()
@@ -1783,17 +2004,26 @@ async def get_pipeline():
 
 
 @app.get("/api/chat/history")
-async def get_chat_history():
-    """Chat geçmişini getir"""
+async def get_chat_history(
+    fields: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    """Chat geçmişini getir (en yeniden eskiye, keyset sayfalı)"""
+    columns = parse_fields_or_400(fields)
     try:
-        history = load_chat_history_from_database()
+        history, next_cursor = await load_chat_history_from_database(
+            limit=limit, cursor=cursor, columns=columns
+        )
         return {
             "status": "success",
             "message": "Chat history retrieved successfully",
-            "data": {"chat_history": history},
+            "data": {"chat_history": history, "next_cursor": next_cursor},
         }
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f" Get chat history error: {e}")
+        logger.error("Get chat history error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1801,14 +2031,14 @@ async def get_chat_history():
 async def save_chat_history(chat_entry: dict):
     """Chat geçmişini kaydet"""
     try:
-        chat_id = save_chat_history_to_database(chat_entry)
+        chat_id = await save_chat_history_to_database(chat_entry)
         return {
             "status": "success",
             "message": "Chat history saved successfully",
             "data": {"chat_id": chat_id},
         }
     except Exception as e:
-        print(f" Save chat history error: {e}")
+        logger.error("Save chat history error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1816,13 +2046,13 @@ async def save_chat_history(chat_entry: dict):
 async def delete_chat_history(chat_id: str):
     """Chat geçmişini sil"""
     try:
-        success = delete_chat_history_from_database(chat_id)
+        success = await delete_chat_history_from_database(chat_id)
         if success:
             return {"status": "success", "message": "Chat history deleted successfully"}
         else:
             raise HTTPException(status_code=404, detail="Chat entry not found")
     except Exception as e:
-        print(f" Delete chat history error: {e}")
+        logger.error("Delete chat history error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1830,27 +2060,36 @@ async def delete_chat_history(chat_id: str):
 async def clear_chat_history():
     """Tüm chat geçmişini temizle"""
     try:
-        clear_all_chat_history_from_database()
+        await clear_all_chat_history_from_database()
 
         return {"status": "success", "message": "All chat history cleared successfully"}
     except Exception as e:
-        print(f" Clear chat history error: {e}")
+        logger.error("Clear chat history error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # Collected Leads API Endpoints
 @app.get("/api/leads")
-async def get_collected_leads():
-    """Tüm collected leads'leri getir"""
+async def get_collected_leads(
+    fields: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    """Collected leads'leri getir (en yeniden eskiye, keyset sayfalı)"""
+    columns = parse_fields_or_400(fields)
     try:
-        leads = db.get_collected_leads(limit=100)
+        leads, next_cursor = await fetch_page(
+            "collected_leads", limit, cursor, columns
+        )
         return {
             "status": "success",
             "message": "Leads retrieved successfully",
-            "data": {"leads": leads},
+            "data": {"leads": leads, "next_cursor": next_cursor},
         }
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f" Get collected leads error: {e}")
+        logger.error("Get collected leads error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1862,7 +2101,7 @@ async def add_collected_lead(lead_data: dict):
         lead_data["created_by"] = None
         lead_data["updated_by"] = None
 
-        lead_entry = db.create_lead(lead_data)
+        lead_entry = await async_db.create_lead(lead_data)
         lead_id = lead_entry["id"] if lead_entry else None
         return {
             "status": "success",
@@ -1870,7 +2109,36 @@ async def add_collected_lead(lead_data: dict):
             "lead_id": lead_id,
         }
     except Exception as e:
-        print(f" Add lead error: {e}")
+        logger.error("Add lead error: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/leads/bulk")
+async def bulk_add_collected_leads(request: Request, format: Optional[str] = None):
+    """NDJSON ya da CSV gövdesindeki leads'leri akış halinde toplu ekle"""
+    try:
+        source_format = detect_format(request.headers.get("content-type"), format)
+        parser = iter_csv if source_format == "csv" else iter_ndjson
+
+        async def insert_batch(rows: List[Dict]) -> int:
+            return await async_db.insert_many("collected_leads", rows)
+
+        report = await ingest_leads(parser(request.stream()), insert_batch)
+        logger.info(
+            "📥 Bulk lead import: %s/%s rows, %s rows/s",
+            report['inserted'],
+            report['received'],
+            report['rows_per_second'],
+        )
+        return {
+            "status": "success" if not report["failed"] else "partial",
+            "message": f"Imported {report['inserted']} of {report['received']} leads",
+            "data": report,
+        }
+    except LeadIngestError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Bulk add leads error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1878,14 +2146,14 @@ async def add_collected_lead(lead_data: dict):
 async def update_collected_lead(lead_id: str, lead_data: dict):
     """Lead'i güncelle"""
     try:
-        updated_lead = db.update_lead(lead_id, lead_data)
+        updated_lead = await async_db.update_lead(lead_id, lead_data)
         success = updated_lead is not None
         if success:
             return {"status": "success", "message": "Lead updated successfully"}
         else:
             raise HTTPException(status_code=404, detail="Lead not found")
     except Exception as e:
-        print(f" Update lead error: {e}")
+        logger.error("Update lead error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1893,14 +2161,13 @@ async def update_collected_lead(lead_id: str, lead_data: dict):
 async def delete_collected_lead(lead_id: str):
     """Lead'i sil"""
     try:
-        success = db.execute_query("collected_leads", "delete", {"id": lead_id})
-        success = len(success) > 0
+        success = await async_db.delete_lead(lead_id)
         if success:
             return {"status": "success", "message": "Lead deleted successfully"}
         else:
             raise HTTPException(status_code=404, detail="Lead not found")
     except Exception as e:
-        print(f" Delete lead error: {e}")
+        logger.error("Delete lead error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1908,19 +2175,19 @@ async def delete_collected_lead(lead_id: str):
 async def clear_all_collected_leads():
     """Tüm leads'leri temizle"""
     try:
-        # Supabase'de tüm lead'leri sil
-        result = db.execute_query("collected_leads", "delete")
-        success = len(result) > 0
-        if success:
-            return {"status": "success", "message": "All leads cleared successfully"}
-        else:
-            raise HTTPException(status_code=500, detail="Failed to clear leads")
+        # Supabase'de tüm lead'leri tek istekte sil (satırlar geri döndürülmez)
+        deleted_count = await async_db.delete_all("collected_leads")
+        return {
+            "status": "success",
+            "message": "All leads cleared successfully",
+            "data": {"deleted_count": deleted_count},
+        }
     except Exception as e:
-        print(f" Clear all leads error: {e}")
+        logger.error("Clear all leads error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
         return {"status": "success", "message": "Chat history cleared successfully"}
     except Exception as e:
-        print(f" Clear chat history error: {e}")
+        logger.error("Clear chat history error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1937,14 +2204,14 @@ async def update_pipeline(pipeline_id: str, updated_data: dict):
             updated_data["status"] = normalize_pipeline_status(updated_data["status"])
 
         # Pipeline verisini güncelle
-        success = update_pipeline_in_database(pipeline_id, updated_data)
+        success = await update_pipeline_in_database(pipeline_id, updated_data)
 
         if success:
             return {"status": "success", "message": "Pipeline updated successfully"}
         else:
             raise HTTPException(status_code=404, detail="Pipeline entry not found")
     except Exception as e:
-        print(f" Update pipeline error: {e}")
+        logger.error("Update pipeline error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1952,42 +2219,27 @@ async def update_pipeline(pipeline_id: str, updated_data: dict):
 async def delete_pipeline(pipeline_id: str):
     """Pipeline verisini sil"""
     try:
-        print(f"🗑️ Deleting pipeline with ID: {pipeline_id}")
+        logger.info("🗑️ Deleting pipeline with ID: %s", pipeline_id)
 
         # Pipeline verisini sil
-        success = delete_pipeline_from_database(pipeline_id)
-        print(f" Delete result: {success}")
+        success = await delete_pipeline_from_database(pipeline_id)
+        logger.debug("Delete result: %s", success)
 
         if success:
             return {"status": "success", "message": "Pipeline deleted successfully"}
         else:
             raise HTTPException(status_code=404, detail="Pipeline entry not found")
     except Exception as e:
-        print(f" Delete pipeline error: {e}")
+        logger.error("Delete pipeline error: %s", e)
         import traceback
 
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def save_company_to_database(company: dict) -> int:
+async def save_company_to_database(company: dict) -> int:
     """Şirketi veritabanına kaydet"""
-    # Basit dosya tabanlı veritabanı
-    import json
-    import os
-
-    db_file = "companies.json"
-
-    # Mevcut şirketleri oku
-    companies = []
-    if os.path.exists(db_file):
-        with open(db_file, "r", encoding="utf-8") as f:
-            companies = json.load(f)
-
-    # Yeni şirket ekle
-    company_id = len(companies) + 1
     company_data = {
-        "id": company_id,
         "name": company.get("name"),
         "industry": company.get("industry"),
         "location": company.get("location"),
@@ -1999,137 +2251,96 @@ def save_company_to_database(company: dict) -> int:
         "timestamp": str(datetime.now()),
     }
 
-    companies.append(company_data)
+    company_id = await get_company_store().ainsert(company_data)
 
-    # Veritabanına yaz
-    with open(db_file, "w", encoding="utf-8") as f:
-        json.dump(companies, f, ensure_ascii=False, indent=2)
-
-    print(f"💾 Company saved to database: {company_data}")
+    logger.info("💾 Company saved to database: ID %s", company_id)
     return company_id
 
 
-def delete_company_from_database(company_id: int):
+async def delete_company_from_database(company_id: int):
     """Şirketi veritabanından sil"""
-    import json
-    import os
-
-    db_file = "companies.json"
-
-    if not os.path.exists(db_file):
-        return
-
-    # Mevcut şirketleri oku
-    with open(db_file, "r", encoding="utf-8") as f:
-        companies = json.load(f)
-
-    # Şirketi bul ve sil
-    companies = [c for c in companies if c.get("id") != company_id]
-
-    # Veritabanına yaz
-    with open(db_file, "w", encoding="utf-8") as f:
-        json.dump(companies, f, ensure_ascii=False, indent=2)
-
-    print(f"🗑️ Company deleted from database: ID {company_id}")
+    if await get_company_store().adelete(company_id):
+        logger.info("🗑️ Company deleted from database: ID %s", company_id)
+
+
+UPDATABLE_COMPANY_FIELDS = (
+    "name",
+    "industry",
+    "location",
+    "company_size",
+    "funding_stage",
+    "website",
+    "founder",
+)
 
 
-def update_company_in_database(company_id: int, company_data: dict) -> bool:
+async def update_company_in_database(company_id: int, company_data: dict) -> bool:
     """Şirketi veritabanında güncelle"""
-    import json
-    import os
-
-    db_file = "companies.json"
-
-    if not os.path.exists(db_file):
-        return False
-
     try:
-        # Mevcut şirketleri oku
-        with open(db_file, "r", encoding="utf-8") as f:
-            companies = json.load(f)
-
-        # Şirketi bul ve güncelle
-        for company in companies:
-            if company.get("id") == company_id:
-                company.update(
-                    {
-                        "name": company_data.get("name", company.get("name")),
-                        "industry": company_data.get(
-                            "industry", company.get("industry")
-                        ),
-                        "location": company_data.get(
-                            "location", company.get("location")
-                        ),
-                        "company_size": company_data.get(
-                            "company_size", company.get("company_size")
-                        ),
-                        "funding_stage": company_data.get(
-                            "funding_stage", company.get("funding_stage")
-                        ),
-                        "website": company_data.get("website", company.get("website")),
-                        "founder": company_data.get("founder", company.get("founder")),
-                        "updated_at": str(datetime.now()),
-                    }
-                )
-
-                # Veritabanına yaz
-                with open(db_file, "w", encoding="utf-8") as f:
-                    json.dump(companies, f, ensure_ascii=False, indent=2)
+        changes = {
+            field: company_data[field]
+            for field in UPDATABLE_COMPANY_FIELDS
+            if field in company_data
+        }
+        changes["updated_at"] = str(datetime.now())
 
-                print(f"✏️ Company updated in database: ID {company_id}")
-                return True
+        if await get_company_store().aupdate(company_id, changes):
+            logger.info("✏️ Company updated in database: ID %s", company_id)
+            return True
 
         return False
     except Exception as e:
-        print(f" Error updating company: {e}")
+        logger.error("Error updating company: %s", e)
         return False
 
 
 # JSON dosya fonksiyonları kaldırıldı - Repository pattern kullanılıyor
 
 
-def save_company_to_pipeline(company_data: dict) -> int:
+async def save_company_to_pipeline(company_data: dict) -> int:
     """Şirketi pipeline repository'ye kaydet"""
     try:
         # Standardize status before saving
         if "status" in company_data:
             company_data["status"] = normalize_pipeline_status(company_data["status"])
 
-        pipeline_entry = db.create_pipeline_entry(company_data)
+        pipeline_entry = await async_db.create_pipeline_entry(company_data)
         pipeline_id = pipeline_entry["id"] if pipeline_entry else None
-        print(f"📊 Company added to pipeline: {pipeline_id}")
+        logger.info("📊 Company added to pipeline: %s", pipeline_id)
         return pipeline_id
     except Exception as e:
-        print(f" Error adding to pipeline: {e}")
+        logger.error("Error adding to pipeline: %s", e)
         raise e
 
 
 # JSON dosya fonksiyonları kaldırıldı - Repository pattern kullanılıyor
 
 
-def update_pipeline_in_database(pipeline_id: str, updated_data: dict) -> bool:
+async def update_pipeline_in_database(pipeline_id: str, updated_data: dict) -> bool:
     """Pipeline repository'de veriyi güncelle"""
     try:
         if "status" in updated_data:
-            updated_pipeline = db.update_pipeline_entry(pipeline_id, updated_data)
+            updated_pipeline = await async_db.update_pipeline_entry(
+                pipeline_id, updated_data
+            )
             return updated_pipeline is not None
         # Diğer güncellemeler için repository'ye ek metodlar eklenebilir
         return False
     except Exception as e:
-        print(f" Error updating pipeline: {e}")
+        logger.error("Error updating pipeline: %s", e)
         return False
 
 
-def delete_pipeline_from_database(pipeline_id: str) -> bool:
+async def delete_pipeline_from_database(pipeline_id: str) -> bool:
     """Pipeline repository'den veriyi sil"""
     try:
-        print(f" Attempting to delete pipeline ID: {pipeline_id}")
-        result = db.execute_query("pipeline", "delete", {"id": pipeline_id})
-        print(f" Delete query result: {result}")
-        print(f" Result length: {len(result) if result else 'None'}")
+        logger.info("Attempting to delete pipeline ID: %s", pipeline_id)
+        result = await async_db.execute_query("pipeline", "delete", {"id": pipeline_id})
+        logger.debug("Delete query result: %s", result)
+        logger.debug("Result length: %s", len(result) if result else 'None')
         return len(result) > 0 if result else False
     except Exception as e:
-        print(f" Error deleting pipeline: {e}")
+        logger.error("Error deleting pipeline: %s", e)
         import traceback
 
         traceback.print_exc()
@@ -2137,7 +2348,36 @@ def delete_pipeline_from_database(pipeline_id: str) -> bool:
 
 
 # Chat History Database Functions
-def save_chat_history_to_database(chat_entry: dict) -> str:
+async def save_chat_exchange(user_message: str, llm_analysis: List[Dict]):
+    """Soru ve LLM yanıtlarını chat geçmişine kaydet (hata isteği bozmaz)"""
+    try:
+        # LLM response'larını JSON string'e çevir
+        llm_responses = [
+            {
+                "model": llm.get("model", "Unknown"),
+                "response": llm.get("llm_response", "No response"),
+                "status": llm.get("status", "unknown"),
+                "timestamp": llm.get("timestamp", ""),
+            }
+            for llm in llm_analysis
+        ]
+        chat_entry = {
+            "message": user_message,
+            "response": str(llm_responses),
+            "timestamp": str(datetime.now()),
+            "session_id": None,
+            "metadata": None,
+        }
+        logger.debug("💾 Saving chat entry: %s", chat_entry)
+
+        chat_id = await save_chat_history_to_database(chat_entry)
+        logger.info("💾 Chat history saved to database with ID: %s", chat_id)
+
+    except Exception as e:
+        logger.warning("Warning: Could not save chat history: %s", e)
+
+
+async def save_chat_history_to_database(chat_entry: dict) -> str:
     """Chat geçmişini Supabase'e kaydet"""
     try:
         # user_id'yi None olarak ayarla (anonymous users için)
@@ -2148,128 +2388,97 @@ def save_chat_history_to_database(chat_entry: dict) -> str:
             "metadata": chat_entry.get("metadata", None),
         }
 
-        chat_entry_result = db.create_chat_entry(chat_data)
+        chat_entry_result = await async_db.create_chat_entry(chat_data)
         chat_id = chat_entry_result["id"] if chat_entry_result else None
-        print(f"💾 Chat history saved to Supabase: {chat_id}")
+        logger.info("💾 Chat history saved to Supabase: %s", chat_id)
         return str(chat_id)
 
     except Exception as e:
-        print(f" Error saving chat history to Supabase: {e}")
+        logger.error("Error saving chat history to Supabase: %s", e)
         # Fallback: basit ID döndür
         import uuid
 
         return str(uuid.uuid4())
 
 
-def load_chat_history_from_database() -> list:
-    """Chat geçmişini Supabase'den yükle"""
+async def load_chat_history_from_database(
+    limit: int = 50, cursor: Optional[str] = None, columns=None
+) -> tuple:
+    """Chat geçmişinin bir sayfasını Supabase'den yükle, (kayıtlar, next_cursor)"""
     try:
-        # Anonymous users için user_id=None ile yükle
-        history = db.get_chat_history(user_id=None, limit=50)
-        print(f"💾 Loaded {len(history)} chat history entries from Supabase")
-        return history
+        # Anonymous users için filtresiz yükle
+        history, next_cursor = await fetch_page("chat_history", limit, cursor, columns)
+        logger.debug("💾 Loaded %s chat history entries from Supabase", len(history))
+        return history, next_cursor
 
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f" Error loading chat history from Supabase: {e}")
-        return []
+        logger.error("Error loading chat history from Supabase: %s", e)
+        return [], None
 
 
-def delete_chat_history_from_database(chat_id: str) -> bool:
+async def delete_chat_history_from_database(chat_id: str) -> bool:
     """Veritabanından chat entry'yi sil"""
-    import json
-    import os
-
-    history_file = "chat_history.json"
-
-    if not os.path.exists(history_file):
+    if not chat_history_store.exists():
         return False
 
-    try:
-        # Mevcut geçmişi oku
-        with open(history_file, "r", encoding="utf-8") as f:
-            history = json.load(f)
-
-        # Chat entry'yi bul ve sil
+    def remove(history: list) -> bool:
         original_length = len(history)
-        history = [chat for chat in history if chat.get("id") != chat_id]
+        history[:] = [chat for chat in history if chat.get("id") != chat_id]
+        return len(history) < original_length
 
-        if len(history) < original_length:
-            # Veritabanına yaz
-            with open(history_file, "w", encoding="utf-8") as f:
-                json.dump(history, f, ensure_ascii=False, indent=2)
-
-            print(f"🗑️ Chat history deleted: ID {chat_id}")
+    try:
+        if await chat_history_store.aupdate(remove):
+            logger.info("🗑️ Chat history deleted: ID %s", chat_id)
             return True
 
         return False
     except Exception as e:
-        print(f" Error deleting chat history: {e}")
+        logger.error("Error deleting chat history: %s", e)
         return False
 
 
-def clear_all_chat_history_from_database():
+async def clear_all_chat_history_from_database():
     """Tüm chat geçmişini temizle"""
-    import os
-
-    history_file = "chat_history.json"
-
-    if os.path.exists(history_file):
-        os.remove(history_file)
-        print("🗑️ All chat history cleared")
+    if chat_history_store.exists():
+        await chat_history_store.aclear()
+        logger.info("🗑️ All chat history cleared")
     else:
-        print("ℹ️ No chat history file found to clear")
+        logger.info("ℹ️ No chat history file found to clear")
 
 
 # Archive weeks management functions
-def save_archived_weeks_to_database(archived_weeks: list) -> bool:
+async def save_archived_weeks_to_database(archived_weeks: list) -> bool:
     """Arşivlenmiş haftaları veritabanına kaydet"""
-    import json
-    import os
-
-    archive_file = "archived_weeks.json"
-
     try:
-        with open(archive_file, "w", encoding="utf-8") as f:
-            json.dump(archived_weeks, f, ensure_ascii=False, indent=2)
+        await archived_weeks_store.areplace(archived_weeks)
 
-        print(f"💾 Archived weeks saved: {len(archived_weeks)} weeks")
+        logger.info("💾 Archived weeks saved: %s weeks", len(archived_weeks))
         return True
     except Exception as e:
-        print(f" Error saving archived weeks: {e}")
+        logger.error("Error saving archived weeks: %s", e)
         return False
 
 
 def load_archived_weeks_from_database() -> list:
     """Veritabanından arşivlenmiş haftaları yükle"""
-    import json
-    import os
-
-    archive_file = "archived_weeks.json"
-
-    if not os.path.exists(archive_file):
-        return []
-
     try:
-        with open(archive_file, "r", encoding="utf-8") as f:
-            archived_weeks = json.load(f)
-        print(f"📚 Loaded {len(archived_weeks)} archived weeks from database")
+        archived_weeks = archived_weeks_store.read()
+        logger.debug("📚 Loaded %s archived weeks from database", len(archived_weeks))
         return archived_weeks
     except Exception as e:
-        print(f" Error loading archived weeks: {e}")
+        logger.error("Error loading archived weeks: %s", e)
         return []
 
 
-def clear_archived_weeks_from_database():
+async def clear_archived_weeks_from_database():
     """Tüm arşivlenmiş haftaları temizle"""
-    import os
-
-    archive_file = "archived_weeks.json"
-
-    if os.path.exists(archive_file):
-        os.remove(archive_file)
-        print("🗑️ All archived weeks cleared")
+    if archived_weeks_store.exists():
+        await archived_weeks_store.aclear()
+        logger.info("🗑️ All archived weeks cleared")
     else:
-        print("ℹ️ No archived weeks file found to clear")
+        logger.info("ℹ️ No archived weeks file found to clear")
 
 
 # Archive weeks management endpoints - REMOVED (no frontend mapping)
@@ -2294,7 +2503,7 @@ async def refresh_token(refresh_token: str = Form(...)):
     except HTTPException as e:
         raise e
     except Exception as e:
-        print(f" Token refresh error: {e}")
+        logger.error("Token refresh error: %s", e)
         raise HTTPException(status_code=500, detail=f"Token refresh failed: {str(e)}")
 
 
@@ -2309,7 +2518,7 @@ async def logout_user():
     except HTTPException as e:
         raise e
     except Exception as e:
-        print(f" Logout error: {e}")
+        logger.error("Logout error: %s", e)
         raise HTTPException(status_code=500, detail=f"Logout failed: {str(e)}")
 
 
@@ -2360,7 +2569,7 @@ async def create_user(
     except HTTPException as e:
         raise e
     except Exception as e:
-        print(f" Create user error: {e}")
+        logger.error("Create user error: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to create user: {str(e)}")
 
 
@@ -2392,7 +2601,7 @@ async def get_users(current_user: dict = Depends(require_admin())):
         return {"status": "success", "users": safe_users}
 
     except Exception as e:
-        print(f" Get users error: {e}")
+        logger.error("Get users error: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get users: {str(e)}")
 
 
@@ -2420,7 +2629,7 @@ async def get_user_profile(current_user: dict = Depends(get_current_active_user)
         }
 
     except Exception as e:
-        print(f" Get user profile error: {e}")
+        logger.error("Get user profile error: %s", e)
         raise HTTPException(
             status_code=500, detail=f"Failed to get user profile: {str(e)}"
         )
@@ -2462,7 +2671,7 @@ async def get_user_by_id(
     except HTTPException as e:
         raise e
     except Exception as e:
-        print(f" Get user by ID error: {e}")
+        logger.error("Get user by ID error: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get user: {str(e)}")
 
 
@@ -2520,7 +2729,7 @@ async def update_user(
     except HTTPException as e:
         raise e
     except Exception as e:
-        print(f" Update user error: {e}")
+        logger.error("Update user error: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to update user: {str(e)}")
 
 
@@ -2548,7 +2757,7 @@ async def delete_user(
     except HTTPException as e:
         raise e
     except Exception as e:
-        print(f" Delete user error: {e}")
+        logger.error("Delete user error: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to delete user: {str(e)}")
 
 
@@ -2592,7 +2801,7 @@ async def create_user_admin(
     except HTTPException as e:
         raise e
     except Exception as e:
-        print(f" Create user error: {e}")
+        logger.error("Create user error: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to create user: {str(e)}")
 
 
@@ -2632,7 +2841,7 @@ async def add_existing_user_to_db(
     except HTTPException as e:
         raise e
     except Exception as e:
-        print(f" Add existing user error: {e}")
+        logger.error("Add existing user error: %s", e)
         raise HTTPException(
             status_code=500, detail=f"Failed to add existing user: {str(e)}"
         )
@@ -2657,7 +2866,7 @@ async def make_user_admin(user_id: str, current_user: dict = Depends(require_adm
             raise HTTPException(status_code=500, detail="Failed to promote user")
 
     except Exception as e:
-        print(f" Make admin error: {e}")
+        logger.error("Make admin error: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to promote user: {str(e)}")
 
 
@@ -2686,7 +2895,7 @@ async def revoke_user_admin(
             )
 
     except Exception as e:
-        print(f" Revoke admin error: {e}")
+        logger.error("Revoke admin error: %s", e)
         raise HTTPException(
             status_code=500, detail=f"Failed to revoke admin privileges: {str(e)}"
         )
@@ -2736,7 +2945,7 @@ async def get_project_management_weeks():
         }
 
     except Exception as e:
-        print(f" Get project management weeks error: {e}")
+        logger.error("Get project management weeks error: %s", e)
         raise HTTPException(
             status_code=500, detail=f"Failed to get project management weeks: {str(e)}"
         )
@@ -2781,7 +2990,7 @@ async def create_project_management_week(week_data: dict):
         }
 
     except Exception as e:
-        print(f" Create project management week error: {e}")
+        logger.error("Create project management week error: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to create week: {str(e)}")
 
 
@@ -2789,14 +2998,14 @@ async def create_project_management_week(week_data: dict):
 async def update_project_management_week(week_id: str, week_data: dict):
     """Project management haftasını güncelle"""
     try:
-        print(f" UPDATE ENDPOINT: week_id={week_id}")
-        print(f" UPDATE ENDPOINT: week_data={week_data}")
+        logger.debug("UPDATE ENDPOINT: week_id=%s", week_id)
+        logger.debug("UPDATE ENDPOINT: week_data=%s", week_data)
 
         from repositories import project_management_repo
 
         # Sadece sections'ları güncelle
         sections = week_data.get("sections", {})
-        print(f" UPDATE ENDPOINT: sections={sections}")
+        logger.debug("UPDATE ENDPOINT: sections=%s", sections)
 
         update_data = {
             "sections": {
@@ -2807,11 +3016,11 @@ async def update_project_management_week(week_id: str, week_data: dict):
             }
         }
 
-        print(f" UPDATE ENDPOINT: update_data={update_data}")
+        logger.debug("UPDATE ENDPOINT: update_data=%s", update_data)
 
         success = project_management_repo.update_week(week_id, update_data)
 
-        print(f" UPDATE ENDPOINT: success={success}")
+        logger.debug("UPDATE ENDPOINT: success=%s", success)
 
         if success:
             return {"status": "success", "message": "Week updated successfully"}
@@ -2821,7 +3030,7 @@ async def update_project_management_week(week_id: str, week_data: dict):
     except HTTPException as e:
         raise e
     except Exception as e:
-        print(f" Update project management week error: {e}")
+        logger.error("Update project management week error: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to update week: {str(e)}")
 
 
@@ -2841,7 +3050,7 @@ async def delete_project_management_week(week_id: str):
     except HTTPException as e:
         raise e
     except Exception as e:
-        print(f" Delete project management week error: {e}")
+        logger.error("Delete project management week error: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to delete week: {str(e)}")
 
 
@@ -0,0 +1,291 @@
+"""
+Metrics
+Prometheus metin formatında dışa aktarılan hafif uygulama metrikleri
+
+- Counter / Gauge / Histogram, sabit bucket'lı ve etiket (label) destekli
+- Güncellemeler kilitsiz: asyncio handler'ları tek thread'de çalışır; thread
+  havuzundaki nadir yarışlarda tek bir artış kaybolabilir, metrik için kabul
+  edilebilir. Gözlem maliyeti bir bisect + birkaç toplama işlemidir
+- Tüm metrikler REGISTRY'ye kaydolur ve /api/metrics ile sunulur
+"""
+
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Varsayılan gecikme bucket'ları (saniye)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LLM_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+# Starlette text/* yanıtlarına charset=utf-8 ekler
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Registry:
+    """Metrik kaydı ve Prometheus metin çıktısı"""
+
+    def __init__(self):
+        self._metrics: Dict[str, "_Metric"] = {}
+
+    def register(self, metric: "_Metric"):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> Optional["_Metric"]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Tüm metrikleri exposition formatında döndür"""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional[Registry] = REGISTRY,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if registry is not None:
+            registry.register(self)
+
+    def _key(self, labels: Sequence) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return tuple(str(label) for label in labels)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Yalnızca artan sayaç"""
+
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        key = self._key(labels)
+        self._children[key] = self._children.get(key, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._children.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in list(self._children.items())
+        ]
+
+
+class Gauge(Counter):
+    """Artıp azalabilen anlık değer"""
+
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels):
+        self._children[self._key(labels)] = value
+
+    def samples(self) -> List[str]:
+        if not self._children and not self.labelnames:
+            return [f"{self.name} 0"]
+        return super().samples()
+
+
+class _HistogramChild:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(_Metric):
+    """Sabit bucket'lı dağılım (bucket sayıları, toplam ve adet)"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: Optional[Registry] = REGISTRY,
+    ):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(sorted(buckets))
+
+    def _child(self, labels: Sequence) -> _HistogramChild:
+        key = self._key(labels)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children.setdefault(
+                key, _HistogramChild(len(self.buckets) + 1)
+            )
+        return child
+
+    def observe(self, value: float, *labels):
+        child = self._child(labels)
+        child.counts[bisect_left(self.buckets, value)] += 1
+        child.sum += value
+        child.count += 1
+
+    @contextmanager
+    def time(self, *labels):
+        """Blok süresini gözlemle"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def snapshot(self, *labels) -> Dict:
+        """Etiket kümesi için kümülatif bucket'lar, toplam ve adet"""
+        child = self._children.get(self._key(labels))
+        if child is None:
+            return {"buckets": {}, "sum": 0.0, "count": 0}
+        cumulative, buckets = 0, {}
+        for bound, count in zip(self.buckets + (math.inf,), child.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {"buckets": buckets, "sum": child.sum, "count": child.count}
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key in list(self._children):
+            snapshot = self.snapshot(*key)
+            for bound, count in snapshot["buckets"].items():
+                le = f'le="{_format_value(bound)}"'
+                labels = _format_labels(self.labelnames, key, le)
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(snapshot['sum'])}")
+            lines.append(f"{self.name}_count{labels} {snapshot['count']}")
+        return lines
+
+
+# HTTP istekleri (route şablonu ile, ör. /api/tenders/{tender_id})
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route and status",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route")
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served"
+)
+
+# Supabase / PostgREST sorguları
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds", "Supabase query latency", ("table", "operation")
+)
+DB_QUERY_ERRORS = Counter(
+    "db_query_errors_total", "Failed Supabase queries", ("table", "operation")
+)
+
+# LLM çağrıları
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_duration_seconds", "LLM API latency", ("model",), buckets=LLM_BUCKETS
+)
+LLM_REQUESTS = Counter(
+    "llm_requests_total", "LLM API calls by outcome", ("model", "outcome")
+)
+LLM_STRATEGY_SECONDS = Histogram(
+    "llm_strategy_duration_seconds",
+    "Multi-LLM chat latency by strategy",
+    ("strategy",),
+    buckets=LLM_BUCKETS,
+)
+LLM_HEDGES = Counter(
+    "llm_hedged_requests_total",
+    "Backup model calls started by the hedged strategy",
+    ("model", "reason"),
+)
+LLM_TIME_TO_FIRST_TOKEN = Histogram(
+    "llm_time_to_first_token_seconds",
+    "Time until the first streamed LLM token",
+    ("model",),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0),
+)
+LLM_CIRCUIT_STATE = Gauge(
+    "llm_circuit_state",
+    "LLM provider circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ("service",),
+)
+
+# Arka plan chat işleri
+CHAT_JOB_QUEUE_DEPTH = Gauge("chat_job_queue_depth", "Chat jobs waiting for a worker")
+CHAT_JOB_WAIT_SECONDS = Histogram(
+    "chat_job_wait_seconds",
+    "Time chat jobs spend queued before a worker picks them up",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+CHAT_JOB_RUN_SECONDS = Histogram(
+    "chat_job_run_seconds",
+    "Chat job run time by final status",
+    ("status",),
+    buckets=LLM_BUCKETS,
+)
+CHAT_JOBS = Counter("chat_jobs_total", "Chat jobs by outcome", ("outcome",))
+
+
+@contextmanager
+def track_db_query(table_name: str, operation: str):
+    """Sorgu süresini ve hatalarını tablo/işlem bazında kaydet"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        DB_QUERY_ERRORS.inc(table_name, operation)
+        raise
+    finally:
+        DB_QUERY_SECONDS.observe(time.perf_counter() - started, table_name, operation)
+
+
+def record_llm_call(model: str, started: float, outcome: str):
+    """LLM çağrısının süresini ve sonucunu kaydet"""
+    LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, model)
+    LLM_REQUESTS.inc(model, outcome)
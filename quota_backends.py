@@ -0,0 +1,299 @@
+"""
+Quota Backends
+LLM servis kotalarının worker'lar / instance'lar arasında paylaşılması
+
+- memory:   process içi sayaç (tek worker; restart'ta sıfırlanır)
+- sqlite:   tek host üzerindeki tüm worker'lar için dosya tabanlı, atomik
+            artışlı sayaç (LLM_QUOTA_SQLITE_PATH)
+- supabase: tüm instance'lar için `llm_quota_usage` tablosu ve
+            `llm_quota_sync` fonksiyonu (supabase/migrations); fonksiyon
+            yalnızca service role ile çağrılabilir
+            (SUPABASE_SERVICE_ROLE_KEY gerekli)
+
+Paylaşılan backend'lerde artışlar yerelde biriktirilir ve her
+LLM_QUOTA_SYNC_INTERVAL saniyede tek bir çağrıyla gönderilir; aynı çağrı
+güncel toplamları döndürür. Chat başına ek round trip yoktur; karşılığında
+senkronlar arasında her instance kotayı en fazla bir aralık kadar aşabilir.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, Optional
+
+from rate_limiter import SlidingWindowCounter
+
+logger = logging.getLogger(__name__)
+
+LLM_QUOTA_BACKEND = os.getenv("LLM_QUOTA_BACKEND", "memory").lower()
+LLM_QUOTA_SQLITE_PATH = os.getenv("LLM_QUOTA_SQLITE_PATH", "llm_quota.sqlite3")
+LLM_QUOTA_SYNC_INTERVAL = float(os.getenv("LLM_QUOTA_SYNC_INTERVAL", "5"))
+
+QUOTA_WINDOW_SECONDS = 86400
+QUOTA_BUCKET_SECONDS = 60
+
+
+class QuotaBackend(ABC):
+    """Paylaşılan kota deposu arayüzü"""
+
+    name = "base"
+    # True: sayaçlar process içinde, senkron okunup yazılabilir
+    local = False
+
+    def add_local(self, service: str, amount: int = 1):
+        """Yerel backend'de artışı hemen uygula (yalnızca local=True)"""
+        raise RuntimeError(f"{self.name} quota backend is not local")
+
+    def total_local(self, service: str) -> int:
+        """Yerel backend'de güncel toplamı döndür (yalnızca local=True)"""
+        raise RuntimeError(f"{self.name} quota backend is not local")
+
+    @abstractmethod
+    async def sync(self, deltas: Dict[str, int]) -> Dict[str, int]:
+        """Artışları uygula, servislerin pencere içindeki toplamlarını döndür"""
+
+    async def aclose(self):
+        """Backend'in açık bağlantılarını kapat"""
+
+
+class MemoryQuotaBackend(QuotaBackend):
+    """Process içi kayan pencere sayaçları"""
+
+    name = "memory"
+    local = True
+
+    def __init__(
+        self,
+        window: float = QUOTA_WINDOW_SECONDS,
+        bucket_seconds: float = QUOTA_BUCKET_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.window = window
+        self.bucket_seconds = bucket_seconds
+        self._clock = clock
+        self._counters: Dict[str, SlidingWindowCounter] = {}
+
+    def _counter(self, service: str) -> SlidingWindowCounter:
+        counter = self._counters.get(service)
+        if counter is None:
+            counter = self._counters[service] = SlidingWindowCounter(
+                self.window, self.bucket_seconds, self._clock
+            )
+        return counter
+
+    def add_local(self, service: str, amount: int = 1):
+        self._counter(service).add(amount)
+
+    def total_local(self, service: str) -> int:
+        counter = self._counters.get(service)
+        return counter.count() if counter is not None else 0
+
+    async def sync(self, deltas: Dict[str, int]) -> Dict[str, int]:
+        for service, amount in deltas.items():
+            if amount:
+                self.add_local(service, amount)
+        return {service: self.total_local(service) for service in deltas}
+
+
+class SQLiteQuotaBackend(QuotaBackend):
+    """Tek host için SQLite dosyasında dakikalık bucket'lar
+
+    Her senkron tek bir IMMEDIATE transaction'dır; aynı dosyayı kullanan
+    worker'lar birbirinin artışını kaybetmez.
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: str = LLM_QUOTA_SQLITE_PATH,
+        window: float = QUOTA_WINDOW_SECONDS,
+        bucket_seconds: float = QUOTA_BUCKET_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.window = window
+        self.bucket_seconds = bucket_seconds
+        self._clock = clock
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_quota_usage ("
+                " service TEXT NOT NULL,"
+                " bucket INTEGER NOT NULL,"
+                " count INTEGER NOT NULL DEFAULT 0,"
+                " PRIMARY KEY (service, bucket))"
+            )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10, isolation_level=None)
+
+    def _sync_blocking(self, deltas: Dict[str, int]) -> Dict[str, int]:
+        bucket = int(self._clock() // self.bucket_seconds)
+        window_buckets = int(self.window // self.bucket_seconds)
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO llm_quota_usage (service, bucket, count) VALUES (?, ?, ?)"
+                " ON CONFLICT (service, bucket) DO UPDATE SET count = count + excluded.count",
+                [
+                    (service, bucket, amount)
+                    for service, amount in deltas.items()
+                    if amount
+                ],
+            )
+            conn.execute(
+                "DELETE FROM llm_quota_usage WHERE bucket <= ?",
+                (bucket - window_buckets,),
+            )
+            totals = {
+                service: conn.execute(
+                    "SELECT COALESCE(SUM(count), 0) FROM llm_quota_usage"
+                    " WHERE service = ? AND bucket > ?",
+                    (service, bucket - window_buckets),
+                ).fetchone()[0]
+                for service in deltas
+            }
+            conn.execute("COMMIT")
+            return totals
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    async def sync(self, deltas: Dict[str, int]) -> Dict[str, int]:
+        return await asyncio.to_thread(self._sync_blocking, deltas)
+
+
+class SupabaseQuotaBackend(QuotaBackend):
+    """Tüm instance'lar için Supabase `llm_quota_sync` fonksiyonu
+
+    Bucket'lar veritabanı saatiyle, 24 saatlik pencere fonksiyonun içinde
+    hesaplanır (instance saatleri farklı olsa da pencere tutarlıdır).
+    Fonksiyon anon rolüne açık değildir; db verilmezse service role
+    anahtarıyla ayrı bir client açılır.
+    """
+
+    name = "supabase"
+
+    def __init__(self, db=None):
+        self._owns_db = db is None
+        if db is None:
+            from supabase_database import AsyncSupabaseDatabaseManager
+
+            service_role_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+            if not service_role_key:
+                raise ValueError(
+                    "SUPABASE_SERVICE_ROLE_KEY is required for supabase quotas"
+                )
+            db = AsyncSupabaseDatabaseManager(api_key=service_role_key)
+        self.db = db
+
+    async def sync(self, deltas: Dict[str, int]) -> Dict[str, int]:
+        rows = await self.db.rpc("llm_quota_sync", {"p_deltas": deltas})
+        totals = {service: 0 for service in deltas}
+        for row in rows or []:
+            totals[row["quota_service"]] = int(row["used"])
+        return totals
+
+    async def aclose(self):
+        if self._owns_db:
+            await self.db.aclose()
+
+
+def create_quota_backend(kind: str = LLM_QUOTA_BACKEND) -> QuotaBackend:
+    """LLM_QUOTA_BACKEND değerine göre backend oluştur"""
+    if kind == "sqlite":
+        return SQLiteQuotaBackend()
+    if kind == "supabase":
+        try:
+            return SupabaseQuotaBackend()
+        except ValueError as e:
+            logger.error("❌ Supabase quota backend unavailable (%s), using memory", e)
+            return MemoryQuotaBackend()
+    if kind != "memory":
+        logger.warning("⚠️ Unknown LLM_QUOTA_BACKEND %s, using memory", kind)
+    return MemoryQuotaBackend()
+
+
+class SharedQuota:
+    """Servis kotalarının yerel görünümü
+
+    Yerel backend'de sayaçlar doğrudan kullanılır. Paylaşılan backend'lerde
+    kullanım = son senkrondaki toplam + henüz gönderilmemiş yerel artışlar.
+    """
+
+    def __init__(
+        self,
+        backend: QuotaBackend,
+        services: Iterable[str],
+        sync_interval: float = LLM_QUOTA_SYNC_INTERVAL,
+    ):
+        self.backend = backend
+        self.services = tuple(services)
+        self.sync_interval = sync_interval
+        self._shared: Dict[str, int] = {service: 0 for service in self.services}
+        self._pending: Dict[str, int] = {service: 0 for service in self.services}
+        self.last_sync: Optional[float] = None
+        self.sync_errors = 0
+
+    def count(self, service: str) -> int:
+        """Servisin pencere içindeki kullanımı"""
+        if self.backend.local:
+            return self.backend.total_local(service)
+        return self._shared.get(service, 0) + self._pending.get(service, 0)
+
+    def add(self, service: str, amount: int = 1):
+        """Kullanımı artır (paylaşılan backend'de bir sonraki senkronda gönderilir)"""
+        if self.backend.local:
+            self.backend.add_local(service, amount)
+        else:
+            self._pending[service] = self._pending.get(service, 0) + amount
+
+    async def sync(self) -> bool:
+        """Biriken artışları gönder ve toplamları tazele"""
+        if self.backend.local:
+            return True
+        deltas = {service: self._pending.get(service, 0) for service in self.services}
+        for service in deltas:
+            self._pending[service] -= deltas[service]
+        try:
+            totals = await self.backend.sync(deltas)
+        except BaseException as e:
+            # Gönderilemeyen artışlar bir sonraki senkrona kalır (iptalde de;
+            # yazılmış olabilecek artışı tekrar saymak kotayı aşmaktan iyidir)
+            for service, amount in deltas.items():
+                self._pending[service] += amount
+            if not isinstance(e, Exception):
+                raise
+            self.sync_errors += 1
+            logger.warning("⚠️ Quota sync failed (%s): %s", self.backend.name, e)
+            return False
+        self._shared.update(totals)
+        self.last_sync = time.time()
+        return True
+
+    async def run(self):
+        """Periyodik senkron döngüsü (startup'ta arka plan task'ı olarak çalışır)"""
+        while True:
+            await self.sync()
+            await asyncio.sleep(self.sync_interval)
+
+    def stats(self) -> Dict:
+        """Backend ve senkron durumunu döndür"""
+        return {
+            "backend": self.backend.name,
+            "sync_interval_seconds": None if self.backend.local else self.sync_interval,
+            "pending": dict(self._pending) if not self.backend.local else {},
+            "last_sync": self.last_sync,
+            "sync_errors": self.sync_errors,
+        }
@@ -0,0 +1,173 @@
+"""
+Rate Limiter
+Dakikalık bucket'lı ring buffer ile kayan pencere (sliding window) sayacı
+
+- SlidingWindowCounter: pencere (ör. 24 saat) bucket_seconds'lık dilimlere
+  bölünür; her dilimin sayısı ring buffer'da, toplam ayrıca tutulur.
+  Kontrol ve artırma O(1)'dir (yalnızca aradan geçen dilimler sıfırlanır)
+- Pencere bucket sınırına yuvarlanır: sayım son `window` saniyeyi en fazla
+  bir bucket kadar eksik kapsar
+- RateLimiter: anahtar (servis, kullanıcı, IP) başına limitli sayaçlar
+
+Not: Sayaçlar process başınadır ve kilitsizdir (asyncio tek thread'de
+çalışır).
+"""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+
+class SlidingWindowCounter:
+    """Ring buffer üzerinde bucket'lı kayan pencere sayacı"""
+
+    __slots__ = (
+        "window",
+        "bucket_seconds",
+        "size",
+        "_counts",
+        "_total",
+        "_head",
+        "_clock",
+    )
+
+    def __init__(
+        self,
+        window: float = 86400,
+        bucket_seconds: float = 60,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.window = window
+        self.bucket_seconds = bucket_seconds
+        self.size = max(1, int(math.ceil(window / bucket_seconds)))
+        self._counts: List[int] = [0] * self.size
+        self._total = 0
+        self._head: Optional[int] = None  # en son bucket'ın mutlak index'i
+        self._clock = clock
+
+    def _advance(self) -> int:
+        """Pencereden çıkan bucket'ları sıfırla, güncel bucket'ın slot'unu döndür"""
+        index = int(self._clock() // self.bucket_seconds)
+        head = self._head
+        if head is None or index - head >= self.size:
+            if self._total:
+                self._counts = [0] * self.size
+                self._total = 0
+            self._head = index
+        elif index > head:
+            counts, size = self._counts, self.size
+            for absolute in range(head + 1, index + 1):
+                slot = absolute % size
+                self._total -= counts[slot]
+                counts[slot] = 0
+            self._head = index
+        # Saat geri giderse güncel bucket kullanılmaya devam edilir
+        return self._head % self.size
+
+    def add(self, amount: int = 1):
+        """Güncel bucket'a ekle"""
+        slot = self._advance()
+        self._counts[slot] += amount
+        self._total += amount
+
+    def count(self) -> int:
+        """Penceredeki toplam sayı"""
+        self._advance()
+        return self._total
+
+
+class RateLimiter:
+    """Anahtar başına kayan pencere limiti (limit <= 0: sınırsız)
+
+    Anahtar sayısı max_keys'e ulaştığında önce boşalan sayaçlar, sonra en
+    uzun süredir kullanılmayan (LRU) ve limitin altındaki anahtarlar silinir.
+    Limiti dolmuş anahtarlar silinmez: anahtar değiştirerek tabloyu
+    dolduran biri, kısıtlanmış bir istemcinin penceresini sıfırlayamaz
+    (bu durumda tablo, o anahtarların pencereleri boşalana kadar
+    max_keys'i aşabilir).
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        window: float = 86400,
+        bucket_seconds: float = 60,
+        max_keys: int = 10000,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.limit = limit
+        self.window = window
+        self.bucket_seconds = bucket_seconds
+        self.max_keys = max_keys
+        self._clock = clock
+        # Erişim sırasına göre (en eski başta)
+        self._counters: "OrderedDict[str, SlidingWindowCounter]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.limit > 0
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def _counter(self, key: str) -> SlidingWindowCounter:
+        counter = self._counters.get(key)
+        if counter is None:
+            if len(self._counters) >= self.max_keys:
+                self._prune()
+            counter = self._counters[key] = SlidingWindowCounter(
+                self.window, self.bucket_seconds, self._clock
+            )
+        else:
+            self._counters.move_to_end(key)
+        return counter
+
+    def _prune(self):
+        """Boş sayaçları, yetmezse limitin altındaki en eski anahtarları sil"""
+        for key in [k for k, c in self._counters.items() if c.count() == 0]:
+            del self._counters[key]
+        excess = len(self._counters) - self.max_keys + 1
+        if excess <= 0:
+            return
+        evict = []
+        for key, counter in self._counters.items():
+            if counter.count() < self.limit or not self.enabled:
+                evict.append(key)
+                if len(evict) == excess:
+                    break
+        for key in evict:
+            del self._counters[key]
+
+    def allow(self, key: str) -> bool:
+        """Anahtar limitin altında mı (sayacı artırmaz)"""
+        if not self.enabled:
+            return True
+        counter = self._counters.get(key)
+        if counter is None:
+            return True
+        self._counters.move_to_end(key)
+        return counter.count() < self.limit
+
+    def hit(self, key: str, amount: int = 1):
+        """Anahtarın sayacını artır"""
+        self._counter(key).add(amount)
+
+    def try_acquire(self, key: str) -> bool:
+        """Limit izin veriyorsa sayacı artır ve True döndür"""
+        if not self.enabled:
+            return True
+        if not self.allow(key):
+            return False
+        self.hit(key)
+        return True
+
+    def usage(self, key: str) -> Dict:
+        """Anahtarın kullanım durumunu döndür"""
+        counter = self._counters.get(key)
+        used = counter.count() if counter is not None else 0
+        return {
+            "used": used,
+            "limit": self.limit,
+            "remaining": max(0, self.limit - used) if self.enabled else None,
+        }
@@ -4,17 +4,83 @@ Gerçek veri toplama servisi - Mockup veri kullanmaz
 """
 
 import asyncio
+import contextlib
+import importlib.util
 import json
+import logging
 import os
 import time
+from collections import defaultdict, deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import httpx
 import re
 
+from circuit_breaker import AdaptiveTimeout, CircuitBreaker, CircuitOpenError
+from llm_cache import LLMResponseCache, SingleFlight
+from metrics import (
+    LLM_HEDGES,
+    LLM_REQUESTS,
+    LLM_STRATEGY_SECONDS,
+    LLM_TIME_TO_FIRST_TOKEN,
+    record_llm_call,
+)
+from quota_backends import QUOTA_WINDOW_SECONDS, SharedQuota, create_quota_backend
+from rate_limiter import RateLimiter
 from real_data_config import DATA_QUALITY_STANDARDS, REAL_DATA_SOURCES
 
+logger = logging.getLogger(__name__)
+
+# LLM HTTP connection pool ayarları
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "20"))
+LLM_HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "10"))
+LLM_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "60"))
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "false").lower() == "true"
+
+# Multi-LLM stratejileri (REAL_DATA_SOURCES["llm_models"]["fallback_strategy"])
+LLM_STRATEGIES = ("parallel", "first_success", "hedged")
+# Hedged: yedek model, birincil modelin son LLM_HEDGE_WINDOW çağrısının p95'i
+# kadar beklendikten sonra başlar; yeterli örnek yoksa varsayılan gecikme
+LLM_HEDGE_DEFAULT_DELAY = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "3.0"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+LLM_HEDGE_WINDOW = int(os.getenv("LLM_HEDGE_WINDOW", "200"))
+
+# Kullanıcı başına günlük chat limiti (0: kapalı)
+LLM_USER_DAILY_LIMIT = int(os.getenv("LLM_USER_DAILY_LIMIT", "0"))
+
+
+async def iter_sse_data(response: httpx.Response) -> AsyncIterator[str]:
+    """Server-Sent Events yanıtındaki her olayın `data` alanını döndür"""
+    lines: List[str] = []
+    async for line in response.aiter_lines():
+        if not line:
+            if lines:
+                yield "\n".join(lines)
+                lines = []
+        elif line.startswith("data:"):
+            lines.append(line[5:].lstrip())
+    if lines:
+        yield "\n".join(lines)
+
+
+def _is_success(result) -> bool:
+    return bool(result) and result[0].get("status") == "success"
+
+
+def _openrouter_delta(chunk: Dict) -> Optional[str]:
+    try:
+        return chunk["choices"][0]["delta"].get("content")
+    except (KeyError, IndexError, TypeError, AttributeError):
+        return None
+
+
+def _gemini_delta(chunk: Dict) -> Optional[str]:
+    try:
+        return chunk["candidates"][0]["content"]["parts"][0].get("text")
+    except (KeyError, IndexError, TypeError, AttributeError):
+        return None
+
 
 class RealDataCollector:
     """Gerçek veri toplama servisi"""
@@ -23,11 +89,17 @@ class RealDataCollector:
         self.google_api_key = os.getenv("GOOGLE_API_KEY")
         self.openrouter_api_key = os.getenv("OPENROUTER_API_KEY")
 
-        # Rate limiting - tüm servisler için list format
-        self.request_counts = {
-            "openrouter": [],  # Timestamp listesi
-            "google": [],  # Google Gemini için
-        }
+        # LLM API endpoint'leri
+        self.openrouter_url = os.getenv(
+            "OPENROUTER_API_URL", "https://openrouter.ai/api/v1/chat/completions"
+        )
+        self.gemini_base_url = os.getenv(
+            "GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta"
+        )
+
+        # Paylaşılan HTTP client (startup'ta açılır, shutdown'da kapanır)
+        self.http_verify = True
+        self._http_client: Optional[httpx.AsyncClient] = None
 
         # Daily quotas
         self.daily_quotas = {
@@ -35,6 +107,148 @@ class RealDataCollector:
             "google": 1000,  # Google Gemini free tier
         }
 
+        # Rate limiting - servis başına 24 saatlik kayan pencere; worker'lar
+        # arasında paylaşım LLM_QUOTA_BACKEND ile (bkz. quota_backends)
+        self.quota = SharedQuota(create_quota_backend(), self.daily_quotas)
+        self._quota_sync_task: Optional[asyncio.Task] = None
+
+        # Kullanıcı (ya da IP) başına chat limiti; ortak kotayı tek kullanıcı tüketmesin
+        self.user_limiter = RateLimiter(LLM_USER_DAILY_LIMIT, QUOTA_WINDOW_SECONDS)
+
+        # Tekrarlanan sorular için yanıt cache'i (kota harcamaz)
+        self.response_cache = LLMResponseCache()
+        # Aynı anda gelen aynı sorular tek upstream çağrısını paylaşır
+        self.in_flight = SingleFlight()
+
+        # Multi-LLM stratejisi ve hedge için model başına son gecikmeler
+        self.strategy = REAL_DATA_SOURCES["llm_models"]["fallback_strategy"]
+        self._latencies: Dict[str, deque] = defaultdict(
+            lambda: deque(maxlen=LLM_HEDGE_WINDOW)
+        )
+
+        # Sağlayıcı başına devre kesici ve gözlenen gecikmeye göre timeout;
+        # bozulan sağlayıcı worker'ı 30 sn bekletmeden hemen atlanır
+        self.breakers = {service: CircuitBreaker(service) for service in self.daily_quotas}
+        self.timeouts = {service: AdaptiveTimeout() for service in self.daily_quotas}
+
+    def _create_http_client(self) -> httpx.AsyncClient:
+        """Keep-alive bağlantı havuzlu HTTP client oluştur"""
+        # HTTP/2 opsiyonel - h2 paketi kurulu değilse HTTP/1.1 kullan
+        http2 = LLM_HTTP2 and importlib.util.find_spec("h2") is not None
+        limits = httpx.Limits(
+            max_connections=LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY,
+        )
+        return httpx.AsyncClient(
+            limits=limits,
+            http2=http2,
+            timeout=httpx.Timeout(30.0),
+            verify=self.http_verify,
+        )
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Paylaşılan HTTP client'ı döndür (startup çağrılmadıysa oluştur)"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = self._create_http_client()
+        return self._http_client
+
+    async def startup(self):
+        """Uygulama başlangıcında LLM bağlantı havuzunu aç"""
+        self._get_http_client()
+        logger.info(
+            "🔌 LLM HTTP pool ready (max_connections=%s, keepalive=%s)",
+            LLM_HTTP_MAX_CONNECTIONS,
+            LLM_HTTP_MAX_KEEPALIVE,
+        )
+        if self.response_cache.disk_dir:
+            removed = await asyncio.to_thread(self.response_cache.prune_disk)
+            logger.info("🧹 LLM cache: %s expired disk entries removed", removed)
+        if not self.quota.backend.local and self._quota_sync_task is None:
+            self._quota_sync_task = asyncio.ensure_future(self.quota.run())
+            logger.info(
+                "🔄 LLM quota sync started (%s, every %ss)",
+                self.quota.backend.name,
+                self.quota.sync_interval,
+            )
+
+    async def _get_cached_response(
+        self, model: str, filters: Dict, user_message: str
+    ) -> Tuple[str, Optional[List[Dict]]]:
+        """Model için cache anahtarını ve varsa cache'lenmiş yanıtı döndür"""
+        cache_key = self.response_cache.key(model, user_message, filters)
+        cached = await self.response_cache.aget(cache_key)
+        if cached is not None:
+            logger.info("⚡ %s cache hit", model)
+            LLM_REQUESTS.inc(model, "cache_hit")
+        return cache_key, cached
+
+    async def _coalesce(
+        self, model: str, cache_key: str, call: Callable[[], Awaitable[List[Dict]]]
+    ) -> List[Dict]:
+        """Aynı anahtar için uçuştaki çağrıya katıl ya da yenisini başlat"""
+        if self.in_flight.in_flight(cache_key):
+            logger.info("🔗 %s joined in-flight request", model)
+            LLM_REQUESTS.inc(model, "coalesced")
+        return await self.in_flight.run(cache_key, call)
+
+    async def _guarded_request(
+        self, service: str, request: Callable[[float], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """Upstream isteğini devre kesici ve uyarlanan toplam timeout ile yap
+
+        Devre açıksa CircuitOpenError, süre aşılırsa asyncio.TimeoutError fırlatır.
+        """
+        self.breakers[service].check()
+        timeout = self.timeouts[service].timeout()
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(request(timeout), timeout)
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            self.timeouts[service].observe(timeout)
+            self.breakers[service].record_failure()
+            raise asyncio.TimeoutError(f"{service} timed out after {timeout:.1f}s") from None
+        except Exception:
+            self.breakers[service].record_failure()
+            raise
+        except BaseException:
+            self.breakers[service].release()
+            raise
+        self._record_upstream(service, response.status_code, time.perf_counter() - started)
+        return response
+
+    def _record_upstream(self, service: str, status_code: int, duration: float):
+        """HTTP sonucunu devre kesiciye bildir (429 ve 5xx hata sayılır)"""
+        if status_code == 429 or status_code >= 500:
+            self.breakers[service].record_failure()
+        else:
+            self.timeouts[service].observe(duration)
+            self.breakers[service].record_success(duration)
+
+    @staticmethod
+    def _record_error(model: str, started: float, error: Exception):
+        """Başarısız LLM çağrısının sonucunu kaydet"""
+        if isinstance(error, CircuitOpenError):
+            # Upstream'e gidilmedi; gecikme histogramına yazılmaz
+            LLM_REQUESTS.inc(model, "circuit_open")
+        elif isinstance(error, (asyncio.TimeoutError, httpx.TimeoutException)):
+            record_llm_call(model, started, "timeout")
+        else:
+            record_llm_call(model, started, "exception")
+
+    async def aclose(self):
+        """Uygulama kapanışında LLM bağlantı havuzunu kapat, kota artışlarını gönder"""
+        if self._quota_sync_task is not None:
+            # Sürmekte olan periyodik senkron bitmeden son senkron başlamasın
+            task, self._quota_sync_task = self._quota_sync_task, None
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            await self.quota.sync()
+        await self.quota.backend.aclose()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
 
     def _clean_gpt_response(self, content: str) -> str:
         """
@@ -51,8 +265,18 @@ class RealDataCollector:
                 cleaned_content = re.sub(r'^analysis.*?(?=s*[A-ZÇĞİÖŞÜ])', '', cleaned_content, flags=re.IGNORECASE | re.DOTALL).strip()
             return cleaned_content
         return content.strip()  # Eğer pattern bulunamazsa, sadece boşlukları temizle
-    async def collect_startup_data(self, filters: Dict, user_message: str = "") -> Dict:
-        """Gerçek veri kaynaklarından startup verisi topla"""
+    async def collect_startup_data(
+        self,
+        filters: Dict,
+        user_message: str = "",
+        strategy: Optional[str] = None,
+        on_result: Optional[Callable[[str, List[Dict]], None]] = None,
+    ) -> Dict:
+        """Gerçek veri kaynaklarından startup verisi topla
+
+        on_result verilirse her model yanıtı geldiği anda (model, yanıtlar)
+        ile çağrılır; arka plan işlerinin kısmi sonuçları için.
+        """
 
         results = {
             "status": "processing",
@@ -64,8 +288,10 @@ class RealDataCollector:
 
         try:
             # 1. LLM Analysis - Geçici olarak API key kontrolünü devre dışı bırak
-            print("🔍 LLM Analysis başlatılıyor (API key kontrolü devre dışı)...")
-            llm_results = await self._analyze_with_llm(filters, [], user_message)
+            logger.info("🔍 LLM Analysis başlatılıyor (API key kontrolü devre dışı)...")
+            llm_results = await self._analyze_with_llm(
+                filters, [], user_message, strategy, on_result
+            )
             results["llm_analysis"] = llm_results
             results["data_sources"].append("Multi-LLM Models")
             results["total_companies"] += len(
@@ -80,57 +306,189 @@ class RealDataCollector:
         return results
 
     async def _analyze_with_llm(
-        self, filters: Dict, web_results: List[Dict], user_message: str = ""
+        self,
+        filters: Dict,
+        web_results: List[Dict],
+        user_message: str = "",
+        strategy: Optional[str] = None,
+        on_result: Optional[Callable[[str, List[Dict]], None]] = None,
     ) -> List[Dict]:
-        """Parallel Multi-LLM sistemi ile analiz yap"""
-
-        print(f"🔍 Parallel Multi-LLM Analysis başlatılıyor...")
-        print(f"📊 Filters: {filters}")
-        print(f"💬 User Message: {user_message}")
-        print(f"🌐 Web results count: {len(web_results)}")
-
-        # 2 LLM modeli paralel olarak çalıştır
-        tasks = [
-            self._try_google_gemini(
-                filters, web_results, user_message
-            ),  # Google Gemini (en üstte)
-            self._try_openrouter_gpt_oss(
-                filters, web_results, user_message
-            ),  # GPT-OSS-20B:free
+        """Multi-LLM analizi - strateji: parallel, first_success ya da hedged"""
+
+        strategy = strategy or self.strategy
+        if strategy not in LLM_STRATEGIES:
+            logger.warning("⚠️ Unknown LLM strategy %s, using parallel", strategy)
+            strategy = "parallel"
+
+        logger.info("🔍 Multi-LLM Analysis başlatılıyor (strategy=%s)...", strategy)
+        logger.debug("📊 Filters: %s", filters)
+        logger.debug("💬 User Message: %s", user_message)
+        logger.info("🌐 Web results count: %s", len(web_results))
+
+        # Öncelik sırası: Google Gemini (en üstte), GPT-OSS-20B:free
+        calls = [
+            (
+                "Google Gemini",
+                lambda: self._try_google_gemini(filters, web_results, user_message),
+            ),
+            (
+                "GPT-OSS-20B",
+                lambda: self._try_openrouter_gpt_oss(filters, web_results, user_message),
+            ),
         ]
 
-        print(f"🚀 2 LLM modeli paralel olarak çalıştırılıyor...")
+        started = time.perf_counter()
+        if strategy == "parallel":
+            all_llm_responses = await self._run_parallel(calls, on_result)
+        elif strategy == "first_success":
+            all_llm_responses = await self._run_first_success(calls, on_result=on_result)
+        else:
+            all_llm_responses = await self._run_first_success(
+                calls, hedge_delay=self.hedge_delay(calls[0][0]), on_result=on_result
+            )
+        LLM_STRATEGY_SECONDS.observe(time.perf_counter() - started, strategy)
+
+        logger.info("🎯 Toplam %s LLM yanıtı alındı", len(all_llm_responses))
+        return all_llm_responses  # ✅ LLM yanıtları döndür
+
+    async def _run_parallel(
+        self,
+        calls: List[Tuple[str, Callable]],
+        on_result: Optional[Callable[[str, List[Dict]], None]] = None,
+    ) -> List[Dict]:
+        """Tüm modelleri paralel çalıştır ve hepsini bekle"""
+        logger.info("🚀 %s LLM modeli paralel olarak çalıştırılıyor...", len(calls))
 
         # Tüm sonuçları bekle
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results = await asyncio.gather(
+            *[self._timed(model, call, on_result) for model, call in calls],
+            return_exceptions=True,
+        )
 
         # Başarılı sonuçları topla
         all_llm_responses = []  # ✅ LLM yanıtları için ayrı liste
         successful_models = []
 
-        for i, result in enumerate(results):
+        for (model, _), result in zip(calls, results):
             if isinstance(result, Exception):
-                print(f"❌ Model {i+1} error: {result}")
+                logger.error("❌ %s error: %s", model, result)
             elif result and len(result) > 0:
-                model_names = ["Google Gemini", "GPT-OSS-20B"]
-                print(f"✅ {model_names[i]} başarılı: {len(result)} responses")
+                logger.info("✅ %s başarılı: %s responses", model, len(result))
                 all_llm_responses.extend(result)  # ✅ LLM yanıtları ekle
-                successful_models.append(model_names[i])
+                successful_models.append(model)
 
-        print(
-            f"🎯 Toplam {len(all_llm_responses)} LLM yanıtı alındı"
-        )  # ✅ Daha açık mesaj
-        print(f"🏆 Başarılı modeller: {', '.join(successful_models)}")
+        logger.info("🏆 Başarılı modeller: %s", ', '.join(successful_models))
+        return all_llm_responses
 
-        return all_llm_responses  # ✅ LLM yanıtları döndür
+    async def _run_first_success(
+        self,
+        calls: List[Tuple[str, Callable]],
+        hedge_delay: Optional[float] = None,
+        on_result: Optional[Callable[[str, List[Dict]], None]] = None,
+    ) -> List[Dict]:
+        """İlk başarılı yanıtı döndür, diğer çağrıları iptal et
+
+        hedge_delay verilirse bir sonraki model yalnızca çalışan model bu
+        süre içinde yanıt vermezse (ya da hata verirse) başlatılır. Hiçbir
+        model başarılı olmazsa tüm hata yanıtları döner.
+        """
+        waiting = list(calls)
+        running: Dict[asyncio.Future, str] = {}
+        failures: List[Dict] = []
+
+        def launch(reason: Optional[str] = None):
+            model, call = waiting.pop(0)
+            running[asyncio.ensure_future(self._timed(model, call, on_result))] = model
+            if reason is not None:
+                logger.info("🪁 Hedge: %s başlatılıyor (%s)", model, reason)
+                LLM_HEDGES.inc(model, reason)
+
+        launch()
+        if hedge_delay is None:
+            while waiting:
+                launch()
+
+        try:
+            while running:
+                timeout = hedge_delay if waiting else None
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    launch("slow")
+                    continue
+
+                for task in done:
+                    model = running.pop(task)
+                    if task.exception() is not None:
+                        logger.error("❌ %s error: %s", model, task.exception())
+                        continue
+                    result = task.result()
+                    if _is_success(result):
+                        logger.info("🏆 İlk başarılı model: %s", model)
+                        return result
+                    failures.extend(result or [])
+
+                if not running and waiting:
+                    launch("failed")
+            return failures
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    async def _timed(
+        self,
+        model: str,
+        call: Callable[[], Awaitable[List[Dict]]],
+        on_result: Optional[Callable[[str, List[Dict]], None]] = None,
+    ) -> List[Dict]:
+        """Çağrı süresini hedge gecikmesi için kaydet (cache yanıtları hariç)"""
+        started = time.perf_counter()
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            # İptal edilen çağrı en az bu kadar sürerdi; p95 aşağı kaymasın
+            self._latencies[model].append(time.perf_counter() - started)
+            raise
+        if _is_success(result) and not result[0].get("cached"):
+            self._latencies[model].append(time.perf_counter() - started)
+        if on_result is not None and result:
+            on_result(model, result)
+        return result
+
+    def hedge_delay(self, model: str) -> float:
+        """Model için hedge gecikmesi: son çağrıların p95'i (yeterli örnek yoksa varsayılan)"""
+        samples = sorted(self._latencies[model])
+        if len(samples) < LLM_HEDGE_MIN_SAMPLES:
+            return LLM_HEDGE_DEFAULT_DELAY
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
 
     async def _try_openrouter_gpt_oss(
         self, filters: Dict, web_results: List[Dict], user_message: str = ""
     ) -> List[Dict]:
         """OpenRouter GPT-OSS-20B ile analiz yap"""
 
+        cache_key, cached = await self._get_cached_response(
+            "GPT-OSS-20B", filters, user_message
+        )
+        if cached is not None:
+            return cached
+        return await self._coalesce(
+            "GPT-OSS-20B",
+            cache_key,
+            lambda: self._call_openrouter_gpt_oss(cache_key, user_message),
+        )
+
+    async def _call_openrouter_gpt_oss(
+        self, cache_key: str, user_message: str
+    ) -> List[Dict]:
+        """OpenRouter upstream çağrısı (rate limit + HTTP), başarılıysa cache'le"""
+
         if not self._check_rate_limit("openrouter"):
-            print("❌ OpenRouter rate limit exceeded - daily quota reached")
+            logger.error("❌ OpenRouter rate limit exceeded - daily quota reached")
+            LLM_REQUESTS.inc("GPT-OSS-20B", "rate_limited")
             return [
                 {
                     "model": "GPT-OSS-20B",
@@ -143,61 +501,72 @@ class RealDataCollector:
         # Prompt yerine user message kullan
         message_content = user_message if user_message.strip() else "Hello"
 
+        started = time.perf_counter()
         try:
-            print(f"🚀 OpenRouter GPT-OSS-20B API çağrısı...")
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "Authorization": f"Bearer {self.openrouter_api_key}",
-                    "Content-Type": "application/json",
-                }
+            logger.info("🚀 OpenRouter GPT-OSS-20B API çağrısı...")
+            client = self._get_http_client()
+            headers = {
+                "Authorization": f"Bearer {self.openrouter_api_key}",
+                "Content-Type": "application/json",
+            }
 
-                data = {
-                    "model": "openai/gpt-oss-20b:free",  # OpenRouter model (Free)
-                    "messages": [{"role": "user", "content": message_content}],
-                    "max_tokens": 1000,
-                }
+            data = {
+                "model": "openai/gpt-oss-20b:free",  # OpenRouter model (Free)
+                "messages": [{"role": "user", "content": message_content}],
+                "max_tokens": 1000,
+            }
 
-                response = await client.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
+            response = await self._guarded_request(
+                "openrouter",
+                lambda timeout: client.post(
+                    self.openrouter_url,
                     headers=headers,
                     json=data,
-                    timeout=30.0,
-                )
+                    timeout=timeout,
+                ),
+            )
 
-                if response.status_code == 200:
-                    result = response.json()
-                    content = result["choices"][0]["message"]["content"]
-                    print(f"🤖 GPT-OSS-20B Response preview: {content[:300]}...")
-
-                    # GPT-OSS-20B yanıtını temizle
-                    cleaned_content = self._clean_gpt_response(content)
-                    print(f"🧹 Cleaned GPT-OSS-20B Response: {cleaned_content[:200]}...")
-                    # Parsing kaldırıldı - direkt LLM yanıtı döndür
-                    self._increment_request_count("openrouter")
-                    return [
-                        {
-                            "model": "GPT-OSS-20B",
-                            "llm_response": cleaned_content,
-                            "user_question": user_message,
-                            "status": "success",
-                            "timestamp": datetime.now().isoformat(),
-                        }
-                    ]
-                else:
-                    print(f"❌ GPT-OSS-20B Error: {response.status_code}")
-                    print(f"📝 Error Response: {response.text[:200]}...")
-                    return [
-                        {
-                            "model": "GPT-OSS-20B",
-                            "llm_response": f"API Error: {response.status_code}",
-                            "user_question": user_message,
-                            "status": "error",
-                            "timestamp": datetime.now().isoformat(),
-                        }
-                    ]
+            if response.status_code == 200:
+                result = response.json()
+                content = result["choices"][0]["message"]["content"]
+                logger.debug("🤖 GPT-OSS-20B Response preview: %s...", content[:300])
+
+                # GPT-OSS-20B yanıtını temizle
+                cleaned_content = self._clean_gpt_response(content)
+                logger.debug(
+                    "🧹 Cleaned GPT-OSS-20B Response: %s...", cleaned_content[:200]
+                )
+                # Parsing kaldırıldı - direkt LLM yanıtı döndür
+                self._increment_request_count("openrouter")
+                record_llm_call("GPT-OSS-20B", started, "success")
+                responses = [
+                    {
+                        "model": "GPT-OSS-20B",
+                        "llm_response": cleaned_content,
+                        "user_question": user_message,
+                        "status": "success",
+                        "timestamp": datetime.now().isoformat(),
+                    }
+                ]
+                await self.response_cache.aset(cache_key, responses)
+                return responses
+            else:
+                logger.error("❌ GPT-OSS-20B Error: %s", response.status_code)
+                record_llm_call("GPT-OSS-20B", started, "http_error")
+                logger.error("📝 Error Response: %s...", response.text[:200])
+                return [
+                    {
+                        "model": "GPT-OSS-20B",
+                        "llm_response": f"API Error: {response.status_code}",
+                        "user_question": user_message,
+                        "status": "error",
+                        "timestamp": datetime.now().isoformat(),
+                    }
+                ]
 
         except Exception as e:
-            print(f"❌ GPT-OSS-20B error: {e}")
+            logger.error("❌ GPT-OSS-20B error: %s", e)
+            self._record_error("GPT-OSS-20B", started, e)
             return [
                 {
                     "model": "GPT-OSS-20B",
@@ -213,55 +582,77 @@ class RealDataCollector:
     ) -> List[Dict]:
         """Google Gemini ile analiz"""
 
+        cache_key, cached = await self._get_cached_response(
+            "Google Gemini", filters, user_message
+        )
+        if cached is not None:
+            return cached
+        return await self._coalesce(
+            "Google Gemini",
+            cache_key,
+            lambda: self._call_google_gemini(cache_key, user_message),
+        )
+
+    async def _call_google_gemini(self, cache_key: str, user_message: str) -> List[Dict]:
+        """Gemini upstream çağrısı (rate limit + HTTP), başarılıysa cache'le"""
+
         if not self._check_rate_limit("google"):
-            print("❌ Google rate limit exceeded")
+            logger.error("❌ Google rate limit exceeded")
+            LLM_REQUESTS.inc("Google Gemini", "rate_limited")
             return []
 
         # Prompt yerine user message kullan
         message_content = user_message if user_message.strip() else "Hello"
 
+        started = time.perf_counter()
         try:
-            print(f"🚀 Google Gemini API çağrısı...")
-            async with httpx.AsyncClient() as client:
-                headers = {"Content-Type": "application/json"}
+            logger.info("🚀 Google Gemini API çağrısı...")
+            client = self._get_http_client()
+            headers = {"Content-Type": "application/json"}
 
-                data = {"contents": [{"parts": [{"text": message_content}]}]}
+            data = {"contents": [{"parts": [{"text": message_content}]}]}
 
-                # Google Gemini API endpoint
-                url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={self.google_api_key}"
+            # Google Gemini API endpoint
+            url = f"{self.gemini_base_url}/models/gemini-2.0-flash:generateContent?key={self.google_api_key}"
 
-                response = await client.post(
-                    url, headers=headers, json=data, timeout=30.0
-                )
+            response = await self._guarded_request(
+                "google",
+                lambda timeout: client.post(url, headers=headers, json=data, timeout=timeout),
+            )
 
-                if response.status_code == 200:
-                    result = response.json()
-                    content = result["candidates"][0]["content"]["parts"][0]["text"]
-                    print(f"🤖 Google Gemini Response preview: {content[:300]}...")
-                    # Parsing kaldırıldı - direkt LLM yanıtı döndür
-                    self._increment_request_count("google")
-                    return [
-                        {
-                            "llm_response": content,
-                            "model": "Google Gemini",
-                            "user_question": user_message,
-                            "status": "success",
-                        }
-                    ]
-                else:
-                    print(f"❌ Google Gemini Error: {response.status_code}")
-                    print(f"📝 Error Response: {response.text[:200]}...")
-                    return [
-                        {
-                            "llm_response": f"API Error: {response.status_code}",
-                            "model": "Google Gemini",
-                            "user_question": user_message,
-                            "status": "error",
-                        }
-                    ]
+            if response.status_code == 200:
+                result = response.json()
+                content = result["candidates"][0]["content"]["parts"][0]["text"]
+                logger.debug("🤖 Google Gemini Response preview: %s...", content[:300])
+                # Parsing kaldırıldı - direkt LLM yanıtı döndür
+                self._increment_request_count("google")
+                record_llm_call("Google Gemini", started, "success")
+                responses = [
+                    {
+                        "llm_response": content,
+                        "model": "Google Gemini",
+                        "user_question": user_message,
+                        "status": "success",
+                    }
+                ]
+                await self.response_cache.aset(cache_key, responses)
+                return responses
+            else:
+                logger.error("❌ Google Gemini Error: %s", response.status_code)
+                record_llm_call("Google Gemini", started, "http_error")
+                logger.error("📝 Error Response: %s...", response.text[:200])
+                return [
+                    {
+                        "llm_response": f"API Error: {response.status_code}",
+                        "model": "Google Gemini",
+                        "user_question": user_message,
+                        "status": "error",
+                    }
+                ]
 
         except Exception as e:
-            print(f"❌ Google Gemini error: {e}")
+            logger.error("❌ Google Gemini error: %s", e)
+            self._record_error("Google Gemini", started, e)
             return [
                 {
                     "llm_response": f"Error: {str(e)}",
@@ -271,6 +662,204 @@ class RealDataCollector:
                 }
             ]
 
+    async def stream_chat(
+        self, filters: Dict, user_message: str = ""
+    ) -> AsyncIterator[Dict]:
+        """İki modeli paralel stream et, olayları geldikleri sırayla döndür
+
+        Olaylar:
+        - {"event": "token", "model", "text"}
+        - {"event": "done", "model", "llm_response", "cached"}
+        - {"event": "error", "model", "error"}
+        Tüketici erken çıkarsa upstream stream'ler iptal edilir.
+        """
+        events: asyncio.Queue = asyncio.Queue()
+        streams = [
+            ("Google Gemini", self._stream_google_gemini(filters, user_message)),
+            ("GPT-OSS-20B", self._stream_openrouter_gpt_oss(filters, user_message)),
+        ]
+
+        async def pump(model: str, stream: AsyncIterator[Dict]):
+            try:
+                async for event in stream:
+                    await events.put(event)
+            except Exception as e:
+                logger.error("❌ %s stream error: %s", model, e)
+                await events.put({"event": "error", "model": model, "error": str(e)})
+            finally:
+                await events.put(None)
+
+        tasks = [asyncio.ensure_future(pump(model, stream)) for model, stream in streams]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                event = await events.get()
+                if event is None:
+                    remaining -= 1
+                else:
+                    yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _stream_openrouter_gpt_oss(
+        self, filters: Dict, user_message: str
+    ) -> AsyncIterator[Dict]:
+        """OpenRouter GPT-OSS-20B yanıtını token token stream et"""
+        message_content = user_message if user_message.strip() else "Hello"
+        return self._stream_llm(
+            model="GPT-OSS-20B",
+            service="openrouter",
+            filters=filters,
+            user_message=user_message,
+            url=self.openrouter_url,
+            headers={
+                "Authorization": f"Bearer {self.openrouter_api_key}",
+                "Content-Type": "application/json",
+            },
+            payload={
+                "model": "openai/gpt-oss-20b:free",
+                "messages": [{"role": "user", "content": message_content}],
+                "max_tokens": 1000,
+                "stream": True,
+            },
+            extract=_openrouter_delta,
+            finalize=self._clean_gpt_response,
+        )
+
+    def _stream_google_gemini(self, filters: Dict, user_message: str) -> AsyncIterator[Dict]:
+        """Google Gemini yanıtını token token stream et"""
+        message_content = user_message if user_message.strip() else "Hello"
+        return self._stream_llm(
+            model="Google Gemini",
+            service="google",
+            filters=filters,
+            user_message=user_message,
+            url=(
+                f"{self.gemini_base_url}/models/gemini-2.0-flash:streamGenerateContent"
+                f"?alt=sse&key={self.google_api_key}"
+            ),
+            headers={"Content-Type": "application/json"},
+            payload={"contents": [{"parts": [{"text": message_content}]}]},
+            extract=_gemini_delta,
+        )
+
+    async def _stream_llm(
+        self,
+        model: str,
+        service: str,
+        filters: Dict,
+        user_message: str,
+        url: str,
+        headers: Dict,
+        payload: Dict,
+        extract: Callable[[Dict], Optional[str]],
+        finalize: Optional[Callable[[str], str]] = None,
+    ) -> AsyncIterator[Dict]:
+        """Upstream SSE stream'ini token olaylarına çevir
+
+        Cache'te yanıt varsa tek seferde döner. Tamamlanan yanıt (finalize
+        ile temizlenmiş hali) cache'lenir ve kotadan düşülür.
+        """
+        cache_key, cached = await self._get_cached_response(model, filters, user_message)
+        if cached is not None:
+            for item in cached:
+                yield {"event": "token", "model": model, "text": item["llm_response"]}
+                yield {
+                    "event": "done",
+                    "model": model,
+                    "llm_response": item["llm_response"],
+                    "cached": True,
+                }
+            return
+
+        if not self._check_rate_limit(service):
+            LLM_REQUESTS.inc(model, "rate_limited")
+            yield {"event": "error", "model": model, "error": "Rate limit exceeded"}
+            return
+
+        breaker = self.breakers[service]
+        if not breaker.allow():
+            error = CircuitOpenError(service, breaker.retry_after())
+            logger.warning("🔌 %s stream skipped: %s", model, error)
+            LLM_REQUESTS.inc(model, "circuit_open")
+            yield {"event": "error", "model": model, "error": f"Error: {error}"}
+            return
+
+        started = time.perf_counter()
+        parts: List[str] = []
+        try:
+            logger.info("🚀 %s streaming API çağrısı...", model)
+            client = self._get_http_client()
+            # Stream'in toplam süresi sınırlanmaz; timeout bağlantı ve her
+            # okuma arasındaki bekleme için uygulanır
+            async with client.stream(
+                "POST",
+                url,
+                headers=headers,
+                json=payload,
+                timeout=self.timeouts[service].timeout(),
+            ) as response:
+                first_byte = time.perf_counter() - started
+                if response.status_code != 200:
+                    body = await response.aread()
+                    logger.error("❌ %s stream error: %s", model, response.status_code)
+                    logger.error("📝 Error Response: %s...", body[:200])
+                    self._record_upstream(service, response.status_code, first_byte)
+                    record_llm_call(model, started, "http_error")
+                    yield {
+                        "event": "error",
+                        "model": model,
+                        "error": f"API Error: {response.status_code}",
+                    }
+                    return
+
+                async for data in iter_sse_data(response):
+                    if data == "[DONE]":
+                        break
+                    try:
+                        text = extract(json.loads(data))
+                    except json.JSONDecodeError:
+                        logger.debug("📝 Skipping non-JSON stream event: %s", data[:200])
+                        continue
+                    if not text:
+                        continue
+                    if not parts:
+                        LLM_TIME_TO_FIRST_TOKEN.observe(time.perf_counter() - started, model)
+                    parts.append(text)
+                    yield {"event": "token", "model": model, "text": text}
+
+        except Exception as e:
+            logger.error("❌ %s stream error: %s", model, e)
+            breaker.record_failure()
+            self._record_error(model, started, e)
+            yield {"event": "error", "model": model, "error": f"Error: {str(e)}"}
+            return
+        except BaseException:
+            # Tüketici ayrıldı ya da iptal edildi; sağlayıcı hakkında bilgi yok
+            breaker.release()
+            raise
+
+        content = "".join(parts)
+        if finalize is not None:
+            content = finalize(content)
+        breaker.record_success(first_byte)
+        self._increment_request_count(service)
+        record_llm_call(model, started, "success")
+        await self.response_cache.aset(
+            cache_key,
+            [
+                {
+                    "model": model,
+                    "llm_response": content,
+                    "user_question": user_message,
+                    "status": "success",
+                    "timestamp": datetime.now().isoformat(),
+                }
+            ],
+        )
+        yield {"event": "done", "model": model, "llm_response": content, "cached": False}
+
     def _create_llm_prompt(self, filters: Dict, web_results: List[Dict]) -> str:
         """User message'ı direkt gönder - prompt yok"""
         # Prompt kaldırıldı - sadece user message kullan
@@ -279,89 +868,66 @@ class RealDataCollector:
     # _parse_llm_response metodu kaldırıldı - gereksiz
 
     def _check_rate_limit(self, service: str) -> bool:
-        """Rate limit kontrolü - tüm servisler için tutarlı"""
-        current_time = time.time()
-
-        # Servis için rate limit ayarları
-        if service == "openrouter":
-            daily_limit = 1000  # OpenRouter: günlük 1000 request
-        elif service == "google":
-            daily_limit = 1000  # Google Gemini: günlük 1000 request
-        else:
+        """Rate limit kontrolü - tüm servisler için tutarlı (O(1))"""
+        daily_limit = self.daily_quotas.get(service)
+        if daily_limit is None:
             return True  # Bilinmeyen servis için limit yok
 
-        # 24 saatlik window
-        window_start = current_time - 86400
-
-        # Servis için request listesi yoksa oluştur
-        if service not in self.request_counts:
-            self.request_counts[service] = []
-
-        # Window içindeki request sayısını hesapla
-        requests_in_window = [
-            req_time
-            for req_time in self.request_counts[service]
-            if isinstance(req_time, (int, float)) and req_time > window_start
-        ]
-
-        # Limit kontrolü
-        can_make_request = len(requests_in_window) < daily_limit
-
-        if not can_make_request:
-            print(
-                f"⚠️ Rate limit exceeded for {service}: {len(requests_in_window)}/{daily_limit}"
+        used = self.quota.count(service)
+        if used >= daily_limit:
+            logger.warning(
+                "⚠️ Rate limit exceeded for %s: %s/%s", service, used, daily_limit
             )
-
-        return can_make_request
+            return False
+        return True
 
     def _increment_request_count(self, service: str):
         """Request count'u artır"""
-        if service not in self.request_counts:
-            self.request_counts[service] = []
-
-        self.request_counts[service].append(time.time())
+        self.quota.add(service)
 
-        # Eski request'leri temizle (24 saatten eski)
-        current_time = time.time()
-        self.request_counts[service] = [
-            req_time
-            for req_time in self.request_counts[service]
-            if current_time - req_time < 86400
-        ]
+    def allow_user(self, user_key: str) -> bool:
+        """Kullanıcı başına günlük chat limiti (LLM_USER_DAILY_LIMIT, 0: kapalı)"""
+        if self.user_limiter.try_acquire(user_key):
+            return True
+        logger.warning("⚠️ User chat limit exceeded for %s", user_key)
+        LLM_REQUESTS.inc("all", "user_rate_limited")
+        return False
 
     def get_collection_status(self) -> Dict:
         """Veri toplama durumunu getir - yeni rate limiting sistemi ile"""
 
-        current_time = time.time()
-        window_start = current_time - 86400
-
-        def get_service_status(service_name: str, daily_limit: int) -> Dict:
-            if service_name not in self.request_counts:
-                return {
-                    "enabled": False,
-                    "quota_used": 0,
-                    "quota_limit": daily_limit,
-                    "quota_remaining": daily_limit,
-                }
-
+        def get_service_status(service_name: str) -> Dict:
+            daily_limit = self.daily_quotas[service_name]
             # 24 saatlik window içindeki request sayısı
-            requests_in_window = [
-                req_time
-                for req_time in self.request_counts[service_name]
-                if isinstance(req_time, (int, float)) and req_time > window_start
-            ]
-
-            quota_used = len(requests_in_window)
-            quota_remaining = max(0, daily_limit - quota_used)
-
+            quota_used = self.quota.count(service_name)
             return {
                 "enabled": True,
                 "quota_used": quota_used,
                 "quota_limit": daily_limit,
-                "quota_remaining": quota_remaining,
+                "quota_remaining": max(0, daily_limit - quota_used),
             }
 
         return {
-            "openrouter": get_service_status("openrouter", 1000),
-            "google_gemini": get_service_status("google", 1000),
+            "openrouter": get_service_status("openrouter"),
+            "google_gemini": get_service_status("google"),
+            "quota_backend": self.quota.stats(),
+            "user_limit": {
+                "daily_limit": self.user_limiter.limit,
+                "tracked_users": len(self.user_limiter),
+            },
+            "response_cache": self.response_cache.stats(),
+            "single_flight": self.in_flight.stats(),
+            "circuit_breakers": {
+                service: dict(
+                    self.breakers[service].stats(), timeout=self.timeouts[service].stats()
+                )
+                for service in self.breakers
+            },
+            "llm_strategy": {
+                "strategy": self.strategy,
+                "hedge_delay_seconds": {
+                    model: round(self.hedge_delay(model), 3)
+                    for model in ("Google Gemini", "GPT-OSS-20B")
+                },
+            },
         }
@@ -24,7 +24,8 @@ REAL_DATA_SOURCES = {
             "openai/gpt-oss-20b:free",  # GPT-OSS-20B (Free)
             "google/gemini-2.0-flash",  # Google Gemini
         ],
-        "fallback_strategy": "parallel",  # Parallel processing
+        # parallel | first_success | hedged (bkz. RealDataCollector._analyze_with_llm)
+        "fallback_strategy": os.getenv("LLM_STRATEGY", "parallel"),
     },
 }
 
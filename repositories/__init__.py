@@ -1,7 +1,4 @@
 # Repositories package
-from .project_management_repo import ProjectManagementRepository
-
-# Create instance
-project_management_repo = ProjectManagementRepository()
+from .project_management_repo import ProjectManagementRepository, project_management_repo
 
 __all__ = ["project_management_repo"]
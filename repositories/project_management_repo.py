@@ -10,11 +10,13 @@ from typing import Dict, List, Optional
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from supabase_database import SupabaseDatabaseManager
+from supabase_database import db as shared_db
 
 
 class ProjectManagementRepository:
-    def __init__(self):
-        self.db = SupabaseDatabaseManager()
+    def __init__(self, db: Optional[SupabaseDatabaseManager] = None):
+        # Process genelinde tek Supabase client paylaşılır
+        self.db = db or shared_db
 
     def get_all_weeks(self) -> List[Dict]:
         """Tüm haftaları getir"""
@@ -0,0 +1,122 @@
+"""
+Route Matcher
+Public endpoint kuralları için önceden derlenmiş method + path eşleştirici
+
+Kural formatı: "[METHOD ]/yol"
+- "/api/health"          her method için tam eşleşme
+- "POST /api/auth/login"  yalnızca POST için tam eşleşme
+- "/api/tenders/{id}"     {param} tek bir segmenti eşler
+- "/api/tenders/**"       /api/tenders ve altındaki tüm yollar (segment sınırında)
+
+Eşleştirme maliyeti yol uzunluğuyla orantılıdır: tam yollar tek bir dict
+araması, alt ağaç kuralları yolun her segment sınırında bir dict araması,
+parametreli şablonlar ise segment trie'si üzerinde tek geçiştir.
+"""
+
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+ANY_METHOD = "*"
+_SUBTREE = "**"
+
+
+def _normalize(path: str) -> str:
+    if len(path) > 1 and path[-1] == "/":
+        return path.rstrip("/") or "/"
+    return path
+
+
+def parse_rule(rule: str) -> Tuple[str, str]:
+    """'GET /yol' ya da '/yol' kuralını (method, path) çiftine ayır"""
+    method, _, path = rule.strip().rpartition(" ")
+    if not path.startswith("/"):
+        raise ValueError(f"Route rule must start with '/': {rule!r}")
+    return (method.strip().upper() or ANY_METHOD), _normalize(path)
+
+
+def _is_param(segment: str) -> bool:
+    return segment.startswith("{") and segment.endswith("}")
+
+
+class _Node:
+    __slots__ = ("children", "param", "methods")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.param: Optional["_Node"] = None
+        self.methods: FrozenSet[str] = frozenset()
+
+
+class RouteMatcher:
+    """Method + path kurallarını bir kez derleyip hızlı eşleştirir
+
+    Method'lar büyük harfle verilmelidir (HTTP request method'ları gibi).
+    """
+
+    def __init__(self, rules: Iterable[str] = ()):
+        self.rules: List[Tuple[str, str]] = []
+        self._exact: Dict[str, FrozenSet[str]] = {}
+        self._subtree: Dict[str, FrozenSet[str]] = {}
+        self._templates: Optional[_Node] = None
+        for rule in rules:
+            self.add(rule)
+
+    def add(self, rule: str):
+        """Kural ekle"""
+        method, path = parse_rule(rule)
+        self.rules.append((method, path))
+        segments = [s for s in path.split("/") if s]
+
+        if segments and segments[-1] == _SUBTREE:
+            prefix = "/" + "/".join(segments[:-1])
+            if any(_is_param(s) for s in segments):
+                raise ValueError(f"Subtree rules cannot contain parameters: {rule!r}")
+            self._subtree[prefix] = self._subtree.get(prefix, frozenset()) | {method}
+        elif any(_is_param(s) for s in segments):
+            node = self._templates = self._templates or _Node()
+            for segment in segments:
+                if _is_param(segment):
+                    node.param = node.param or _Node()
+                    node = node.param
+                else:
+                    node = node.children.setdefault(segment, _Node())
+            node.methods = node.methods | {method}
+        else:
+            self._exact[path] = self._exact.get(path, frozenset()) | {method}
+
+    def matches(self, method: str, path: str) -> bool:
+        """Yol ve method herhangi bir kurala uyuyor mu"""
+        if len(path) > 1 and path[-1] == "/":
+            path = _normalize(path)
+        methods = self._exact.get(path)
+        if methods is not None and (method in methods or ANY_METHOD in methods):
+            return True
+
+        subtree = self._subtree
+        if subtree:
+            # Yolun kendisi ve segment sınırındaki her öneki: "/a/b/c", "/a/b", "/a", "/"
+            end = len(path)
+            while end > 0:
+                methods = subtree.get(path[:end])
+                if methods is not None and (method in methods or ANY_METHOD in methods):
+                    return True
+                end = path.rfind("/", 0, end)
+            methods = subtree.get("/")
+            if methods is not None and (method in methods or ANY_METHOD in methods):
+                return True
+
+        if self._templates is not None:
+            segments = [s for s in path.split("/") if s]
+            return self._match_template(self._templates, segments, 0, method)
+        return False
+
+    def _match_template(self, node: _Node, segments, index: int, method: str) -> bool:
+        if index == len(segments):
+            return method in node.methods or ANY_METHOD in node.methods
+        child = node.children.get(segments[index])
+        if child is not None and self._match_template(
+            child, segments, index + 1, method
+        ):
+            return True
+        if node.param is not None:
+            return self._match_template(node.param, segments, index + 1, method)
+        return False
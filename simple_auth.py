@@ -5,7 +5,6 @@ Basit JWT tabanlı kullanıcı oturumu yönetimi
 """
 
 import hashlib
-import json
 import os
 import secrets
 from datetime import datetime, timedelta
@@ -15,6 +14,8 @@ from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from file_store import JSONFileStore
+
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -31,41 +32,25 @@ SESSIONS_FILE = "sessions.json"
 
 class SimpleAuthService:
     def __init__(self):
+        self.users_store = JSONFileStore(USERS_FILE)
+        self.sessions_store = JSONFileStore(SESSIONS_FILE)
         self._ensure_files_exist()
 
     def _ensure_files_exist(self):
         """Gerekli JSON dosyalarının varlığını kontrol et"""
-        if not os.path.exists(USERS_FILE):
-            self._save_users({})
+        if not self.users_store.exists():
+            self.users_store.update(lambda users: None)
 
-        if not os.path.exists(SESSIONS_FILE):
-            self._save_sessions({})
+        if not self.sessions_store.exists():
+            self.sessions_store.update(lambda sessions: None)
 
     def _load_users(self) -> Dict:
         """Kullanıcıları JSON'dan yükle"""
-        try:
-            with open(USERS_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-
-    def _save_users(self, users: Dict):
-        """Kullanıcıları JSON'a kaydet"""
-        with open(USERS_FILE, "w", encoding="utf-8") as f:
-            json.dump(users, f, indent=2, ensure_ascii=False, default=str)
+        return self.users_store.read()
 
     def _load_sessions(self) -> Dict:
         """Session'ları JSON'dan yükle"""
-        try:
-            with open(SESSIONS_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-
-    def _save_sessions(self, sessions: Dict):
-        """Session'ları JSON'a kaydet"""
-        with open(SESSIONS_FILE, "w", encoding="utf-8") as f:
-            json.dump(sessions, f, indent=2, ensure_ascii=False, default=str)
+        return self.sessions_store.read()
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Şifre doğrulama"""
@@ -113,21 +98,9 @@ class SimpleAuthService:
         self, email: str, username: str, password: str, full_name: str = None
     ) -> Dict[str, Any]:
         """Yeni kullanıcı kaydı"""
-        users = self._load_users()
-
-        # Email ve username kontrolü
-        for user_id, user_data in users.items():
-            if user_data.get("email") == email:
-                raise HTTPException(status_code=400, detail="Email already registered")
-            if user_data.get("username") == username:
-                raise HTTPException(status_code=400, detail="Username already taken")
-
-        # Yeni kullanıcı oluştur
-        user_id = str(len(users) + 1)
         hashed_password = self.get_password_hash(password)
 
         new_user = {
-            "id": user_id,
             "email": email,
             "username": username,
             "full_name": full_name,
@@ -146,8 +119,24 @@ class SimpleAuthService:
             "last_api_call": None,
         }
 
-        users[user_id] = new_user
-        self._save_users(users)
+        def add_user(users: Dict) -> str:
+            # Email ve username kontrolü
+            for user_data in users.values():
+                if user_data.get("email") == email:
+                    raise HTTPException(
+                        status_code=400, detail="Email already registered"
+                    )
+                if user_data.get("username") == username:
+                    raise HTTPException(
+                        status_code=400, detail="Username already taken"
+                    )
+
+            # Yeni kullanıcı oluştur
+            user_id = str(len(users) + 1)
+            users[user_id] = {"id": user_id, **new_user}
+            return user_id
+
+        user_id = self.users_store.update(add_user)
 
         return {"message": "User created successfully", "user_id": user_id}
 
@@ -165,8 +154,6 @@ class SimpleAuthService:
         self, user_id: str, access_token: str, refresh_token: str
     ) -> str:
         """Kullanıcı session'ı oluştur"""
-        sessions = self._load_sessions()
-
         session_id = secrets.token_urlsafe(32)
         session_data = {
             "id": session_id,
@@ -182,8 +169,9 @@ class SimpleAuthService:
             "is_active": True,
         }
 
-        sessions[session_id] = session_data
-        self._save_sessions(sessions)
+        self.sessions_store.update(
+            lambda sessions: sessions.__setitem__(session_id, session_data)
+        )
 
         return session_id
 
@@ -194,27 +182,33 @@ class SimpleAuthService:
 
     def update_user_last_login(self, user_id: str):
         """Kullanıcının son giriş zamanını güncelle"""
-        users = self._load_users()
-        if user_id in users:
-            users[user_id]["last_login"] = datetime.now().isoformat()
-            self._save_users(users)
+
+        def touch(users: Dict):
+            if user_id in users:
+                users[user_id]["last_login"] = datetime.now().isoformat()
+
+        self.users_store.update(touch)
 
     def increment_api_calls(self, user_id: str):
         """API çağrı sayısını artır"""
-        users = self._load_users()
-        if user_id in users:
-            users[user_id]["api_calls_count"] = (
-                users[user_id].get("api_calls_count", 0) + 1
-            )
-            users[user_id]["last_api_call"] = datetime.now().isoformat()
-            self._save_users(users)
+
+        def increment(users: Dict):
+            if user_id in users:
+                users[user_id]["api_calls_count"] = (
+                    users[user_id].get("api_calls_count", 0) + 1
+                )
+                users[user_id]["last_api_call"] = datetime.now().isoformat()
+
+        self.users_store.update(increment)
 
     def deactivate_session(self, session_id: str):
         """Session'ı deaktif et"""
-        sessions = self._load_sessions()
-        if session_id in sessions:
-            sessions[session_id]["is_active"] = False
-            self._save_sessions(sessions)
+
+        def deactivate(sessions: Dict):
+            if session_id in sessions:
+                sessions[session_id]["is_active"] = False
+
+        self.sessions_store.update(deactivate)
 
     def get_active_sessions_by_user(self, user_id: str) -> list:
         """Kullanıcının aktif session'larını getir"""
@@ -253,31 +247,27 @@ class SimpleAuthService:
         self, user_id: str, current_password: str, new_password: str
     ) -> bool:
         """Şifre değiştirme"""
-        users = self._load_users()
-
-        if user_id not in users:
-            return False
+        user_data = self._load_users().get(user_id)
 
-        user_data = users[user_id]
-        if not self.verify_password(
+        if user_data is None or not self.verify_password(
             current_password, user_data.get("hashed_password", "")
         ):
             return False
 
-        # Yeni şifreyi hash'le ve kaydet
-        users[user_id]["hashed_password"] = self.get_password_hash(new_password)
-        users[user_id]["updated_at"] = datetime.now().isoformat()
+        # Yeni şifreyi hash'le ve kaydet (hash kilit dışında hesaplanır)
+        hashed_password = self.get_password_hash(new_password)
 
-        self._save_users(users)
-        return True
+        def set_password(users: Dict) -> bool:
+            if user_id not in users:
+                return False
+            users[user_id]["hashed_password"] = hashed_password
+            users[user_id]["updated_at"] = datetime.now().isoformat()
+            return True
+
+        return self.users_store.update(set_password)
 
     def update_user_profile(self, user_id: str, **kwargs) -> bool:
         """Kullanıcı profilini güncelle"""
-        users = self._load_users()
-
-        if user_id not in users:
-            return False
-
         # Güncellenebilir alanlar
         updatable_fields = [
             "full_name",
@@ -289,38 +279,36 @@ class SimpleAuthService:
             "is_admin",
         ]
 
-        for field, value in kwargs.items():
-            if field in updatable_fields and value is not None:
-                users[user_id][field] = value
+        def apply(users: Dict) -> bool:
+            if user_id not in users:
+                return False
 
-        users[user_id]["updated_at"] = datetime.now().isoformat()
-        self._save_users(users)
+            for field, value in kwargs.items():
+                if field in updatable_fields and value is not None:
+                    users[user_id][field] = value
 
-        return True
+            users[user_id]["updated_at"] = datetime.now().isoformat()
+            return True
+
+        return self.users_store.update(apply)
 
     def delete_user(self, user_id: str) -> bool:
         """Kullanıcıyı tamamen sil"""
-        users = self._load_users()
-
-        if user_id not in users:
-            return False
-
         # Kullanıcıyı sil
-        del users[user_id]
-        self._save_users(users)
+        if not self.users_store.update(lambda users: users.pop(user_id, None)):
+            return False
 
         # Kullanıcının session'larını da temizle
-        sessions = self._load_sessions()
-        sessions_to_remove = []
-
-        for session_id, session_data in sessions.items():
-            if session_data.get("user_id") == user_id:
-                sessions_to_remove.append(session_id)
-
-        for session_id in sessions_to_remove:
-            del sessions[session_id]
-
-        self._save_sessions(sessions)
+        def remove_sessions(sessions: Dict):
+            sessions_to_remove = [
+                session_id
+                for session_id, session_data in sessions.items()
+                if session_data.get("user_id") == user_id
+            ]
+            for session_id in sessions_to_remove:
+                del sessions[session_id]
+
+        self.sessions_store.update(remove_sessions)
 
         return True
 
@@ -0,0 +1,18 @@
+-- Keyset pagination indexes
+-- List endpoints page with ORDER BY created_at DESC, id DESC and a
+-- (created_at, id) < (cursor) filter; these indexes keep each page an index range scan.
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_created_at_id
+    ON public.pipeline (created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_collected_leads_created_at_id
+    ON public.collected_leads (created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_tenders_created_at_id
+    ON public.tenders (created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_chat_history_created_at_id
+    ON public.chat_history (created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_users_created_at_id
+    ON public.users (created_at DESC, id DESC);
@@ -0,0 +1,17 @@
+-- Unique deal_id for tenders
+-- POST /api/tenders saves with a single upsert (ON CONFLICT (deal_id)),
+-- which needs a unique index on deal_id. Tenders without a deal_id are unaffected.
+
+-- Keep only the most recently updated tender per deal_id
+DELETE FROM public.tenders t
+USING public.tenders newer
+WHERE t.deal_id IS NOT NULL
+  AND t.deal_id = newer.deal_id
+  AND (COALESCE(t.updated_at, t.created_at), t.id)
+      < (COALESCE(newer.updated_at, newer.created_at), newer.id);
+
+-- Upsert payloads omit created_at so existing rows keep it
+ALTER TABLE public.tenders ALTER COLUMN created_at SET DEFAULT NOW();
+ALTER TABLE public.tenders ALTER COLUMN updated_at SET DEFAULT NOW();
+
+CREATE UNIQUE INDEX IF NOT EXISTS tenders_deal_id_key ON public.tenders (deal_id);
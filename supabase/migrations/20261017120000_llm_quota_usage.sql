@@ -0,0 +1,49 @@
+-- Shared LLM quota counters
+-- Every instance batches its LLM calls locally and calls llm_quota_sync every
+-- few seconds (LLM_QUOTA_BACKEND=supabase). The function adds the batched
+-- increments to the current one-minute bucket and returns each service's
+-- total over the 24-hour sliding window, so one round trip both writes and
+-- reads. The function is SECURITY DEFINER, so it is only callable with the
+-- service role key; the window is fixed here and not taken from the caller.
+
+CREATE TABLE IF NOT EXISTS public.llm_quota_usage (
+    service TEXT NOT NULL,
+    bucket BIGINT NOT NULL,  -- unix minute (epoch / 60)
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (service, bucket)
+);
+
+-- Only reachable through llm_quota_sync
+ALTER TABLE public.llm_quota_usage ENABLE ROW LEVEL SECURITY;
+
+CREATE OR REPLACE FUNCTION public.llm_quota_sync(p_deltas JSONB)
+RETURNS TABLE (quota_service TEXT, used BIGINT)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_window_minutes CONSTANT INTEGER := 1440;
+    v_bucket BIGINT := floor(extract(epoch FROM now()) / 60);
+BEGIN
+    INSERT INTO public.llm_quota_usage AS u (service, bucket, count)
+    SELECT d.key, v_bucket, d.value::INTEGER
+    FROM jsonb_each_text(p_deltas) AS d
+    WHERE d.value::INTEGER > 0
+    ON CONFLICT (service, bucket) DO UPDATE SET count = u.count + EXCLUDED.count;
+
+    DELETE FROM public.llm_quota_usage AS u
+    WHERE u.bucket <= v_bucket - v_window_minutes;
+
+    RETURN QUERY
+    SELECT d.key, COALESCE(SUM(u.count), 0)::BIGINT
+    FROM jsonb_each_text(p_deltas) AS d
+    LEFT JOIN public.llm_quota_usage AS u
+        ON u.service = d.key AND u.bucket > v_bucket - v_window_minutes
+    GROUP BY d.key;
+END;
+$$;
+
+-- Functions are executable by PUBLIC by default
+REVOKE ALL ON FUNCTION public.llm_quota_sync(JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.llm_quota_sync(JSONB) TO service_role;
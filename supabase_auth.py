@@ -3,6 +3,7 @@ Supabase Authentication Service
 Lead Discovery API için Supabase authentication yönetimi
 """
 
+import logging
 import os
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
@@ -10,16 +11,38 @@ from typing import Any, Dict, List, Optional
 from fastapi import HTTPException, status
 
 from supabase_config import supabase_config
-from supabase_database import SupabaseDatabaseManager
+from jwt_verifier import jwt_verifier
+from supabase_database import db
+from token_cache import TokenCache
+
+logger = logging.getLogger(__name__)
+
+# Token doğrulama cache ayarları
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+TOKEN_CACHE_TTL = float(os.getenv("TOKEN_CACHE_TTL", "60"))
 
 
 class SupabaseAuthService:
     """Supabase authentication servisi"""
 
     def __init__(self):
-        self.auth = supabase_config.get_auth()
-        self.client = supabase_config.get_client()
-        self.db = SupabaseDatabaseManager()
+        self.db = db
+        self.token_cache = TokenCache(max_entries=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL)
+        self.verifier = jwt_verifier
+
+    @property
+    def auth(self):
+        """Supabase Auth client'ı (ilk kullanımda oluşturulur)"""
+        return supabase_config.get_auth()
+
+    @property
+    def client(self):
+        """Paylaşılan Supabase client'ı"""
+        return supabase_config.get_client()
+
+    def invalidate_user(self, user_id: str):
+        """Kullanıcının cache'lenmiş token ve profil kayıtlarını sil"""
+        self.token_cache.invalidate_user(user_id)
 
     def sign_up(self, email: str, password: str, user_data: Dict) -> Dict:
         """Yeni kullanıcı kaydı"""
@@ -100,7 +123,7 @@ class SupabaseAuthService:
 
                 # Username unique olana kadar sayı ekle
                 while True:
-                    existing_user = self.db.get_user_by_username(username)
+                    existing_user = self.db.get_user_by_username(username, columns="id")
                     if not existing_user:
                         break
                     username = f"{base_username}{counter}"
@@ -140,7 +163,7 @@ class SupabaseAuthService:
                 return None
 
         except Exception as e:
-            print(f"Admin user creation failed: {e}")
+            logger.error("Admin user creation failed: %s", e)
             import traceback
 
             traceback.print_exc()
@@ -159,7 +182,7 @@ class SupabaseAuthService:
 
             # Username unique olana kadar sayı ekle
             while True:
-                existing_user = self.db.get_user_by_username(username)
+                existing_user = self.db.get_user_by_username(username, columns="id")
                 if not existing_user:
                     break
                 username = f"{base_username}{counter}"
@@ -194,18 +217,23 @@ class SupabaseAuthService:
             }
 
         except Exception as e:
-            print(f"Add existing user to database failed: {e}")
+            logger.error("Add existing user to database failed: %s", e)
             import traceback
 
             traceback.print_exc()
             return None
 
     def get_user_by_id(self, user_id: str) -> Optional[Dict]:
-        """ID ile kullanıcı getir"""
+        """ID ile kullanıcı getir (cache'lenmiş profil varsa DB'ye gitmez)"""
         try:
-            return self.db.get_user_by_id(user_id)
+            user = self.token_cache.get_user(user_id)
+            if user is None:
+                user = self.db.get_user_by_id(user_id)
+                if user:
+                    self.token_cache.set_user(user_id, user)
+            return user
         except Exception as e:
-            print(f"Get user by ID failed: {e}")
+            logger.error("Get user by ID failed: %s", e)
             return None
 
     def get_all_users(self) -> Optional[List[Dict]]:
@@ -222,7 +250,7 @@ class SupabaseAuthService:
                 return users
             return []
         except Exception as e:
-            print(f"Get all users failed: {e}")
+            logger.error("Get all users failed: %s", e)
             return None
 
     def authenticate_user(self, email: str, password: str) -> Optional[Dict]:
@@ -249,7 +277,7 @@ class SupabaseAuthService:
             return None
 
         except Exception as e:
-            print(f"Authentication failed: {e}")
+            logger.error("Authentication failed: %s", e)
             return None
 
     def create_access_token(self, data: Dict) -> str:
@@ -259,7 +287,7 @@ class SupabaseAuthService:
             # Bu method genellikle Supabase tarafından otomatik yönetilir
             return "supabase_jwt_token"  # Placeholder
         except Exception as e:
-            print(f"Token creation failed: {e}")
+            logger.error("Token creation failed: %s", e)
             return ""
 
     def create_refresh_token(self, data: Dict) -> str:
@@ -268,7 +296,7 @@ class SupabaseAuthService:
             # Supabase refresh token'ı kullan
             return "supabase_refresh_token"  # Placeholder
         except Exception as e:
-            print(f"Refresh token creation failed: {e}")
+            logger.error("Refresh token creation failed: %s", e)
             return ""
 
     def create_user_session(
@@ -280,7 +308,7 @@ class SupabaseAuthService:
             session_id = f"session_{user_id}_{datetime.utcnow().timestamp()}"
             return session_id
         except Exception as e:
-            print(f"Session creation failed: {e}")
+            logger.error("Session creation failed: %s", e)
             return ""
 
     def update_user_last_login(self, user_id: str) -> bool:
@@ -289,7 +317,7 @@ class SupabaseAuthService:
             self.db.update_user(user_id, {"last_login": datetime.utcnow().isoformat()})
             return True
         except Exception as e:
-            print(f"Last login update failed: {e}")
+            logger.error("Last login update failed: %s", e)
             return False
 
     def sign_in(self, email: str, password: str) -> Dict:
@@ -314,6 +342,7 @@ class SupabaseAuthService:
                 self.db.update_user(
                     auth_response.user.id, {"last_login": datetime.utcnow().isoformat()}
                 )
+                self.invalidate_user(auth_response.user.id)
 
                 return {
                     "access_token": auth_response.session.access_token,
@@ -426,8 +455,11 @@ class SupabaseAuthService:
                 detail=f"Authentication failed: {str(e)}",
             )
 
-    def update_user_profile(self, user_id: str, update_data: Dict) -> Dict:
-        """Kullanıcı profilini güncelle"""
+    def update_user_profile(
+        self, user_id: str, update_data: Dict = None, **fields
+    ) -> Dict:
+        """Kullanıcı profilini güncelle (dict veya keyword alanlarla)"""
+        update_data = {**(update_data or {}), **fields}
         try:
             # Email güncelleniyorsa Supabase Auth'da da güncelle
             if "email" in update_data:
@@ -436,13 +468,14 @@ class SupabaseAuthService:
                     self.auth.admin.update_user_by_id(
                         user_id, {"email": update_data["email"]}
                     )
-                    print(f"✅ Supabase Auth email updated for user {user_id}")
+                    logger.info("✅ Supabase Auth email updated for user %s", user_id)
                 except Exception as auth_error:
-                    print(f"⚠️ Supabase Auth email update failed: {auth_error}")
+                    logger.warning("⚠️ Supabase Auth email update failed: %s", auth_error)
                     # Auth güncelleme başarısız olsa da devam et
 
             # Profil verilerini güncelle
             updated_user = self.db.update_user(user_id, update_data)
+            self.invalidate_user(user_id)
 
             if updated_user:
                 return {"message": "Profile updated successfully", "user": updated_user}
@@ -524,7 +557,7 @@ class SupabaseAuthService:
             return []
 
         except Exception as e:
-            print(f"Session retrieval failed: {e}")
+            logger.error("Session retrieval failed: %s", e)
             return []
 
     def revoke_session(self, session_id: str) -> Dict:
@@ -546,125 +579,40 @@ class SupabaseAuthService:
         try:
             return self.db.get_user_stats(user_id)
         except Exception as e:
-            print(f"Stats retrieval failed: {e}")
+            logger.error("Stats retrieval failed: %s", e)
             return {}
 
     def verify_token(self, token: str) -> Optional[Dict]:
         """JWT token'ı doğrula ve kullanıcı bilgilerini getir"""
         try:
-            print(f"🔍 Verifying token: {token[:50]}...")
-            print(f"🔍 Full token length: {len(token)}")
-            print(f"🔍 Token parts count: {len(token.split('.'))}")
-
-            # Manuel JWT decode (Supabase client hatası nedeniyle)
-            import base64
-            import json
-
-            # Token'ı parçalara ayır
-            parts = token.split(".")
-            print(f"🔍 Token parts: {[p[:20] + '...' for p in parts]}")
-
-            if len(parts) != 3:
-                print(f"❌ Invalid JWT format - Expected 3 parts, got {len(parts)}")
+            # Aynı token yakın zamanda doğrulandıysa DB'ye gitme
+            cached = self.token_cache.get(token)
+            if cached is not None:
+                return cached
+
+            # İmza ve süre kontrolü process içinde; geçersiz token'lar I/O'suz reddedilir
+            payload = self.verifier.verify(token)
+            if payload is None:
                 return None
 
-            # Payload'ı decode et
-            payload_b64 = parts[1]
-            print(f"🔍 Payload B64: {payload_b64[:30]}...")
-
-            # Base64 padding ekle
-            padding = 4 - (len(payload_b64) % 4)
-            if padding != 4:
-                payload_b64 += "=" * padding
-                print(f"🔍 Added padding: {padding} characters")
-
-            try:
-                print(f"🔍 Attempting to decode: {payload_b64[:30]}...")
-                payload_bytes = base64.urlsafe_b64decode(payload_b64)
-                payload_str = payload_bytes.decode("utf-8")
-                print(f"🔍 Raw payload string: {payload_str[:100]}...")
-                print(f"🔍 Full payload string: {payload_str}")
-
-                # JSON parse hatasını detaylı göster
-                try:
-                    payload = json.loads(payload_str)
-                    print(f"🔍 Decoded payload: {payload}")
-                except json.JSONDecodeError as json_error:
-                    print(f"❌ JSON parse error: {json_error}")
-                    print(
-                        f"❌ Error at line {json_error.lineno}, column {json_error.colno}"
-                    )
-                    print(f"❌ Error message: {json_error.msg}")
-                    print(
-                        f"❌ Problematic part: {payload_str[max(0, json_error.pos-20):json_error.pos+20]}"
-                    )
-
-                    # JSON'ı otomatik olarak düzeltmeye çalış
-                    print(f"🔧 Attempting to fix JSON...")
-                    try:
-                        # Eksik süslü parantezleri ekle
-                        fixed_payload_str = payload_str
-
-                        # Süslü parantez sayısını kontrol et
-                        open_braces = fixed_payload_str.count("{")
-                        close_braces = fixed_payload_str.count("}")
-
-                        print(
-                            f"🔍 Open braces: {open_braces}, Close braces: {close_braces}"
-                        )
-
-                        # Eksik süslü parantezleri ekle
-                        while close_braces < open_braces:
-                            fixed_payload_str += "}"
-                            close_braces += 1
-                            print(f"🔧 Added missing closing brace, now: {close_braces}")
-
-                        # Düzeltilmiş JSON'ı parse et
-                        payload = json.loads(fixed_payload_str)
-                        print(f"✅ JSON fixed successfully: {payload}")
-
-                    except Exception as fix_error:
-                        print(f"❌ Failed to fix JSON: {fix_error}")
-                        return None
-
-            except Exception as decode_error:
-                print(f"❌ Payload decode error: {decode_error}")
-                print(f"❌ Payload B64: {payload_b64}")
-                print(f"❌ Payload length: {len(payload_b64)}")
-                return None
-
-            # User ID'yi al
-            user_id = payload.get("sub")
-            if not user_id:
-                print("❌ No user ID in payload")
+            user_id = payload["sub"]
+            user_profile = self.get_user_by_id(user_id)
+            if not user_profile:
+                logger.error("❌ User profile not found in database: %s", user_id)
                 return None
 
-            print(f"🔍 User ID from payload: {user_id}")
-
-            # Kullanıcı profilini getir
-            user_profile = self.db.get_user_by_id(user_id)
-            print(f"🔍 User profile: {user_profile}")
-
-            if user_profile:
-                result = {
-                    "sub": user_id,
-                    "user_id": user_id,
-                    "email": payload.get("email", ""),
-                    "email_confirmed_at": payload.get("email_confirmed_at"),
-                    "profile": user_profile,
-                }
-                print(f"🔍 Returning result: {result}")
-                return result
-            else:
-                print("❌ User profile not found in database")
-                return None
+            result = {
+                "sub": user_id,
+                "user_id": user_id,
+                "email": payload.get("email", ""),
+                "email_confirmed_at": payload.get("email_confirmed_at"),
+                "profile": user_profile,
+            }
+            self.token_cache.set(token, result, exp=payload.get("exp"))
+            return result
 
         except Exception as e:
-            print(f"❌ Token verification failed: {e}")
-            print(f"❌ Exception type: {type(e)}")
-            import traceback
-
-            traceback.print_exc()
+            logger.error("❌ Token verification failed: %s", e)
             return None
 
     def delete_user(self, user_id: str) -> bool:
@@ -672,16 +620,17 @@ class SupabaseAuthService:
         try:
             # Önce veritabanından kullanıcı profilini sil
             self.db.delete_user(user_id)
+            self.invalidate_user(user_id)
 
             # Supabase Auth'dan kullanıcıyı sil (Admin API gerekli)
             # Not: Bu işlem için Supabase Admin API kullanılmalı
             # Şimdilik sadece veritabanından siliyoruz
 
-            print(f"✅ User {user_id} deleted successfully")
+            logger.info("✅ User %s deleted successfully", user_id)
             return True
 
         except Exception as e:
-            print(f"❌ Delete user failed: {e}")
+            logger.error("❌ Delete user failed: %s", e)
             return False
 
     def cleanup_expired_sessions(self) -> Dict:
@@ -690,7 +639,7 @@ class SupabaseAuthService:
             # Supabase Auth otomatik olarak süresi dolmuş oturumları temizler
             return {"message": "Session cleanup completed"}
         except Exception as e:
-            print(f"Session cleanup failed: {e}")
+            logger.error("Session cleanup failed: %s", e)
             return {"message": "Session cleanup failed"}
 
 
@@ -4,11 +4,12 @@ Lead Discovery API için Supabase veritabanı ve authentication yapılandırmas
 """
 
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from dotenv import load_dotenv
 
-from supabase import Client, create_client
+if TYPE_CHECKING:
+    from supabase import Client
 
 # Load environment variables
 load_dotenv()
@@ -27,22 +28,36 @@ class SupabaseConfig:
                 "SUPABASE_URL ve SUPABASE_ANON_KEY environment variable'ları gerekli!"
             )
 
-        # Supabase client'ı oluştur
-        self.client: Client = create_client(self.supabase_url, self.supabase_anon_key)
+        # Client'lar ilk kullanımda oluşturulur: supabase paketi (gotrue,
+        # storage, realtime...) import süresini uzatır
+        self._client: Optional["Client"] = None
+        self._admin_client: Optional["Client"] = None
 
-        # Service role client (admin işlemleri için)
-        if self.supabase_service_role_key:
-            self.admin_client: Client = create_client(
+    @property
+    def client(self) -> "Client":
+        """Normal Supabase client'ı (ilk erişimde oluşturulur)"""
+        if self._client is None:
+            from supabase import create_client
+
+            self._client = create_client(self.supabase_url, self.supabase_anon_key)
+        return self._client
+
+    @property
+    def admin_client(self) -> Optional["Client"]:
+        """Service role client'ı (admin işlemleri için, varsa)"""
+        if self._admin_client is None and self.supabase_service_role_key:
+            from supabase import create_client
+
+            self._admin_client = create_client(
                 self.supabase_url, self.supabase_service_role_key
             )
-        else:
-            self.admin_client = None
+        return self._admin_client
 
-    def get_client(self) -> Client:
+    def get_client(self) -> "Client":
         """Normal Supabase client'ı döndür"""
         return self.client
 
-    def get_admin_client(self) -> Optional[Client]:
+    def get_admin_client(self) -> Optional["Client"]:
         """Admin Supabase client'ı döndür (varsa)"""
         return self.admin_client
 
@@ -79,6 +94,7 @@ SUPABASE_SERVICE_ROLE_KEY=your_supabase_service_role_key
 
 # JWT Configuration
 JWT_SECRET=your_jwt_secret_key
+SUPABASE_JWT_SECRET=your_supabase_project_jwt_secret
 JWT_ALGORITHM=HS256
 ACCESS_TOKEN_EXPIRE_MINUTES=30
 REFRESH_TOKEN_EXPIRE_DAYS=7
@@ -3,58 +3,366 @@ Supabase Database Manager
 Lead Discovery API için Supabase veritabanı yönetimi
 """
 
+import asyncio
+import base64
 import json
+import logging
 import os
+import re
+from collections import Counter
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from postgrest import APIError, AsyncPostgrestClient
+
+from metrics import track_db_query
 from supabase_config import supabase_config
 
+logger = logging.getLogger(__name__)
+
+# Kolon projeksiyonu: None/"*" tüm kolonlar, aksi halde "a,b" veya ["a", "b"]
+Columns = Optional[Union[str, Sequence[str]]]
+
+_COLUMN_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Startup'ta varlığı kontrol edilen tablolar
+PROBE_TABLES = ("users", "collected_leads", "pipeline")
+
+# Bulk mutasyon parça sınırları (URL uzunluğu ve istek gövdesi)
+BULK_MAX_URL_CHARS = int(os.getenv("BULK_MAX_URL_CHARS", "6000"))
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "500"))
+BULK_MAX_BODY_BYTES = int(os.getenv("BULK_MAX_BODY_BYTES", "1000000"))
+
+
+def select_columns(columns: Columns = None) -> str:
+    """Kolon listesini PostgREST select ifadesine çevir"""
+    if not columns:
+        return "*"
+    if isinstance(columns, str):
+        return columns
+    return ",".join(columns)
+
+
+def parse_fields(fields: Optional[str], required: Sequence[str] = ("id",)) -> Columns:
+    """`?fields=a,b` parametresini doğrulanmış kolon listesine çevir"""
+    if not fields:
+        return None
+
+    columns = [column.strip() for column in fields.split(",") if column.strip()]
+    invalid = [column for column in columns if not _COLUMN_NAME.match(column)]
+    if invalid:
+        raise ValueError(f"Invalid field name(s): {', '.join(invalid)}")
+
+    return [column for column in required if column not in columns] + columns
+
+
+def _apply_filters(query, filters: Dict = None):
+    """Eşitlik (liste için IN) filtrelerini uygula"""
+    if filters:
+        for key, value in filters.items():
+            if isinstance(value, (list, tuple)):
+                query = query.in_(key, value)
+            else:
+                query = query.eq(key, value)
+    return query
+
+
+def _build_count_query(table, filters: Dict = None):
+    """Satır döndürmeyen (HEAD) exact count sorgusu"""
+    return _apply_filters(table.select("id", count="exact", head=True), filters)
+
+
+def _build_aggregate_query(table, group_by: str, filters: Dict = None):
+    """PostgREST aggregate ile gruplu count sorgusu (`select=status,count()`)"""
+    return _apply_filters(table.select(f"{group_by},count()"), filters)
+
+
+def _aggregate_rows_to_counts(rows: List[Dict], group_by: str) -> Dict[str, int]:
+    return {row.get(group_by): int(row.get("count", 0)) for row in rows}
+
+
+def _build_query(
+    table,
+    query_type: str,
+    filters: Dict = None,
+    data: Dict = None,
+    limit: int = None,
+    order_by: str = None,
+    columns: Columns = None,
+):
+    """Sync ve async tablo builder'ları için ortak sorgu oluşturucu"""
+    if query_type == "select":
+        query = _apply_filters(table.select(select_columns(columns)), filters)
+
+        # Sıralama
+        if order_by:
+            query = query.order(order_by)
+
+        # Limit
+        if limit:
+            query = query.limit(limit)
+
+        return query
+
+    if query_type == "insert":
+        return table.insert(data)
+
+    if query_type == "update":
+        query = table.update(data)
+    elif query_type == "delete":
+        query = table.delete()
+    else:
+        raise ValueError(f"Unsupported query type: {query_type}")
+
+    # Filtreleri uygula
+    if filters:
+        for key, value in filters.items():
+            query = query.eq(key, value)
+
+    return query
+
+
+def encode_cursor(row: Dict) -> str:
+    """Satırın (created_at, id) anahtarını opak cursor'a çevir"""
+    raw = json.dumps([row.get("created_at"), row.get("id")], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[str], str]:
+    """Cursor'ı (created_at, id) çiftine çevir (created_at null ise None)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if created_at == "" or not row_id:
+        raise ValueError("Invalid cursor")
+    return (None if created_at is None else str(created_at)), str(row_id)
+
+
+def _quote_filter_value(value: str) -> str:
+    """PostgREST or=() filtresi için değeri tırnakla"""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _build_page_query(
+    table,
+    filters: Dict = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    columns: Columns = None,
+):
+    """(created_at, id) azalan sırada keyset sayfa sorgusu (limit + 1 satır)
+
+    created_at null olan satırlar en sonda, kendi içinde id'ye göre gelir.
+    """
+    if select_columns(columns) != "*":
+        columns = select_columns(columns).split(",")
+        columns += [c for c in ("created_at", "id") if c not in columns]
+
+    query = _build_query(table, "select", filters, columns=columns)
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        if created_at is None:
+            # Null'lar sıralamanın sonunda: yalnızca kalan null satırlar
+            query = query.is_("created_at", "null").lt("id", row_id)
+        else:
+            created_at, row_id = map(_quote_filter_value, (created_at, row_id))
+            query = query.or_(
+                f"created_at.lt.{created_at},"
+                f"and(created_at.eq.{created_at},id.lt.{row_id}),"
+                "created_at.is.null"
+            )
+    return (
+        query.order("created_at", desc=True, nullsfirst=False)
+        .order("id", desc=True)
+        .limit(limit + 1)
+    )
+
+
+def _split_page(rows: List[Dict], limit: int) -> Tuple[List[Dict], Optional[str]]:
+    """Fazladan getirilen satıra göre sayfayı ve next_cursor'ı ayır"""
+    if len(rows) > limit:
+        page = rows[:limit]
+        return page, encode_cursor(page[-1])
+    return rows, None
+
+
+def _chunk_values(
+    values: Iterable, max_chars: int = BULK_MAX_URL_CHARS
+) -> Iterator[List]:
+    """IN listesi değerlerini URL uzunluğu sınırına göre parçala"""
+    chunk, size = [], 0
+    for value in values:
+        # Tırnak, virgül ve URL encoding payı
+        length = len(str(value)) * 3 + 3
+        if chunk and size + length > max_chars:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(value)
+        size += length
+    if chunk:
+        yield chunk
+
+
+def _chunk_rows(
+    rows: Iterable[Dict],
+    max_rows: int = BULK_MAX_ROWS,
+    max_bytes: int = BULK_MAX_BODY_BYTES,
+) -> Iterator[List[Dict]]:
+    """Satırları satır sayısı ve JSON gövde boyutu sınırına göre parçala"""
+    chunk, size = [], 0
+    for row in rows:
+        length = len(json.dumps(row, default=str)) + 1
+        if chunk and (len(chunk) >= max_rows or size + length > max_bytes):
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(row)
+        size += length
+    if chunk:
+        yield chunk
+
+
+def _build_insert_many(table, rows: List[Dict]):
+    """Çok satırlı insert; eksik kolonlar DB default'unu alır"""
+    return table.insert(
+        rows, count="exact", returning="minimal", default_to_null=False
+    )
+
+
+def _build_delete_in(table, column: str, values: List):
+    return table.delete(count="exact", returning="minimal").in_(column, values)
+
+
+def _build_delete_not_in(table, column: str, values: List, include_nulls: bool):
+    """NOT IN silme; include_nulls ile kolonu NULL olan satırlar da silinir"""
+    if len(list(_chunk_values(values))) > 1:
+        raise ValueError("NOT IN value list exceeds URL budget and cannot be chunked")
+
+    query = table.delete(count="exact", returning="minimal")
+    if include_nulls:
+        quoted = ",".join(_quote_filter_value(str(value)) for value in values)
+        return query.or_(f"{column}.is.null,{column}.not.in.({quoted})")
+    return query.not_.in_(column, values)
+
+
+def _build_delete_all(table):
+    """Tüm satırları sil (PostgREST filtresiz DELETE'e izin vermez)"""
+    return table.delete(count="exact", returning="minimal").not_.is_("id", "null")
+
+
+def _build_update_in(table, column: str, values: List, data: Dict):
+    return table.update(data, count="exact", returning="minimal").in_(column, values)
+
+
+def _prepare_tender_insert(tender_data: Dict) -> tuple:
+    """Tender insert verisini hazırla, (veri, language) döndür"""
+    # Language kolonunu geçici olarak çıkar (database'de yok)
+    tender_data_copy = tender_data.copy()
+    language = tender_data_copy.pop('language', 'en')  # Language'i sakla ama database'e gönderme
+
+    # Boş deadline field'larını None yap
+    if 'deadline' in tender_data_copy and not tender_data_copy['deadline']:
+        tender_data_copy['deadline'] = None
+    tender_data_copy["created_at"] = datetime.now().isoformat()
+    tender_data_copy["updated_at"] = datetime.now().isoformat()
+    return tender_data_copy, language
+
+
+def _prepare_tender_upsert(tender_data: Dict) -> tuple:
+    """Tender upsert verisini hazırla, (veri, language) döndür
+
+    created_at gönderilmez: yeni kayıtta DB default'u kullanılır, mevcut
+    kayıtta korunur.
+    """
+    tender_data_copy, language = _prepare_tender_insert(tender_data)
+    tender_data_copy.pop("created_at", None)
+    tender_data_copy.pop("id", None)
+    return tender_data_copy, language
+
+
+# ON CONFLICT için unique constraint yoksa PostgreSQL bu kodu döndürür
+_NO_UNIQUE_CONSTRAINT = "42P10"
+
+
+def _build_upsert_query(table, data, on_conflict: str):
+    """Tek istekte insert-or-update (merge-duplicates, representation döner)"""
+    return table.upsert(data, on_conflict=on_conflict, returning="representation")
+
+
+def _prepare_tender_update(update_data: Dict) -> Dict:
+    """Tender update verisini hazırla"""
+    # Language kolonunu geçici olarak çıkar (database'de yok)
+    update_data_copy = update_data.copy()
+    update_data_copy.pop('language', None)
+
+    update_data_copy["updated_at"] = datetime.now().isoformat()
+    # Fix empty deadline
+    if "deadline" in update_data_copy and update_data_copy["deadline"] == "":
+        update_data_copy["deadline"] = None
+    return update_data_copy
+
+
+def _build_probe_query(table):
+    """Tablonun varlığını en ucuz şekilde yokla (tek id, satır gövdesi yok)"""
+    return table.select("id").limit(1)
+
+
+def _report_missing_table(table_name: str, error: Exception):
+    logger.warning("⚠️  %s tablosu bulunamadı: %s", table_name, error)
+    logger.info(
+        "📝 Supabase Dashboard'dan %s tablosunu oluşturmanız gerekebilir", table_name
+    )
+
+
+def _report_tables(results: Dict[str, bool]):
+    present = [name for name, ok in results.items() if ok]
+    if present:
+        logger.info("✅ Supabase tabloları mevcut: %s", ', '.join(present))
+
 
 class SupabaseDatabaseManager:
     """Supabase veritabanı yöneticisi"""
 
     def __init__(self):
-        self.client = supabase_config.get_client()
-        self.admin_client = supabase_config.get_admin_client()
-        self.init_database()
+        # PostgREST aggregate (count()) desteği ilk denemede belirlenir
+        self._aggregates_supported: Optional[bool] = None
 
-    def init_database(self):
-        """Veritabanı tablolarını kontrol et ve gerekirse oluştur"""
-        # Supabase'de tablolar otomatik olarak oluşturulur
-        # Bu metod sadece tablo yapısını kontrol eder
-        print("🔍 Supabase tabloları kontrol ediliyor...")
+    @property
+    def client(self):
+        """Paylaşılan Supabase client'ı (ilk kullanımda oluşturulur)"""
+        return supabase_config.get_client()
 
-        # Test sorgusu ile tabloların varlığını kontrol et
-        try:
-            # Users tablosu kontrolü
-            result = self.client.table("users").select("id").limit(1).execute()
-            print("✅ Users tablosu mevcut")
-        except Exception as e:
-            print(f"⚠️  Users tablosu bulunamadı: {e}")
-            print("📝 Supabase Dashboard'dan tabloları oluşturmanız gerekebilir")
-
-        try:
-            # Collected leads tablosu kontrolü
-            result = (
-                self.client.table("collected_leads").select("id").limit(1).execute()
-            )
-            print("✅ Collected leads tablosu mevcut")
-        except Exception as e:
-            print(f"⚠️  Collected leads tablosu bulunamadı: {e}")
-            print(
-                "📝 Supabase Dashboard'dan collected_leads tablosunu oluşturmanız gerekebilir"
-            )
+    @property
+    def admin_client(self):
+        """Service role client'ı (varsa)"""
+        return supabase_config.get_admin_client()
 
-        try:
-            # Pipeline tablosu kontrolü
-            result = self.client.table("pipeline").select("id").limit(1).execute()
-            print("✅ Pipeline tablosu mevcut")
-        except Exception as e:
-            print(f"⚠️  Pipeline tablosu bulunamadı: {e}")
-            print(
-                "📝 Supabase Dashboard'dan pipeline tablosunu oluşturmanız gerekebilir"
-            )
+    def init_database(self) -> Dict[str, bool]:
+        """Veritabanı tablolarını kontrol et (bloklayan; script'ler için)"""
+        # Supabase'de tablolar otomatik olarak oluşturulur
+        # Bu metod sadece tablo yapısını kontrol eder
+        logger.info("🔍 Supabase tabloları kontrol ediliyor...")
+        results = {}
+        for table_name in PROBE_TABLES:
+            try:
+                _build_probe_query(self.client.table(table_name)).execute()
+                results[table_name] = True
+            except Exception as e:
+                results[table_name] = False
+                _report_missing_table(table_name, e)
+        _report_tables(results)
+        return results
 
     def execute_query(
         self,
@@ -64,104 +372,216 @@ class SupabaseDatabaseManager:
         data: Dict = None,
         limit: int = None,
         order_by: str = None,
+        columns: Columns = None,
     ) -> List[Dict]:
         """Supabase sorgusu çalıştır"""
         try:
             table = self.client.table(table_name)
+            query = _build_query(
+                table, query_type, filters, data, limit, order_by, columns
+            )
 
-            if query_type == "select":
-                query = table.select("*")
-
-                # Filtreleri uygula
-                if filters:
-                    for key, value in filters.items():
-                        if isinstance(value, (list, tuple)):
-                            query = query.in_(key, value)
-                        else:
-                            query = query.eq(key, value)
-
-                # Sıralama
-                if order_by:
-                    query = query.order(order_by)
-
-                # Limit
-                if limit:
-                    query = query.limit(limit)
-
-                result = query.execute()
-                return result.data
-
-            elif query_type == "insert":
-                print(f"🔍 INSERT işlemi: {table_name} tablosuna veri ekleniyor...")
-                print(f"📝 Eklenen veri: {data}")
+            if query_type == "insert":
+                logger.debug(
+                    "🔍 INSERT işlemi: %s tablosuna veri ekleniyor...", table_name
+                )
+                logger.debug("📝 Eklenen veri: %s", data)
 
                 # Insert işleminden sonra eklenen veriyi döndür
-                result = table.insert(data).execute()
-
-                print(f"📊 Insert sonucu: {result}")
-                print(f"📊 Result.data: {result.data}")
-                print(
-                    f"📊 Result.count: {result.count if hasattr(result, 'count') else 'N/A'}"
+                with track_db_query(table_name, query_type):
+                    result = query.execute()
+
+                logger.debug("📊 Insert sonucu: %s", result)
+                logger.debug("📊 Result.data: %s", result.data)
+                logger.debug(
+                    "📊 Result.count: %s",
+                    result.count if hasattr(result, 'count') else 'N/A',
                 )
 
                 # Eğer data varsa, eklenen veriyi döndür
                 if result.data:
-                    print(f"✅ Veri başarıyla eklendi: {result.data}")
+                    logger.debug("✅ Veri başarıyla eklendi: %s", result.data)
                     return result.data
                 else:
                     # Eğer data yoksa, boş liste döndür
-                    print(f"⚠️ Insert sonucu boş data döndü")
+                    logger.warning("⚠️ Insert sonucu boş data döndü")
                     return []
 
-            elif query_type == "update":
-                query = table.update(data)
+            with track_db_query(table_name, query_type):
+                result = query.execute()
+            return result.data
 
-                # Filtreleri uygula
-                if filters:
-                    for key, value in filters.items():
-                        query = query.eq(key, value)
+        except Exception as e:
+            logger.error("❌ Database sorgu hatası: %s", e)
+            return []
 
+    def get_page(
+        self,
+        table_name: str,
+        filters: Dict = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        columns: Columns = None,
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """Keyset sayfası getir, (satırlar, next_cursor) döndür
+
+        Geçersiz cursor için ValueError fırlatır.
+        """
+        query = _build_page_query(
+            self.client.table(table_name), filters, limit, cursor, columns
+        )
+        try:
+            with track_db_query(table_name, "page"):
                 result = query.execute()
-                return result.data
+            return _split_page(result.data or [], limit)
+        except Exception as e:
+            logger.error("❌ Database sayfa sorgu hatası (%s): %s", table_name, e)
+            return [], None
 
-            elif query_type == "delete":
-                query = table.delete()
+    def iter_pages(
+        self,
+        table_name: str,
+        filters: Dict = None,
+        page_size: int = 500,
+        columns: Columns = None,
+    ):
+        """Tablonun tüm satırlarını sayfa sayfa gez"""
+        cursor = None
+        while True:
+            rows, cursor = self.get_page(table_name, filters, page_size, cursor, columns)
+            yield from rows
+            if not cursor:
+                break
+
+    # Bulk mutasyonlar: parça başına tek istek, etkilenen satır sayısını döndürür.
+    # Hata durumunda APIError fırlatır.
+    def insert_many(self, table_name: str, rows: Iterable[Dict]) -> int:
+        """Satırları parçalar halinde toplu ekle"""
+        inserted = 0
+        for chunk in _chunk_rows(rows):
+            result = _build_insert_many(self.client.table(table_name), chunk).execute()
+            inserted += result.count or 0
+        return inserted
+
+    def delete_where_in(self, table_name: str, column: str, values: Iterable) -> int:
+        """column IN (values) olan satırları toplu sil"""
+        deleted = 0
+        for chunk in _chunk_values(values):
+            query = _build_delete_in(self.client.table(table_name), column, chunk)
+            deleted += query.execute().count or 0
+        return deleted
+
+    def delete_where_not_in(
+        self,
+        table_name: str,
+        column: str,
+        values: Sequence,
+        include_nulls: bool = False,
+    ) -> int:
+        """column NOT IN (values) olan satırları tek istekte sil"""
+        query = _build_delete_not_in(
+            self.client.table(table_name), column, list(values), include_nulls
+        )
+        return query.execute().count or 0
+
+    def delete_all(self, table_name: str) -> int:
+        """Tablodaki tüm satırları sil"""
+        return _build_delete_all(self.client.table(table_name)).execute().count or 0
+
+    def update_where_in(
+        self, table_name: str, column: str, values: Iterable, data: Dict
+    ) -> int:
+        """column IN (values) olan satırlara aynı güncellemeyi uygula"""
+        updated = 0
+        for chunk in _chunk_values(values):
+            query = _build_update_in(self.client.table(table_name), column, chunk, data)
+            updated += query.execute().count or 0
+        return updated
+
+    def count_rows(self, table_name: str, filters: Dict = None) -> int:
+        """Satır sayısını sunucuda hesapla (satır indirmeden)"""
+        try:
+            query = _build_count_query(self.client.table(table_name), filters)
+            with track_db_query(table_name, "count"):
+                result = query.execute()
+            return result.count or 0
+        except Exception as e:
+            logger.error("❌ Database count hatası (%s): %s", table_name, e)
+            return 0
+
+    def count_grouped(
+        self, table_name: str, group_by: str, filters: Dict = None
+    ) -> Dict[str, int]:
+        """Kolona göre gruplu satır sayıları
+
+        PostgREST aggregate'leri kapalıysa yalnızca grup kolonunu sayfa sayfa
+        okuyarak sayar.
+        """
+        if self._aggregates_supported is not False:
+            try:
+                query = _build_aggregate_query(
+                    self.client.table(table_name), group_by, filters
+                )
+                rows = query.execute().data or []
+                self._aggregates_supported = True
+                return _aggregate_rows_to_counts(rows, group_by)
+            except Exception as e:
+                logger.warning(
+                    "⚠️ Aggregate count desteklenmiyor, tarama ile sayılıyor: %s", e
+                )
+                self._aggregates_supported = False
 
-                # Filtreleri uygula
-                if filters:
-                    for key, value in filters.items():
-                        query = query.eq(key, value)
+        counts = Counter(
+            row.get(group_by)
+            for row in self.iter_pages(table_name, filters, columns=group_by)
+        )
+        return dict(counts)
 
-                result = query.execute()
-                return result.data
+    def count_by_status(self, table_name: str, filters: Dict = None) -> Dict[str, int]:
+        """Status'a göre satır sayıları"""
+        return self.count_grouped(table_name, "status", filters)
 
-        except Exception as e:
-            print(f"❌ Database sorgu hatası: {e}")
-            return []
+    def count_by_user(
+        self, table_name: str, user_column: str = "user_id", filters: Dict = None
+    ) -> Dict[str, int]:
+        """Kullanıcıya göre satır sayıları"""
+        return self.count_grouped(table_name, user_column, filters)
 
-    def get_users(self, filters: Dict = None, limit: int = None) -> List[Dict]:
+    def get_users(
+        self, filters: Dict = None, limit: int = None, columns: Columns = None
+    ) -> List[Dict]:
         """Kullanıcıları getir"""
-        return self.execute_query("users", "select", filters, limit=limit)
+        return self.execute_query(
+            "users", "select", filters, limit=limit, columns=columns
+        )
 
-    def get_user_by_id(self, user_id: str) -> Optional[Dict]:
+    def get_user_by_id(self, user_id: str, columns: Columns = None) -> Optional[Dict]:
         """ID ile kullanıcı getir"""
-        result = self.execute_query("users", "select", {"id": user_id}, limit=1)
+        result = self.execute_query(
+            "users", "select", {"id": user_id}, limit=1, columns=columns
+        )
         return result[0] if result else None
 
-    def get_user_by_email(self, email: str) -> Optional[Dict]:
+    def get_user_by_email(self, email: str, columns: Columns = None) -> Optional[Dict]:
         """Email ile kullanıcı getir"""
-        result = self.execute_query("users", "select", {"email": email}, limit=1)
+        result = self.execute_query(
+            "users", "select", {"email": email}, limit=1, columns=columns
+        )
         return result[0] if result else None
 
-    def get_user_by_username(self, username: str) -> Optional[Dict]:
+    def get_user_by_username(
+        self, username: str, columns: Columns = None
+    ) -> Optional[Dict]:
         """Username ile kullanıcı getir"""
-        result = self.execute_query("users", "select", {"username": username}, limit=1)
+        result = self.execute_query(
+            "users", "select", {"username": username}, limit=1, columns=columns
+        )
         return result[0] if result else None
 
     def create_user(self, user_data: Dict) -> Optional[Dict]:
         """Yeni kullanıcı oluştur"""
         # Email kontrolü
-        if self.get_user_by_email(user_data["email"]):
+        if self.get_user_by_email(user_data["email"], columns="id"):
             raise ValueError("Email already registered")
 
         result = self.execute_query("users", "insert", data=user_data)
@@ -195,9 +615,13 @@ class SupabaseDatabaseManager:
         )
         return result[0] if result else None
 
-    def get_pipeline(self, filters: Dict = None, limit: int = None) -> List[Dict]:
+    def get_pipeline(
+        self, filters: Dict = None, limit: int = None, columns: Columns = None
+    ) -> List[Dict]:
         """Pipeline verilerini getir"""
-        return self.execute_query("pipeline", "select", filters, limit=limit)
+        return self.execute_query(
+            "pipeline", "select", filters, limit=limit, columns=columns
+        )
 
     def create_pipeline_entry(self, pipeline_data: Dict) -> Optional[Dict]:
         """Yeni pipeline girişi oluştur"""
@@ -213,10 +637,14 @@ class SupabaseDatabaseManager:
         )
         return result[0] if result else None
 
-    def get_chat_history(self, user_id: str = None, limit: int = None) -> List[Dict]:
+    def get_chat_history(
+        self, user_id: str = None, limit: int = None, columns: Columns = None
+    ) -> List[Dict]:
         """Chat geçmişini getir"""
         filters = {"user_id": user_id} if user_id else None
-        return self.execute_query("chat_history", "select", filters, limit=limit)
+        return self.execute_query(
+            "chat_history", "select", filters, limit=limit, columns=columns
+        )
 
     def create_chat_entry(self, chat_data: Dict) -> Optional[Dict]:
         """Yeni chat girişi oluştur"""
@@ -262,10 +690,12 @@ class SupabaseDatabaseManager:
         return result[0] if result else None
 
     def get_collected_leads(
-        self, filters: Dict = None, limit: int = None
+        self, filters: Dict = None, limit: int = None, columns: Columns = None
     ) -> List[Dict]:
         """Toplanan lead'leri getir"""
-        return self.execute_query("collected_leads", "select", filters, limit=limit)
+        return self.execute_query(
+            "collected_leads", "select", filters, limit=limit, columns=columns
+        )
 
     def create_lead(self, lead_data: Dict) -> Optional[Dict]:
         """Yeni lead oluştur"""
@@ -292,13 +722,15 @@ class SupabaseDatabaseManager:
             )
             return result.data
         except Exception as e:
-            print(f"❌ Arama hatası: {e}")
+            logger.error("❌ Arama hatası: %s", e)
             # Fallback: basit filtreleme
             return self.get_companies(limit=limit)
 
     def get_user_stats(self, user_id: str) -> Dict:
         """Kullanıcı istatistiklerini getir"""
-        user = self.get_user_by_id(user_id)
+        user = self.get_user_by_id(
+            user_id, columns="api_calls_count,last_login,created_at"
+        )
         if not user:
             return {}
 
@@ -306,10 +738,10 @@ class SupabaseDatabaseManager:
         api_calls = user.get("api_calls_count", 0)
 
         # Chat geçmişi sayısı
-        chat_count = len(self.get_chat_history(user_id))
+        chat_count = self.count_rows("chat_history", {"user_id": user_id})
 
         # Pipeline girişi sayısı
-        pipeline_count = len(self.get_pipeline({"user_id": user_id}))
+        pipeline_count = self.count_rows("pipeline", {"user_id": user_id})
 
         return {
             "api_calls_count": api_calls,
@@ -319,63 +751,87 @@ class SupabaseDatabaseManager:
             "created_at": user.get("created_at"),
         }
 
-    def get_all_users(self) -> List[Dict]:
-        """Tüm kullanıcıları getir"""
+    def get_all_users(self, columns: Columns = None) -> List[Dict]:
+        """Tüm kullanıcıları getir (sayfalı okuma ile)"""
         try:
-            print(f"🔍 Getting all users from users table...")
-            result = self.client.table("users").select("*").execute()
-            print(f"🔍 Raw result: {result}")
-            print(f"🔍 Result data: {result.data}")
-            print(f"🔍 Result data type: {type(result.data)}")
-            print(f"🔍 Result data length: {len(result.data) if result.data else 0}")
-            return result.data if result.data else []
+            users = list(self.iter_pages("users", columns=columns))
+            logger.info("🔍 Loaded %s users from users table", len(users))
+            return users
         except Exception as e:
-            print(f"❌ Get all users failed: {e}")
+            logger.error("❌ Get all users failed: %s", e)
             import traceback
 
             traceback.print_exc()
             return []
 
-
     # Tender Methods
     def create_tender(self, tender_data: Dict) -> Optional[Dict]:
         """Yeni tender oluştur"""
-        # Language kolonunu geçici olarak çıkar (database'de yok)
-        tender_data_copy = tender_data.copy()
-        language = tender_data_copy.pop('language', 'en')  # Language'i sakla ama database'e gönderme
-        
-        # Boş deadline field'larını None yap
-        if 'deadline' in tender_data_copy and not tender_data_copy['deadline']:
-            tender_data_copy['deadline'] = None
-        tender_data_copy["created_at"] = datetime.now().isoformat()
-        tender_data_copy["updated_at"] = datetime.now().isoformat()
+        tender_data_copy, language = _prepare_tender_insert(tender_data)
         result = self.execute_query("tenders", "insert", data=tender_data_copy)
-        
+
         # Sonucu dönerken language'i geri ekle
         if result and len(result) > 0:
             result[0]['language'] = language
             return result[0]
         return None
 
-    def get_tenders(self, filters: Dict = None, limit: int = None) -> List[Dict]:
+    def upsert(self, table_name: str, data, on_conflict: str) -> List[Dict]:
+        """Insert-or-update tek round trip (APIError fırlatır)"""
+        query = _build_upsert_query(self.client.table(table_name), data, on_conflict)
+        return query.execute().data or []
+
+    def upsert_tender(self, tender_data: Dict) -> Optional[Dict]:
+        """deal_id'ye göre tender'ı tek istekte oluştur veya güncelle"""
+        tender_data_copy, language = _prepare_tender_upsert(tender_data)
+        try:
+            result = self.upsert("tenders", tender_data_copy, on_conflict="deal_id")
+        except APIError as e:
+            if e.code != _NO_UNIQUE_CONSTRAINT:
+                logger.error("❌ Tender upsert hatası: %s", e)
+                return None
+            logger.warning(
+                "⚠️ tenders.deal_id unique constraint yok, okuma+yazma ile kaydediliyor"
+            )
+            return self._save_tender_by_lookup(tender_data)
+        except Exception as e:
+            logger.error("❌ Tender upsert hatası: %s", e)
+            return None
+
+        if result:
+            result[0]["language"] = language
+            return result[0]
+        return None
+
+    def _save_tender_by_lookup(self, tender_data: Dict) -> Optional[Dict]:
+        """Unique constraint olmadan: deal_id ile bul, güncelle ya da oluştur"""
+        existing = self.get_tenders(
+            {"deal_id": tender_data["deal_id"]}, limit=1, columns="id"
+        )
+        if not existing:
+            return self.create_tender(tender_data)
+        if not self.update_tender(existing[0]["id"], tender_data):
+            return None
+        return self.get_tender(existing[0]["id"])
+
+    def get_tenders(
+        self, filters: Dict = None, limit: int = None, columns: Columns = None
+    ) -> List[Dict]:
         """Tender verilerini getir"""
-        return self.execute_query("tenders", "select", filters, limit=limit)
+        return self.execute_query(
+            "tenders", "select", filters, limit=limit, columns=columns
+        )
 
-    def get_tender(self, tender_id: str) -> Optional[Dict]:
+    def get_tender(self, tender_id: str, columns: Columns = None) -> Optional[Dict]:
         """Belirli bir tender'ı getir"""
-        result = self.execute_query("tenders", "select", {"id": tender_id})
+        result = self.execute_query(
+            "tenders", "select", {"id": tender_id}, limit=1, columns=columns
+        )
         return result[0] if result else None
 
     def update_tender(self, tender_id: str, update_data: Dict) -> bool:
         """Tender güncelle"""
-        # Language kolonunu geçici olarak çıkar (database'de yok)
-        update_data_copy = update_data.copy()
-        language = update_data_copy.pop('language', None)  # Language'i çıkar
-        
-        update_data_copy["updated_at"] = datetime.now().isoformat()
-        # Fix empty deadline
-        if "deadline" in update_data_copy and update_data_copy["deadline"] == "":
-            update_data_copy["deadline"] = None
+        update_data_copy = _prepare_tender_update(update_data)
         result = self.execute_query("tenders", "update", {"id": tender_id}, update_data_copy)
         return bool(result)
 
@@ -385,12 +841,417 @@ class SupabaseDatabaseManager:
         return bool(result)
 
 
+class AsyncSupabaseDatabaseManager:
+    """Asenkron Supabase veritabanı yöneticisi
+
+    FastAPI handler'ları için event loop'u bloklamayan PostgREST erişimi.
+    Tüm sorgular tek bir paylaşılan (keep-alive) HTTP client üzerinden gider.
+    """
+
+    def __init__(self, supabase_url: str = None, api_key: str = None):
+        self.supabase_url = supabase_url or (
+            supabase_config.supabase_url if supabase_config else os.getenv("SUPABASE_URL")
+        )
+        self.api_key = api_key or (
+            supabase_config.supabase_anon_key
+            if supabase_config
+            else os.getenv("SUPABASE_ANON_KEY")
+        )
+        self._client: Optional[AsyncPostgrestClient] = None
+        self._aggregates_supported: Optional[bool] = None
+
+    @property
+    def client(self) -> AsyncPostgrestClient:
+        """Paylaşılan async PostgREST client'ı (ilk kullanımda oluşturulur)"""
+        if self._client is None:
+            if not self.supabase_url or not self.api_key:
+                raise ValueError(
+                    "SUPABASE_URL ve SUPABASE_ANON_KEY environment variable'ları gerekli!"
+                )
+            self._client = AsyncPostgrestClient(
+                f"{self.supabase_url.rstrip('/')}/rest/v1",
+                headers={
+                    "apikey": self.api_key,
+                    "Authorization": f"Bearer {self.api_key}",
+                },
+            )
+        return self._client
+
+    async def init_database(self) -> Dict[str, bool]:
+        """Tabloları eşzamanlı yokla (startup'ta arka planda çalışır)"""
+        logger.info("🔍 Supabase tabloları kontrol ediliyor...")
+
+        async def probe(table_name: str) -> bool:
+            try:
+                await _build_probe_query(self.client.table(table_name)).execute()
+                return True
+            except Exception as e:
+                _report_missing_table(table_name, e)
+                return False
+
+        checks = await asyncio.gather(*(probe(name) for name in PROBE_TABLES))
+        results = dict(zip(PROBE_TABLES, checks))
+        _report_tables(results)
+        return results
+
+    async def aclose(self):
+        """HTTP bağlantılarını kapat (uygulama kapanışında)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def execute_query(
+        self,
+        table_name: str,
+        query_type: str = "select",
+        filters: Dict = None,
+        data: Dict = None,
+        limit: int = None,
+        order_by: str = None,
+        columns: Columns = None,
+    ) -> List[Dict]:
+        """Supabase sorgusu çalıştır (async)"""
+        try:
+            table = self.client.from_(table_name)
+            query = _build_query(
+                table, query_type, filters, data, limit, order_by, columns
+            )
+            with track_db_query(table_name, query_type):
+                result = await query.execute()
+            return result.data if result.data else []
+
+        except Exception as e:
+            logger.error(
+                "❌ Async database sorgu hatası (%s/%s): %s",
+                table_name,
+                query_type,
+                e,
+            )
+            return []
+
+    async def rpc(self, function_name: str, params: Dict = None) -> Any:
+        """Postgres fonksiyonu çağır (hata durumunda exception fırlatır)"""
+        with track_db_query(function_name, "rpc"):
+            result = await self.client.rpc(function_name, params or {}).execute()
+        return result.data
+
+    async def get_page(
+        self,
+        table_name: str,
+        filters: Dict = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        columns: Columns = None,
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """Keyset sayfası getir, (satırlar, next_cursor) döndür
+
+        Geçersiz cursor için ValueError fırlatır.
+        """
+        query = _build_page_query(
+            self.client.from_(table_name), filters, limit, cursor, columns
+        )
+        try:
+            with track_db_query(table_name, "page"):
+                result = await query.execute()
+            return _split_page(result.data or [], limit)
+        except Exception as e:
+            logger.error("❌ Async database sayfa sorgu hatası (%s): %s", table_name, e)
+            return [], None
+
+    async def iter_pages(
+        self,
+        table_name: str,
+        filters: Dict = None,
+        page_size: int = 500,
+        columns: Columns = None,
+    ):
+        """Tablonun tüm satırlarını sayfa sayfa gez"""
+        cursor = None
+        while True:
+            rows, cursor = await self.get_page(
+                table_name, filters, page_size, cursor, columns
+            )
+            for row in rows:
+                yield row
+            if not cursor:
+                break
+
+    # Bulk mutasyonlar: parça başına tek istek, etkilenen satır sayısını döndürür.
+    # Hata durumunda APIError fırlatır.
+    async def insert_many(self, table_name: str, rows: Iterable[Dict]) -> int:
+        """Satırları parçalar halinde toplu ekle"""
+        inserted = 0
+        for chunk in _chunk_rows(rows):
+            query = _build_insert_many(self.client.from_(table_name), chunk)
+            inserted += (await query.execute()).count or 0
+        return inserted
+
+    async def delete_where_in(
+        self, table_name: str, column: str, values: Iterable
+    ) -> int:
+        """column IN (values) olan satırları toplu sil"""
+        deleted = 0
+        for chunk in _chunk_values(values):
+            query = _build_delete_in(self.client.from_(table_name), column, chunk)
+            deleted += (await query.execute()).count or 0
+        return deleted
+
+    async def delete_where_not_in(
+        self,
+        table_name: str,
+        column: str,
+        values: Sequence,
+        include_nulls: bool = False,
+    ) -> int:
+        """column NOT IN (values) olan satırları tek istekte sil"""
+        query = _build_delete_not_in(
+            self.client.from_(table_name), column, list(values), include_nulls
+        )
+        return (await query.execute()).count or 0
+
+    async def delete_all(self, table_name: str) -> int:
+        """Tablodaki tüm satırları sil"""
+        query = _build_delete_all(self.client.from_(table_name))
+        return (await query.execute()).count or 0
+
+    async def update_where_in(
+        self, table_name: str, column: str, values: Iterable, data: Dict
+    ) -> int:
+        """column IN (values) olan satırlara aynı güncellemeyi uygula"""
+        updated = 0
+        for chunk in _chunk_values(values):
+            query = _build_update_in(
+                self.client.from_(table_name), column, chunk, data
+            )
+            updated += (await query.execute()).count or 0
+        return updated
+
+    async def count_rows(self, table_name: str, filters: Dict = None) -> int:
+        """Satır sayısını sunucuda hesapla (satır indirmeden)"""
+        try:
+            query = _build_count_query(self.client.from_(table_name), filters)
+            with track_db_query(table_name, "count"):
+                result = await query.execute()
+            return result.count or 0
+        except Exception as e:
+            logger.error("❌ Async database count hatası (%s): %s", table_name, e)
+            return 0
+
+    async def count_grouped(
+        self, table_name: str, group_by: str, filters: Dict = None
+    ) -> Dict[str, int]:
+        """Kolona göre gruplu satır sayıları
+
+        PostgREST aggregate'leri kapalıysa yalnızca grup kolonunu sayfa sayfa
+        okuyarak sayar.
+        """
+        if self._aggregates_supported is not False:
+            try:
+                query = _build_aggregate_query(
+                    self.client.from_(table_name), group_by, filters
+                )
+                rows = (await query.execute()).data or []
+                self._aggregates_supported = True
+                return _aggregate_rows_to_counts(rows, group_by)
+            except Exception as e:
+                logger.warning(
+                    "⚠️ Aggregate count desteklenmiyor, tarama ile sayılıyor: %s", e
+                )
+                self._aggregates_supported = False
+
+        counts = Counter()
+        async for row in self.iter_pages(table_name, filters, columns=group_by):
+            counts[row.get(group_by)] += 1
+        return dict(counts)
+
+    async def count_by_status(
+        self, table_name: str, filters: Dict = None
+    ) -> Dict[str, int]:
+        """Status'a göre satır sayıları"""
+        return await self.count_grouped(table_name, "status", filters)
+
+    async def count_by_user(
+        self, table_name: str, user_column: str = "user_id", filters: Dict = None
+    ) -> Dict[str, int]:
+        """Kullanıcıya göre satır sayıları"""
+        return await self.count_grouped(table_name, user_column, filters)
+
+    async def get_users(
+        self, filters: Dict = None, limit: int = None, columns: Columns = None
+    ) -> List[Dict]:
+        """Kullanıcıları getir"""
+        return await self.execute_query(
+            "users", "select", filters, limit=limit, columns=columns
+        )
+
+    async def get_user_by_id(
+        self, user_id: str, columns: Columns = None
+    ) -> Optional[Dict]:
+        """ID ile kullanıcı getir"""
+        result = await self.execute_query(
+            "users", "select", {"id": user_id}, limit=1, columns=columns
+        )
+        return result[0] if result else None
+
+    async def get_pipeline(
+        self, filters: Dict = None, limit: int = None, columns: Columns = None
+    ) -> List[Dict]:
+        """Pipeline verilerini getir"""
+        return await self.execute_query(
+            "pipeline", "select", filters, limit=limit, columns=columns
+        )
+
+    async def create_pipeline_entry(self, pipeline_data: Dict) -> Optional[Dict]:
+        """Yeni pipeline girişi oluştur"""
+        result = await self.execute_query("pipeline", "insert", data=pipeline_data)
+        return result[0] if result else None
+
+    async def update_pipeline_entry(
+        self, pipeline_id: str, update_data: Dict
+    ) -> Optional[Dict]:
+        """Pipeline girişi güncelle"""
+        result = await self.execute_query(
+            "pipeline", "update", {"id": pipeline_id}, data=update_data
+        )
+        return result[0] if result else None
+
+    async def delete_pipeline_entry(self, pipeline_id: str) -> bool:
+        """Pipeline girişi sil"""
+        result = await self.execute_query("pipeline", "delete", {"id": pipeline_id})
+        return len(result) > 0
+
+    async def get_chat_history(
+        self, user_id: str = None, limit: int = None, columns: Columns = None
+    ) -> List[Dict]:
+        """Chat geçmişini getir"""
+        filters = {"user_id": user_id} if user_id else None
+        return await self.execute_query(
+            "chat_history", "select", filters, limit=limit, columns=columns
+        )
+
+    async def create_chat_entry(self, chat_data: Dict) -> Optional[Dict]:
+        """Yeni chat girişi oluştur"""
+        result = await self.execute_query("chat_history", "insert", data=chat_data)
+        return result[0] if result else None
+
+    async def get_collected_leads(
+        self, filters: Dict = None, limit: int = None, columns: Columns = None
+    ) -> List[Dict]:
+        """Toplanan lead'leri getir"""
+        return await self.execute_query(
+            "collected_leads", "select", filters, limit=limit, columns=columns
+        )
+
+    async def create_lead(self, lead_data: Dict) -> Optional[Dict]:
+        """Yeni lead oluştur"""
+        result = await self.execute_query("collected_leads", "insert", data=lead_data)
+        return result[0] if result else None
+
+    async def update_lead(self, lead_id: str, update_data: Dict) -> Optional[Dict]:
+        """Lead güncelle"""
+        result = await self.execute_query(
+            "collected_leads", "update", {"id": lead_id}, data=update_data
+        )
+        return result[0] if result else None
+
+    async def delete_lead(self, lead_id: str) -> bool:
+        """Lead sil"""
+        result = await self.execute_query("collected_leads", "delete", {"id": lead_id})
+        return len(result) > 0
+
+    async def create_tender(self, tender_data: Dict) -> Optional[Dict]:
+        """Yeni tender oluştur"""
+        tender_data_copy, language = _prepare_tender_insert(tender_data)
+        result = await self.execute_query("tenders", "insert", data=tender_data_copy)
+
+        # Sonucu dönerken language'i geri ekle
+        if result:
+            result[0]["language"] = language
+            return result[0]
+        return None
+
+    async def upsert(self, table_name: str, data, on_conflict: str) -> List[Dict]:
+        """Insert-or-update tek round trip (APIError fırlatır)"""
+        query = _build_upsert_query(self.client.from_(table_name), data, on_conflict)
+        return (await query.execute()).data or []
+
+    async def upsert_tender(self, tender_data: Dict) -> Optional[Dict]:
+        """deal_id'ye göre tender'ı tek istekte oluştur veya güncelle"""
+        tender_data_copy, language = _prepare_tender_upsert(tender_data)
+        try:
+            result = await self.upsert(
+                "tenders", tender_data_copy, on_conflict="deal_id"
+            )
+        except APIError as e:
+            if e.code != _NO_UNIQUE_CONSTRAINT:
+                logger.error("❌ Async tender upsert hatası: %s", e)
+                return None
+            logger.warning(
+                "⚠️ tenders.deal_id unique constraint yok, okuma+yazma ile kaydediliyor"
+            )
+            return await self._save_tender_by_lookup(tender_data)
+        except Exception as e:
+            logger.error("❌ Async tender upsert hatası: %s", e)
+            return None
+
+        if result:
+            result[0]["language"] = language
+            return result[0]
+        return None
+
+    async def _save_tender_by_lookup(self, tender_data: Dict) -> Optional[Dict]:
+        """Unique constraint olmadan: deal_id ile bul, güncelle ya da oluştur"""
+        existing = await self.get_tenders(
+            {"deal_id": tender_data["deal_id"]}, limit=1, columns="id"
+        )
+        if not existing:
+            return await self.create_tender(tender_data)
+        if not await self.update_tender(existing[0]["id"], tender_data):
+            return None
+        return await self.get_tender(existing[0]["id"])
+
+    async def get_tenders(
+        self, filters: Dict = None, limit: int = None, columns: Columns = None
+    ) -> List[Dict]:
+        """Tender verilerini getir"""
+        return await self.execute_query(
+            "tenders", "select", filters, limit=limit, columns=columns
+        )
+
+    async def get_tender(
+        self, tender_id: str, columns: Columns = None
+    ) -> Optional[Dict]:
+        """Belirli bir tender'ı getir"""
+        result = await self.execute_query(
+            "tenders", "select", {"id": tender_id}, limit=1, columns=columns
+        )
+        return result[0] if result else None
+
+    async def update_tender(self, tender_id: str, update_data: Dict) -> bool:
+        """Tender güncelle"""
+        update_data_copy = _prepare_tender_update(update_data)
+        result = await self.execute_query(
+            "tenders", "update", {"id": tender_id}, update_data_copy
+        )
+        return bool(result)
+
+    async def delete_tender(self, tender_id: str) -> bool:
+        """Tender sil"""
+        result = await self.execute_query("tenders", "delete", {"id": tender_id})
+        return bool(result)
+
+
 # Global database instance
 db = SupabaseDatabaseManager()
 
+# Global async database instance (FastAPI handler'ları için)
+async_db = AsyncSupabaseDatabaseManager()
+
 if __name__ == "__main__":
     print("🔧 Supabase Database Manager test ediliyor...")
     try:
+        db.init_database()
+
         # Test bağlantısı
         users = db.get_users(limit=1)
         print(f"✅ Bağlantı başarılı! Kullanıcı sayısı: {len(users)}")
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Async Database Tests
+AsyncSupabaseDatabaseManager'ın PostgREST isteklerini event loop'u
+bloklamadan yaptığını sahte (mock) bir HTTP transport ile doğrular.
+"""
+
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import httpx
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+# Sahte Supabase ayarları (gerçek ağ çağrısı yapılmaz)
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+
+from supabase_database import (
+    AsyncSupabaseDatabaseManager,
+    _chunk_rows,
+    _chunk_values,
+    decode_cursor,
+    encode_cursor,
+    parse_fields,
+)
+
+
+def make_manager(handler) -> AsyncSupabaseDatabaseManager:
+    """Mock transport kullanan bir async manager oluştur"""
+    manager = AsyncSupabaseDatabaseManager("http://supabase.test", "test-anon-key")
+    client = manager.client
+    client.session = httpx.AsyncClient(
+        base_url="http://supabase.test/rest/v1",
+        headers=client.session.headers,
+        transport=httpx.MockTransport(handler),
+    )
+    return manager
+
+
+class TestAsyncSupabaseDatabaseManager(unittest.IsolatedAsyncioTestCase):
+    """Async data-access layer testleri"""
+
+    async def test_select_builds_postgrest_query(self):
+        """Test get_tender issues a filtered, limited GET"""
+        seen = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200, json=[{"id": "t1", "company_name": "Acme"}])
+
+        manager = make_manager(handler)
+        tender = await manager.get_tender("t1")
+        await manager.aclose()
+
+        self.assertEqual(tender["id"], "t1")
+        self.assertEqual(seen[0].method, "GET")
+        self.assertEqual(seen[0].url.path, "/rest/v1/tenders")
+        self.assertEqual(seen[0].url.params["id"], "eq.t1")
+        self.assertEqual(seen[0].url.params["limit"], "1")
+        self.assertEqual(seen[0].headers["apikey"], "test-anon-key")
+
+    async def test_columns_are_projected(self):
+        """Test columns= narrows the PostgREST select list"""
+        seen = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200, json=[])
+
+        manager = make_manager(handler)
+        await manager.get_tenders(columns=("id", "company_name"))
+        await manager.get_pipeline(limit=5, columns="id,status")
+        await manager.get_chat_history()
+        await manager.aclose()
+
+        self.assertEqual(seen[0].url.params["select"], "id,company_name")
+        self.assertEqual(seen[1].url.params["select"], "id,status")
+        self.assertEqual(seen[2].url.params["select"], "*")
+
+    async def test_keyset_pages(self):
+        """Test get_page orders by (created_at, id) and follows the cursor"""
+        rows = [
+            {"id": f"id-{i}", "created_at": f"2025-01-{30 - i:02d}T00:00:00+00:00"}
+            for i in range(5)
+        ]
+        seen = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            params = request.url.params
+            start = 0
+            if "or" in params:
+                created_at = params["or"].split("created_at.lt.")[1].split(",")[0]
+                start = (
+                    next(
+                        i
+                        for i, row in enumerate(rows)
+                        if f'"{row["created_at"]}"' == created_at
+                    )
+                    + 1
+                )
+            return httpx.Response(200, json=rows[start : start + int(params["limit"])])
+
+        manager = make_manager(handler)
+        first, cursor = await manager.get_page("pipeline", limit=2, columns="status")
+        second, cursor2 = await manager.get_page("pipeline", limit=2, cursor=cursor)
+        everything = [row async for row in manager.iter_pages("pipeline", page_size=2)]
+        await manager.aclose()
+
+        self.assertEqual([r["id"] for r in first], ["id-0", "id-1"])
+        self.assertEqual([r["id"] for r in second], ["id-2", "id-3"])
+        self.assertEqual(len(everything), 5)
+        self.assertEqual(
+            seen[0].url.params["order"], "created_at.desc.nullslast,id.desc"
+        )
+        self.assertEqual(seen[0].url.params["limit"], "3")
+        self.assertEqual(seen[0].url.params["select"], "status,created_at,id")
+        self.assertIn('id.lt."id-1"', seen[1].url.params["or"])
+        self.assertIsNotNone(cursor2)
+
+    async def test_keyset_pages_include_null_created_at(self):
+        """Test rows without created_at are paged last instead of breaking the cursor"""
+        rows = [
+            {"id": "id-4", "created_at": "2025-01-02T00:00:00+00:00"},
+            {"id": "id-3", "created_at": "2025-01-01T00:00:00+00:00"},
+            {"id": "id-2", "created_at": None},
+            {"id": "id-1", "created_at": None},
+            {"id": "id-0", "created_at": None},
+        ]
+        seen = []
+
+        def after_cursor(params, row):
+            if params.get("created_at") == "is.null":
+                return row["created_at"] is None and row["id"] < params["id"][3:]
+            created_at, row_id = re.search(
+                r'created_at\.lt\."([^"]+)",'
+                r'and\(created_at\.eq\.".+",id\.lt\."([^"]+)"\)',
+                params["or"],
+            ).groups()
+            return (
+                row["created_at"] is None
+                or row["created_at"] < created_at
+                or (row["created_at"] == created_at and row["id"] < row_id)
+            )
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            params = request.url.params
+            seen.append(params)
+            matching = [
+                row
+                for row in rows
+                if ("or" not in params and "created_at" not in params)
+                or after_cursor(params, row)
+            ]
+            return httpx.Response(200, json=matching[: int(params["limit"])])
+
+        manager = make_manager(handler)
+        ids = [row["id"] async for row in manager.iter_pages("pipeline", page_size=2)]
+        await manager.aclose()
+
+        self.assertEqual(ids, ["id-4", "id-3", "id-2", "id-1", "id-0"])
+        self.assertIn(",created_at.is.null", seen[1]["or"])
+        self.assertEqual((seen[2]["created_at"], seen[2]["id"]), ("is.null", "lt.id-1"))
+        self.assertEqual(decode_cursor(encode_cursor(rows[2])), (None, "id-2"))
+
+    async def test_invalid_cursor_raises(self):
+        """Test malformed cursors are rejected before any request"""
+        manager = make_manager(lambda request: httpx.Response(200, json=[]))
+        with self.assertRaises(ValueError):
+            await manager.get_page("pipeline", cursor="not-a-cursor")
+        await manager.aclose()
+
+    async def test_init_database_probes_tables_concurrently(self):
+        """Test startup table probes run in parallel and report missing tables"""
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.1)
+            if request.url.path.endswith("/pipeline"):
+                return httpx.Response(
+                    404,
+                    json={
+                        "code": "42P01",
+                        "details": None,
+                        "hint": None,
+                        "message": "missing",
+                    },
+                )
+            return httpx.Response(200, json=[])
+
+        manager = make_manager(handler)
+        started = time.perf_counter()
+        results = await manager.init_database()
+        elapsed = time.perf_counter() - started
+        await manager.aclose()
+
+        self.assertEqual(
+            results, {"users": True, "collected_leads": True, "pipeline": False}
+        )
+        self.assertLess(elapsed, 0.25)
+
+    async def test_count_rows_uses_head_request(self):
+        """Test counts come from Content-Range without downloading rows"""
+        seen = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200, headers={"content-range": "*/1234"})
+
+        manager = make_manager(handler)
+        count = await manager.count_rows("chat_history", {"user_id": "u1"})
+        await manager.aclose()
+
+        self.assertEqual(count, 1234)
+        self.assertEqual(seen[0].method, "HEAD")
+        self.assertEqual(seen[0].headers["prefer"], "count=exact")
+        self.assertEqual(seen[0].url.params["user_id"], "eq.u1")
+
+    async def test_count_grouped_aggregate_and_fallback(self):
+        """Test grouped counts use count() and fall back to a narrow scan"""
+        aggregates_enabled = True
+        seen = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            if "count()" in request.url.params["select"]:
+                if not aggregates_enabled:
+                    return httpx.Response(
+                        400,
+                        json={"message": "aggregates not allowed", "code": "PGRST123"},
+                    )
+                return httpx.Response(200, json=[{"status": "Proposal", "count": 3}])
+            return httpx.Response(
+                200,
+                json=[
+                    {"status": status, "created_at": "2025-01-01", "id": str(i)}
+                    for i, status in enumerate(["Proposal", "Proposal", "Closed Won"])
+                ],
+            )
+
+        manager = make_manager(handler)
+        self.assertEqual(await manager.count_by_status("pipeline"), {"Proposal": 3})
+
+        aggregates_enabled = False
+        manager._aggregates_supported = None
+        counts = await manager.count_by_status("pipeline")
+        await manager.aclose()
+
+        self.assertEqual(counts, {"Proposal": 2, "Closed Won": 1})
+        self.assertFalse(manager._aggregates_supported)
+        self.assertEqual(seen[-1].url.params["select"], "status,created_at,id")
+
+    async def test_upsert_tender_is_single_request(self):
+        """Test tender save is one POST with on_conflict=deal_id"""
+        seen = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            body = json.loads(request.content)
+            return httpx.Response(201, json=[{"id": "t1", **body}])
+
+        manager = make_manager(handler)
+        tender = await manager.upsert_tender(
+            {"deal_id": "d1", "language": "tr", "created_at": "x", "deadline": ""}
+        )
+        await manager.aclose()
+
+        self.assertEqual(len(seen), 1)
+        self.assertEqual(seen[0].method, "POST")
+        self.assertEqual(seen[0].url.params["on_conflict"], "deal_id")
+        self.assertIn("resolution=merge-duplicates", seen[0].headers["prefer"])
+        self.assertIn("return=representation", seen[0].headers["prefer"])
+        body = json.loads(seen[0].content)
+        self.assertNotIn("created_at", body)
+        self.assertNotIn("language", body)
+        self.assertEqual(tender["language"], "tr")
+
+    async def test_upsert_tender_falls_back_without_unique_constraint(self):
+        """Test a missing deal_id constraint falls back to lookup + write"""
+        methods = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            methods.append(request.method)
+            if request.method == "POST" and "on_conflict" in request.url.params:
+                return httpx.Response(
+                    400,
+                    json={
+                        "code": "42P10",
+                        "details": None,
+                        "hint": None,
+                        "message": "there is no unique or exclusion constraint",
+                    },
+                )
+            if request.method == "GET" and "deal_id" in request.url.params:
+                return httpx.Response(200, json=[{"id": "t1"}])
+            return httpx.Response(200, json=[{"id": "t1", "deal_id": "d1"}])
+
+        manager = make_manager(handler)
+        tender = await manager.upsert_tender({"deal_id": "d1"})
+        await manager.aclose()
+
+        self.assertEqual(tender["id"], "t1")
+        self.assertEqual(methods, ["POST", "GET", "PATCH", "GET"])
+
+    async def test_bulk_mutations_are_chunked(self):
+        """Test bulk insert/delete/update send one request per chunk"""
+        seen = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            if request.method == "POST":
+                affected = len(json.loads(request.content))
+            else:
+                values = request.url.params.get("id", "")
+                affected = values.count(",") + 1 if values.startswith("in.") else 7
+            return httpx.Response(201, headers={"content-range": f"*/{affected}"})
+
+        manager = make_manager(handler)
+        ids = [f"00000000-0000-0000-0000-{i:012d}" for i in range(400)]
+        deleted = await manager.delete_where_in("tenders", "id", ids)
+        delete_requests = len(seen)
+        updated = await manager.update_where_in(
+            "collected_leads", "id", ids[:3], {"status": "archived"}
+        )
+        inserted = await manager.insert_many(
+            "collected_leads", [{"company_name": f"Co {i}"} for i in range(1200)]
+        )
+        cleared = await manager.delete_all("collected_leads")
+        await manager.aclose()
+
+        self.assertEqual(deleted, 400)
+        self.assertGreater(delete_requests, 1)
+        self.assertLess(delete_requests, 10)
+        self.assertEqual(updated, 3)
+        self.assertEqual(inserted, 1200)
+        self.assertEqual(cleared, 7)
+        self.assertEqual(seen[-1].url.params["id"], "not.is.null")
+        self.assertIn("count=exact", seen[-1].headers["prefer"])
+        self.assertIn("return=minimal", seen[-1].headers["prefer"])
+
+    async def test_delete_where_not_in_includes_nulls(self):
+        """Test cleanup deletes rows outside the keep-list, NULLs included"""
+        seen = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200, headers={"content-range": "*/5"})
+
+        manager = make_manager(handler)
+        deleted = await manager.delete_where_not_in(
+            "tenders", "deal_id", ["d1", "d2"], include_nulls=True
+        )
+        await manager.aclose()
+
+        self.assertEqual(deleted, 5)
+        self.assertEqual(seen[0].method, "DELETE")
+        self.assertEqual(
+            seen[0].url.params["or"], '(deal_id.is.null,deal_id.not.in.("d1","d2"))'
+        )
+
+    async def test_create_tender_strips_language(self):
+        """Test language is not sent to the database but returned to caller"""
+        bodies = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            bodies.append(body)
+            return httpx.Response(201, json=[{"id": "t2", **body}])
+
+        manager = make_manager(handler)
+        tender = await manager.create_tender(
+            {"deal_id": "d1", "language": "tr", "deadline": ""}
+        )
+        await manager.aclose()
+
+        self.assertNotIn("language", bodies[0])
+        self.assertIsNone(bodies[0]["deadline"])
+        self.assertEqual(tender["language"], "tr")
+
+    async def test_errors_return_empty_list(self):
+        """Test API errors are swallowed like the sync manager"""
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(500, json={"message": "boom", "code": "XX000"})
+
+        manager = make_manager(handler)
+        self.assertEqual(await manager.get_pipeline(limit=10), [])
+        self.assertIsNone(await manager.get_tender("missing"))
+        await manager.aclose()
+
+    async def test_concurrent_queries_do_not_block_event_loop(self):
+        """Test slow round trips overlap instead of running serially"""
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.2)
+            return httpx.Response(200, json=[])
+
+        manager = make_manager(handler)
+        started = time.perf_counter()
+        await asyncio.gather(*(manager.get_pipeline(limit=100) for _ in range(5)))
+        elapsed = time.perf_counter() - started
+        await manager.aclose()
+
+        print(f"⏱️  5 concurrent queries took {elapsed:.3f}s")
+        self.assertLess(elapsed, 0.6)
+
+
+class TestTenderCleanupRoute(unittest.IsolatedAsyncioTestCase):
+    """DELETE /api/tenders/cleanup-test-records route testleri"""
+
+    async def test_cleanup_route_is_not_shadowed_by_tender_id(self):
+        """Test the literal cleanup route wins over /api/tenders/{tender_id}"""
+        import main
+
+        seen = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            if request.method == "DELETE":
+                return httpx.Response(200, headers={"content-range": "*/3"})
+            return httpx.Response(
+                200, json=[{"id": "t1", "company_name": "armut", "deal_id": "d1"}]
+            )
+
+        # Starlette TestClient httpx>=0.28 ile çalışmıyor; aynı in-process
+        # ASGI çağrısı httpx.ASGITransport ile yapılır
+        transport = httpx.ASGITransport(app=main.app)
+        with mock.patch.object(main, "async_db", make_manager(handler)):
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://t"
+            ) as client:
+                response = await client.delete("/api/tenders/cleanup-test-records")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["deleted_count"], 3)
+        self.assertEqual(seen[0].method, "DELETE")
+        self.assertIn("deal_id.is.null", seen[0].url.params["or"])
+
+
+class TestParseFields(unittest.TestCase):
+    """?fields= parametresi testleri"""
+
+    def test_parse_fields(self):
+        """Test fields are split, required columns prepended and names validated"""
+        self.assertIsNone(parse_fields(None))
+        self.assertEqual(
+            parse_fields("company_name, status"), ["id", "company_name", "status"]
+        )
+        self.assertEqual(
+            parse_fields("status", required=("id", "created_at")),
+            ["id", "created_at", "status"],
+        )
+        with self.assertRaises(ValueError):
+            parse_fields("id,users(password)")
+
+
+class TestChunking(unittest.TestCase):
+    """Bulk parça sınırları testleri"""
+
+    def test_chunk_values_respects_url_budget(self):
+        """Test IN lists are split under the character budget"""
+        chunks = list(_chunk_values(["x" * 10] * 100, max_chars=330))
+        self.assertEqual(sum(len(c) for c in chunks), 100)
+        self.assertTrue(all(len(c) <= 10 for c in chunks))
+
+    def test_chunk_rows_respects_row_and_byte_limits(self):
+        """Test rows are split by count and by JSON size"""
+        rows = [{"n": i} for i in range(25)]
+        self.assertEqual([len(c) for c in _chunk_rows(rows, max_rows=10)], [10, 10, 5])
+        big = [{"blob": "x" * 100}] * 4
+        self.assertEqual(len(list(_chunk_rows(big, max_bytes=250))), 2)
+
+
+class TestCursor(unittest.TestCase):
+    """Keyset cursor testleri"""
+
+    def test_roundtrip(self):
+        """Test cursors round-trip the (created_at, id) key"""
+        row = {"id": "abc", "created_at": "2025-08-26T19:11:35.120946+00:00"}
+        self.assertEqual(decode_cursor(encode_cursor(row)), (row["created_at"], "abc"))
+
+
+if __name__ == "__main__":
+    unittest.main()
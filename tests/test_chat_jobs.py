@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Chat Jobs Tests
+ChatJobQueue'nun backpressure, kısmi sonuç, hata ve webhook davranışını
+doğrular.
+"""
+
+import asyncio
+import json
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from benchmarks.stub_server import StubServer
+from chat_jobs import ChatJobQueue, ChatJobQueueFull
+from metrics import CHAT_JOB_QUEUE_DEPTH, CHAT_JOB_WAIT_SECONDS
+
+
+class TestChatJobQueue(unittest.IsolatedAsyncioTestCase):
+    """İş kuyruğu testleri"""
+
+    async def asyncSetUp(self):
+        self.release = asyncio.Event()
+        self.saved = []
+
+    async def asyncTearDown(self):
+        await self.queue.aclose()
+
+    async def runner(self, job):
+        job.add_result(
+            "Google Gemini", [{"model": "Google Gemini", "status": "success"}]
+        )
+        await self.release.wait()
+        if job.message == "fail":
+            raise RuntimeError("upstream down")
+        return [
+            {"model": "Google Gemini", "status": "success", "llm_response": job.message}
+        ]
+
+    async def on_complete(self, job):
+        self.saved.append(job.message)
+
+    async def wait_finished(self, job):
+        for _ in range(100):
+            if job.finished:
+                return
+            await asyncio.sleep(0.01)
+        self.fail(f"job {job.id} did not finish")
+
+    async def test_partial_then_final_results(self):
+        """Test polling sees partial results while running, then the final answer"""
+        self.queue = ChatJobQueue(self.runner, self.on_complete, workers=1, max_queue=5)
+        job = self.queue.submit("hello")
+        self.assertEqual(job.to_dict()["status"], "queued")
+        await asyncio.sleep(0.01)
+
+        view = self.queue.get(job.id).to_dict()
+        self.assertEqual((view["status"], view["llm_responses"]), ("running", 1))
+
+        self.release.set()
+        await self.wait_finished(job)
+        view = self.queue.get(job.id).to_dict()
+        self.assertEqual(view["status"], "completed")
+        self.assertEqual(view["llm_analysis"][0]["llm_response"], "hello")
+        self.assertEqual(self.saved, ["hello"])
+
+    async def test_full_queue_rejects_new_jobs(self):
+        """Test backpressure once workers are busy and the queue is full"""
+        self.queue = ChatJobQueue(self.runner, workers=1, max_queue=2)
+        waits = CHAT_JOB_WAIT_SECONDS.snapshot()["count"]
+        jobs = [self.queue.submit("busy")]
+        await asyncio.sleep(0.01)
+        jobs += [self.queue.submit("queued 1"), self.queue.submit("queued 2")]
+        self.assertEqual(CHAT_JOB_QUEUE_DEPTH.value(), 2)
+
+        with self.assertRaises(ChatJobQueueFull):
+            self.queue.submit("rejected")
+        self.assertEqual(self.queue.stats()["rejected"], 1)
+
+        self.release.set()
+        for job in jobs:
+            await self.wait_finished(job)
+        self.assertEqual(CHAT_JOB_WAIT_SECONDS.snapshot()["count"], waits + 3)
+        self.assertEqual(self.queue.stats()["queue_depth"], 0)
+
+    async def test_failed_job_is_not_saved(self):
+        """Test runner errors mark the job failed and skip persistence"""
+        self.queue = ChatJobQueue(self.runner, self.on_complete, workers=1)
+        self.release.set()
+        job = self.queue.submit("fail")
+        await self.wait_finished(job)
+
+        self.assertEqual((job.status, job.error), ("failed", "upstream down"))
+        self.assertEqual(self.saved, [])
+
+    async def test_finished_jobs_expire(self):
+        """Test finished jobs are dropped after the ttl"""
+        self.queue = ChatJobQueue(self.runner, workers=1, ttl=0.05)
+        self.release.set()
+        job = self.queue.submit("hello")
+        await self.wait_finished(job)
+        self.assertIsNotNone(self.queue.get(job.id))
+
+        await asyncio.sleep(0.06)
+        self.assertIsNone(self.queue.get(job.id))
+        self.assertIsNone(self.queue.get("unknown"))
+
+    async def test_shutdown_fails_pending_jobs(self):
+        """Test aclose marks running and queued jobs as failed"""
+        self.queue = ChatJobQueue(self.runner, workers=1)
+        jobs = [self.queue.submit("a"), self.queue.submit("b")]
+        await asyncio.sleep(0.01)
+        await self.queue.aclose()
+
+        self.assertEqual([job.status for job in jobs], ["failed", "failed"])
+
+
+class TestChatJobWebhook(unittest.IsolatedAsyncioTestCase):
+    """Webhook testleri"""
+
+    async def asyncSetUp(self):
+        self.received = []
+        self.server = StubServer(responder=self.respond, use_tls=False)
+        await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.queue.aclose()
+        await self.server.stop()
+
+    def respond(self, method, path, body):
+        self.received.append(json.loads(body))
+        return 200, {"ok": True}
+
+    async def runner(self, job):
+        return [{"model": "GPT-OSS-20B", "status": "success", "llm_response": "done"}]
+
+    async def test_callback_url_receives_result(self):
+        """Test the finished job is posted to an allowed callback_url"""
+        self.queue = ChatJobQueue(
+            self.runner, workers=1, webhook_hosts=frozenset({"127.0.0.1"})
+        )
+        job = self.queue.submit("hello", f"{self.server.base_url}/hook")
+        for _ in range(100):
+            if job.webhook != "pending":
+                break
+            await asyncio.sleep(0.01)
+
+        self.assertEqual(job.webhook, "delivered")
+        self.assertEqual(self.received[0]["job_id"], job.id)
+        self.assertEqual(self.received[0]["status"], "completed")
+
+    async def test_callback_url_must_be_allowed(self):
+        """Test webhooks are rejected when disabled or for other hosts"""
+        self.queue = ChatJobQueue(self.runner, workers=1)
+        with self.assertRaises(ValueError):
+            self.queue.submit("hello", f"{self.server.base_url}/hook")
+
+        self.queue.webhook_hosts = frozenset({"hooks.example.com"})
+        for url in ("http://169.254.169.254/latest", "file:///etc/passwd"):
+            with self.assertRaises(ValueError):
+                self.queue.submit("hello", url)
+        self.assertEqual(self.queue.stats()["stored_jobs"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
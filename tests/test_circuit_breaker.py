@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Circuit Breaker Tests
+CircuitBreaker'ın açılma / yarı açık probe davranışını ve AdaptiveTimeout'un
+gecikme yüzdeliklerine göre uyarlanmasını doğrular.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from circuit_breaker import AdaptiveTimeout, CircuitBreaker, CircuitOpenError
+from metrics import LLM_CIRCUIT_STATE
+
+
+class FakeClock:
+    """Test için elle ilerletilen saat"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Devre kesici durum geçişleri testleri"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            "test-provider",
+            failure_threshold=3,
+            recovery_time=30,
+            slow_call_seconds=10,
+            clock=self.clock,
+        )
+
+    def test_opens_after_consecutive_failures(self):
+        """Test the breaker opens only after N failures in a row"""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success(0.1)
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "closed")
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "open")
+        self.assertFalse(self.breaker.allow())
+        with self.assertRaises(CircuitOpenError) as ctx:
+            self.breaker.check()
+        self.assertEqual(ctx.exception.retry_after, 30)
+        self.assertEqual(LLM_CIRCUIT_STATE.value("test-provider"), 2)
+
+    def test_slow_calls_count_as_failures(self):
+        """Test successful but slow calls open the breaker"""
+        for _ in range(3):
+            self.breaker.record_success(12.0)
+        self.assertEqual(self.breaker.state, "open")
+
+    def test_half_open_allows_single_probe(self):
+        """Test one probe after recovery time; success closes, failure reopens"""
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now += 30
+        self.assertEqual(self.breaker.state, "half_open")
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "open")
+
+        self.clock.now += 30
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_success(0.1)
+        self.assertEqual(self.breaker.state, "closed")
+        self.assertEqual(self.breaker.stats()["opened_count"], 2)
+        self.assertEqual(LLM_CIRCUIT_STATE.value("test-provider"), 0)
+
+    def test_cancelled_probe_is_released(self):
+        """Test a cancelled probe lets the next call probe again"""
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now += 30
+        self.assertTrue(self.breaker.allow())
+        self.breaker.release()
+        self.assertTrue(self.breaker.allow())
+
+
+class TestAdaptiveTimeout(unittest.TestCase):
+    """Uyarlanan timeout testleri"""
+
+    def test_default_until_enough_samples(self):
+        """Test the default is used before min_samples observations"""
+        timeouts = AdaptiveTimeout(default=30, minimum=1, maximum=30, min_samples=5)
+        for _ in range(4):
+            timeouts.observe(0.5)
+        self.assertEqual(timeouts.timeout(), 30)
+        timeouts.observe(0.5)
+        self.assertEqual(timeouts.timeout(), 1.0)
+
+    def test_follows_p99_within_bounds(self):
+        """Test the timeout is p99 x multiplier, clamped to [minimum, maximum]"""
+        timeouts = AdaptiveTimeout(
+            default=30, minimum=1, maximum=30, multiplier=2, min_samples=10, window=100
+        )
+        for _ in range(99):
+            timeouts.observe(2.0)
+        timeouts.observe(3.0)
+        self.assertEqual(timeouts.timeout(), 6.0)
+
+        for _ in range(10):
+            timeouts.observe(25.0)
+        self.assertEqual(timeouts.timeout(), 30)
+        self.assertEqual(timeouts.stats()["p50_seconds"], 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Company Store Tests
+Append-only log, id index'i, sıkıştırma ve companies.json uyumluluğunu doğrular.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from company_store import CompanyStore
+
+
+class TestCompanyStore(unittest.TestCase):
+    """CompanyStore testleri"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.tmpdir.name, "companies.jsonl")
+        self.json_path = os.path.join(self.tmpdir.name, "companies.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def open_store(self, **kwargs) -> CompanyStore:
+        return CompanyStore(self.log_path, self.json_path, **kwargs)
+
+    def test_crud_survives_reopen(self):
+        """Test inserts, updates and deletes are replayed from the log"""
+        store = self.open_store()
+        first = store.insert({"name": "Acme"})
+        second = store.insert({"name": "Globex"})
+        self.assertTrue(store.update(first, {"industry": "Tech"}))
+        self.assertTrue(store.delete(second))
+        self.assertFalse(store.update(second, {"name": "gone"}))
+
+        reopened = self.open_store()
+        self.assertEqual(
+            reopened.all(), [{"id": first, "name": "Acme", "industry": "Tech"}]
+        )
+
+    def test_ids_are_never_reused(self):
+        """Test deleting the newest company does not recycle its id"""
+        store = self.open_store(compact_min_garbage=0)
+        store.insert({"name": "A"})
+        last = store.insert({"name": "B"})
+        store.delete(last)
+        store.compact()
+
+        self.assertGreater(self.open_store().insert({"name": "C"}), last)
+
+    def test_writes_append_single_lines(self):
+        """Test point writes do not rewrite the whole file"""
+        store = self.open_store()
+        for i in range(50):
+            store.insert({"name": f"Company {i}"})
+        size = os.path.getsize(self.log_path)
+
+        store.update(10, {"name": "Renamed"})
+        grown = os.path.getsize(self.log_path) - size
+        self.assertLess(grown, 200)
+
+    def test_compaction_drops_dead_records(self):
+        """Test log is rewritten once garbage outweighs live records"""
+        store = self.open_store(compact_min_garbage=10)
+        company_id = store.insert({"name": "Acme", "version": 0})
+        for version in range(1, 30):
+            store.update(company_id, {"version": version})
+
+        with open(self.log_path, "r", encoding="utf-8") as f:
+            self.assertLess(len(f.readlines()), 15)
+        self.assertEqual(self.open_store().get(company_id)["version"], 29)
+
+        # Sıkıştırma companies.json'ı da günceller
+        with open(self.json_path, "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f)[0]["id"], company_id)
+
+    def test_imports_legacy_json(self):
+        """Test an existing companies.json is imported with its ids"""
+        with open(self.json_path, "w", encoding="utf-8") as f:
+            json.dump([{"id": 1, "name": "Old"}, {"id": 7, "name": "Older"}], f)
+
+        store = self.open_store()
+        self.assertEqual(store.get(7)["name"], "Older")
+        self.assertEqual(store.insert({"name": "New"}), 8)
+
+    def test_torn_last_line_is_ignored(self):
+        """Test a partially written record does not break replay"""
+        store = self.open_store()
+        store.insert({"name": "Acme"})
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write('{"op": "put", "id": 2, "da')
+
+        reopened = self.open_store()
+        reopened.insert({"name": "Globex"})
+        self.assertEqual(
+            [c["name"] for c in self.open_store().all()], ["Acme", "Globex"]
+        )
+
+    def test_reader_follows_compaction_by_other_writer(self):
+        """Test a second store re-reads the log after another one compacts it"""
+        writer = self.open_store(compact_min_garbage=0)
+        reader = self.open_store()
+        company_id = writer.insert({"name": "Acme"})
+        self.assertEqual(reader.get(company_id)["name"], "Acme")
+
+        writer.update(company_id, {"name": "Acme Corp"})
+        writer.delete(writer.insert({"name": "Temp"}))
+        writer.compact()
+        self.assertEqual(reader.all(), [{"id": company_id, "name": "Acme Corp"}])
+
+
+class TestCompanyStoreAsync(unittest.IsolatedAsyncioTestCase):
+    """CompanyStore asyncio sürümleri testleri"""
+
+    async def test_async_methods_run_in_worker_threads(self):
+        """Test async wrappers do the file I/O off the event loop thread"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CompanyStore(
+                os.path.join(tmpdir, "companies.jsonl"),
+                os.path.join(tmpdir, "companies.json"),
+            )
+            threads = []
+            refresh = store._refresh
+
+            def tracked_refresh():
+                threads.append(threading.current_thread())
+                refresh()
+
+            store._refresh = tracked_refresh
+            company_id = await store.ainsert({"name": "Acme"})
+            self.assertTrue(await store.aupdate(company_id, {"name": "Acme Corp"}))
+            self.assertEqual((await store.aget(company_id))["name"], "Acme Corp")
+            self.assertTrue(await store.adelete(company_id))
+            self.assertEqual(await store.aall(), [])
+
+        self.assertEqual(len(threads), 5)
+        self.assertNotIn(threading.main_thread(), threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+File Store Tests
+Kilitli, atomik ve group-commit'li JSON dosya katmanını doğrular.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from company_store import CompanyStore
+from file_store import JSONFileStore, atomic_write_json, file_lock
+
+
+def increment_counter(path: str, times: int):
+    """Ayrı process'te sayaç artır"""
+    store = JSONFileStore(path)
+    for _ in range(times):
+        store.update(lambda data: data.__setitem__("n", data.get("n", 0) + 1))
+
+
+def insert_companies(log_path: str, prefix: str, times: int):
+    """Ayrı process'te şirket ekle"""
+    store = CompanyStore(log_path, json_path=None)
+    for i in range(times):
+        store.insert({"name": f"{prefix}-{i}"})
+
+
+class TestJSONFileStore(unittest.TestCase):
+    """JSONFileStore testleri"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "store.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_atomic_write_leaves_no_temp_files(self):
+        """Test atomic writes replace the file and clean up"""
+        atomic_write_json(self.path, {"a": 1})
+        atomic_write_json(self.path, {"a": 2})
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"a": 2})
+        self.assertEqual(os.listdir(self.tmpdir.name), ["store.json"])
+
+    def test_update_returns_result_and_propagates_errors(self):
+        """Test update results and exceptions reach the caller"""
+        store = JSONFileStore(self.path, default_factory=list)
+        self.assertEqual(store.update(lambda data: data.append(1) or len(data)), 1)
+
+        with self.assertRaises(KeyError):
+            store.update(lambda data: {}["missing"])
+        self.assertEqual(store.read(), [1])
+
+    def test_file_lock_is_reentrant(self):
+        """Test nested locks in the same thread do not deadlock"""
+        with file_lock(self.path):
+            with file_lock(self.path):
+                atomic_write_json(self.path, [])
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_concurrent_updates_are_group_committed(self):
+        """Test concurrent writers share flushes without losing updates"""
+        store = JSONFileStore(self.path)
+        store.replace({"n": 0})
+        flushes_before = store.flushes
+
+        def slow_increment(data):
+            time.sleep(0.002)
+            data["n"] += 1
+
+        threads = [
+            threading.Thread(target=store.update, args=(slow_increment,))
+            for _ in range(40)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        flushes = store.flushes - flushes_before
+        print(f"📦 40 updates written in {flushes} flushes")
+        self.assertEqual(store.read()["n"], 40)
+        self.assertLess(flushes, 40)
+
+    def test_async_updates_share_one_flush(self):
+        """Test concurrent coroutines on one event loop are batched"""
+        store = JSONFileStore(self.path)
+        store.replace({"n": 0})
+        flushes_before = store.flushes
+
+        async def run():
+            def increment(data):
+                data["n"] += 1
+                return data["n"]
+
+            return await asyncio.gather(*(store.aupdate(increment) for _ in range(40)))
+
+        results = asyncio.run(run())
+        self.assertEqual(sorted(results), list(range(1, 41)))
+        self.assertEqual(store.read()["n"], 40)
+        self.assertEqual(store.flushes - flushes_before, 1)
+
+    def test_failed_op_in_batch_is_rolled_back(self):
+        """Test a batched op that mutates then raises is not persisted"""
+        store = JSONFileStore(self.path, default_factory=list)
+
+        def broken(data):
+            data.append("partial")
+            raise ValueError("boom")
+
+        async def run():
+            return await asyncio.gather(
+                store.aupdate(lambda data: data.append("a")),
+                store.aupdate(broken),
+                store.aupdate(lambda data: data.append("b")),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(run())
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(store.read(), ["a", "b"])
+
+    def test_batch_with_failing_op_in_the_middle(self):
+        """Test ops around a failure keep their results; only failures re-read"""
+        store = JSONFileStore(self.path, default_factory=list)
+        store.replace(["x"])
+        reads = []
+        read = store.read
+        store.read = lambda: reads.append(1) or read()
+
+        def append(item):
+            def op(data):
+                data.append(item)
+                return len(data)
+
+            return op
+
+        def broken(data):
+            data.clear()
+            raise ValueError("boom")
+
+        async def run(ops):
+            return await asyncio.gather(
+                *(store.aupdate(op) for op in ops), return_exceptions=True
+            )
+
+        results = asyncio.run(run([append("a"), append("b"), append("c")]))
+        self.assertEqual((results, len(reads)), ([2, 3, 4], 1))
+
+        reads.clear()
+        ops = [append("d"), append("e"), broken, append("f"), append("g")]
+        results = asyncio.run(run(ops))
+        self.assertEqual(results[:2] + results[3:], [5, 6, 7, 8])
+        self.assertIsInstance(results[2], ValueError)
+        self.assertEqual(len(reads), 2)
+        self.assertEqual(read(), ["x", "a", "b", "c", "d", "e", "f", "g"])
+
+    def test_corrupt_file_is_not_overwritten(self):
+        """Test a torn JSON file raises instead of being replaced by the default"""
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write('{"alice": {"email": "al')
+        store = JSONFileStore(self.path)
+
+        with self.assertRaises(json.JSONDecodeError):
+            store.read()
+        with self.assertRaises(json.JSONDecodeError):
+            store.update(lambda data: data.__setitem__("bob", {}))
+        with open(self.path, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), '{"alice": {"email": "al')
+
+    def test_no_lost_updates_across_processes(self):
+        """Test read-modify-write from several processes keeps every update"""
+        JSONFileStore(self.path).replace({"n": 0})
+        processes = [
+            multiprocessing.Process(target=increment_counter, args=(self.path, 25))
+            for _ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(30)
+
+        self.assertEqual(JSONFileStore(self.path).read()["n"], 100)
+
+
+class TestCompanyStoreAcrossProcesses(unittest.TestCase):
+    """CompanyStore çok process testleri"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.tmpdir.name, "companies.jsonl")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_workers_see_each_others_writes(self):
+        """Test a store picks up appends and compactions from another worker"""
+        first = CompanyStore(self.log_path, json_path=None, compact_min_garbage=0)
+        second = CompanyStore(self.log_path, json_path=None)
+
+        company_id = first.insert({"name": "Acme"})
+        self.assertEqual(second.get(company_id)["name"], "Acme")
+
+        second.update(company_id, {"name": "Acme 2"})
+        first.compact()
+        self.assertEqual(second.get(company_id)["name"], "Acme 2")
+        self.assertNotEqual(second.insert({"name": "Globex"}), company_id)
+
+    def test_concurrent_inserts_get_unique_ids(self):
+        """Test parallel workers never hand out the same id"""
+        CompanyStore(self.log_path, json_path=None)
+        processes = [
+            multiprocessing.Process(
+                target=insert_companies, args=(self.log_path, f"w{i}", 20)
+            )
+            for i in range(3)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(30)
+
+        companies = CompanyStore(self.log_path, json_path=None).all()
+        self.assertEqual(len(companies), 60)
+        self.assertEqual(len({c["id"] for c in companies}), 60)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+JWT Verifier Tests
+Yerel HS256 imza ve exp kontrolünü doğrular.
+"""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+
+from jose import jwt
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from jwt_verifier import JWTVerifier, _construct_key
+
+SECRET = "test-jwt-secret-with-at-least-32-chars"
+
+
+def make_token(secret: str = SECRET, **claims) -> str:
+    payload = {
+        "sub": "user-1",
+        "email": "user@example.com",
+        "aud": "authenticated",
+        "exp": int(time.time()) + 3600,
+    }
+    payload.update(claims)
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+class TestJWTVerifier(unittest.TestCase):
+    """JWTVerifier testleri"""
+
+    def setUp(self):
+        self.verifier = JWTVerifier(secret=SECRET, algorithms=["HS256"], audience=None)
+
+    def test_valid_token(self):
+        """Test a correctly signed token returns its claims"""
+        claims = self.verifier.verify(make_token())
+        self.assertEqual(claims["sub"], "user-1")
+        self.assertEqual(claims["email"], "user@example.com")
+
+    def test_rejects_bad_signature(self):
+        """Test tokens signed with another secret are rejected"""
+        self.assertIsNone(self.verifier.verify(make_token(secret="x" * 40)))
+
+    def test_rejects_tampered_payload(self):
+        """Test modifying the payload invalidates the signature"""
+        header, _, signature = make_token().split(".")
+        forged_payload = make_token(secret="x" * 40, sub="admin").split(".")[1]
+        self.assertIsNone(
+            self.verifier.verify(f"{header}.{forged_payload}.{signature}")
+        )
+
+    def test_rejects_expired_and_missing_claims(self):
+        """Test expired tokens and tokens without exp/sub are rejected"""
+        self.assertIsNone(self.verifier.verify(make_token(exp=int(time.time()) - 10)))
+        self.assertIsNone(self.verifier.verify(make_token(sub="")))
+        self.assertIsNone(self.verifier.verify(make_token(exp=None)))
+
+    def test_rejects_malformed_tokens(self):
+        """Test malformed input never raises"""
+        for token in ("", "abc", "a.b", "a.b.c", "a.b.c.d", make_token() + "{"):
+            self.assertIsNone(self.verifier.verify(token))
+
+    def test_audience_is_checked_when_configured(self):
+        """Test audience verification is opt-in"""
+        verifier = JWTVerifier(secret=SECRET, algorithms=["HS256"], audience="other")
+        self.assertIsNone(verifier.verify(make_token()))
+
+    def test_key_is_constructed_once(self):
+        """Test the signing key object is cached across verifications"""
+        _construct_key.cache_clear()
+        for _ in range(5):
+            self.verifier.verify(make_token())
+        self.assertEqual(_construct_key.cache_info().misses, 1)
+
+    def test_without_secret_rejects_every_token(self):
+        """Test unsigned or wrongly signed tokens are rejected when no secret is set"""
+        verifier = JWTVerifier(secret=None)
+        self.assertFalse(verifier.verifies_signature)
+        header, payload, _ = make_token().split(".")
+        unsigned = f"{header}.{payload}."
+        for token in (unsigned, make_token(secret="y" * 40), make_token()):
+            self.assertIsNone(verifier.verify(token))
+
+
+if __name__ == "__main__":
+    unittest.main()
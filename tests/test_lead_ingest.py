@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Lead Ingest Tests
+Akış halinde NDJSON/CSV ayrıştırma, doğrulama ve batch'li eklemeyi doğrular.
+"""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from lead_ingest import (
+    LeadIngestError,
+    detect_format,
+    ingest_leads,
+    iter_csv,
+    iter_ndjson,
+    validate_lead,
+)
+
+
+def lead(name: str, **overrides) -> dict:
+    record = {
+        "name": name,
+        "industry": "Fintech",
+        "location": "Europe",
+        "company_size": "11-50",
+        "funder": "N/A",
+    }
+    record.update(overrides)
+    return record
+
+
+async def stream(data: bytes, size: int):
+    """Gövdeyi sabit boyutlu parçalar halinde üret"""
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def collect(rows) -> list:
+    return [row async for row in rows]
+
+
+class TestParsers(unittest.IsolatedAsyncioTestCase):
+    """Ayrıştırıcı testleri"""
+
+    async def test_ndjson_lines_split_across_chunks(self):
+        """Test records are rebuilt across chunk and multibyte boundaries"""
+        body = (
+            json.dumps(lead("Şirket A"), ensure_ascii=False)
+            + "\n\nnot json\n[1, 2]\n"
+            + json.dumps(lead("Şirket B"), ensure_ascii=False)
+        ).encode("utf-8")
+        rows = await collect(iter_ndjson(stream(body, 7)))
+
+        self.assertEqual([row[0] for row in rows], [1, 3, 4, 5])
+        self.assertEqual(rows[0][1]["name"], "Şirket A")
+        self.assertIn("Invalid JSON", rows[1][2])
+        self.assertEqual(rows[2][2], "Each line must be a JSON object")
+        self.assertEqual(rows[3][1]["name"], "Şirket B")
+
+    async def test_csv_quoted_newlines_and_bad_rows(self):
+        """Test quoted fields may contain newlines and short rows are reported"""
+        body = (
+            "﻿name,industry,notes\r\n"
+            'Acme,Fintech,"first line\nsecond, line"\r\n'
+            "Globex\r\n"
+            "Initech,SaaS,plain\r\n"
+        ).encode("utf-8")
+        rows = await collect(iter_csv(stream(body, 5)))
+
+        self.assertEqual(rows[0][1]["notes"], "first line\nsecond, line")
+        self.assertEqual(rows[1], (4, None, "Expected 3 columns, got 1"))
+        self.assertEqual(
+            rows[2][1], {"name": "Initech", "industry": "SaaS", "notes": "plain"}
+        )
+
+    async def test_oversized_line_is_rejected(self):
+        """Test an unterminated huge line fails instead of buffering forever"""
+        with self.assertRaises(LeadIngestError):
+            await collect(iter_ndjson(stream(b"x" * 200, 50), max_line_bytes=100))
+
+    def test_detect_format(self):
+        """Test format comes from the query parameter or Content-Type"""
+        self.assertEqual(detect_format("text/csv; charset=utf-8"), "csv")
+        self.assertEqual(detect_format("application/x-ndjson"), "ndjson")
+        self.assertEqual(detect_format("application/json", "csv"), "csv")
+        with self.assertRaises(LeadIngestError):
+            detect_format("application/json")
+
+
+class TestValidation(unittest.TestCase):
+    """DATA_QUALITY_STANDARDS doğrulama testleri"""
+
+    def test_valid_lead_maps_to_table_columns(self):
+        """Test standard field names map onto collected_leads columns"""
+        row, errors = validate_lead(lead("Acme", website="https://acme.io"))
+        self.assertEqual(errors, [])
+        self.assertEqual(row["company_name"], "Acme")
+        self.assertEqual(row["source"], "bulk_import")
+        self.assertNotIn("website", row)
+
+    def test_invalid_lead_lists_every_problem(self):
+        """Test missing fields and out-of-range values are all reported"""
+        row, errors = validate_lead(
+            {
+                "name": "Acme",
+                "industry": "Mining",
+                "company_size": "lots",
+                "website": "acme",
+            }
+        )
+        self.assertIsNone(row)
+        self.assertIn("location is required", errors)
+        self.assertIn("funder is required", errors)
+        self.assertTrue(any(e.startswith("industry must be one of") for e in errors))
+        self.assertTrue(
+            any(e.startswith("company_size must be one of") for e in errors)
+        )
+        self.assertIn("website must be a valid URL or N/A", errors)
+
+
+class TestIngest(unittest.IsolatedAsyncioTestCase):
+    """Batch'li ekleme testleri"""
+
+    async def test_batches_and_per_row_errors(self):
+        """Test valid rows are inserted in batches and failures are reported per row"""
+        records = [lead(f"Company {i}") for i in range(7)]
+        records[2] = lead("Broken", industry="Mining")
+        body = "\n".join(json.dumps(r) for r in records).encode("utf-8")
+        batches = []
+
+        async def insert_batch(rows):
+            batches.append(rows)
+            if len(batches) == 2:
+                raise RuntimeError("db down")
+            return len(rows)
+
+        report = await ingest_leads(
+            iter_ndjson(stream(body, 64)), insert_batch, batch_size=4
+        )
+
+        self.assertEqual([len(b) for b in batches], [4, 2])
+        self.assertEqual(report["received"], 7)
+        self.assertEqual(report["inserted"], 4)
+        self.assertEqual(report["failed"], 3)
+        self.assertEqual(report["batches"], 2)
+        self.assertEqual([e["row"] for e in report["errors"]], [3, 6, 7])
+        self.assertIn("Batch insert failed: db down", report["errors"][1]["error"])
+        self.assertGreater(report["rows_per_second"], 0)
+
+    async def test_error_list_is_capped(self):
+        """Test the response does not grow with the number of bad rows"""
+        body = b"\n".join(b"{}" for _ in range(20))
+
+        async def insert_batch(rows):
+            return len(rows)
+
+        report = await ingest_leads(
+            iter_ndjson(stream(body, 16)), insert_batch, max_errors=5
+        )
+        self.assertEqual(report["failed"], 20)
+        self.assertEqual(len(report["errors"]), 5)
+        self.assertTrue(report["errors_truncated"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+LLM Cache Tests
+LLMResponseCache'in anahtar normalizasyonunu, TTL, byte bütçesi ve
+disk katmanı davranışını; SingleFlight'ın hata ve iptal paylaşımını doğrular.
+"""
+
+import asyncio
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from threading import current_thread, main_thread
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from llm_cache import LLMResponseCache, SingleFlight
+
+
+class FakeClock:
+    """Test için elle ilerletilen saat"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def response(text: str) -> list:
+    return [{"model": "Google Gemini", "llm_response": text, "status": "success"}]
+
+
+class TestLLMResponseCache(unittest.TestCase):
+    """Bellek katmanı testleri"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = LLMResponseCache(
+            ttl=60, max_bytes=1024, disk_dir=None, clock=self.clock
+        )
+
+    def test_key_normalizes_message_and_filters(self):
+        """Test whitespace/case and filter ordering do not change the key"""
+        key = LLMResponseCache.key("m", "Hello  World", {"a": 1, "b": 2})
+        self.assertEqual(
+            key, LLMResponseCache.key("m", " hello world ", {"b": 2, "a": 1})
+        )
+        self.assertNotEqual(
+            key, LLMResponseCache.key("other", "hello world", {"a": 1, "b": 2})
+        )
+        self.assertNotEqual(
+            key, LLMResponseCache.key("m", "hello world", {"a": 2, "b": 2})
+        )
+
+    def test_entries_expire_after_ttl(self):
+        """Test expired entries are dropped and counted as misses"""
+        self.cache.set("k", response("answer"))
+        self.assertEqual(self.cache.get("k")[0]["llm_response"], "answer")
+
+        self.clock.now += 61
+        self.assertIsNone(self.cache.get("k"))
+        stats = self.cache.stats()
+        self.assertEqual(
+            (stats["hits"], stats["misses"], stats["expirations"]), (1, 1, 1)
+        )
+        self.assertEqual(stats["bytes"], 0)
+
+    def test_byte_budget_evicts_least_recently_used(self):
+        """Test the total size stays within max_bytes using LRU order"""
+        for name in ("a", "b", "c"):
+            self.cache.set(name, response(name * 250))
+        self.cache.get("a")
+        self.cache.set("d", response("d" * 250))
+
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        stats = self.cache.stats()
+        self.assertLessEqual(stats["bytes"], 1024)
+        self.assertEqual(stats["evictions"], 1)
+
+    def test_oversized_and_disabled(self):
+        """Test entries over budget and ttl=0 are never stored"""
+        self.cache.set("big", response("x" * 2000))
+        self.assertIsNone(self.cache.get("big"))
+
+        disabled = LLMResponseCache(ttl=0, disk_dir=None)
+        disabled.set("k", response("answer"))
+        self.assertIsNone(disabled.get("k"))
+
+    def test_hits_do_not_mutate_cached_value(self):
+        """Test callers get marked copies, not the stored entries"""
+        self.cache.set("k", response("answer"))
+        first = self.cache.get("k")
+        first[0]["llm_response"] = "changed"
+        self.assertEqual(self.cache.get("k")[0]["llm_response"], "answer")
+        self.assertTrue(first[0]["cached"])
+
+
+class TestDiskTier(unittest.TestCase):
+    """Disk katmanı testleri"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_cache(self) -> LLMResponseCache:
+        return LLMResponseCache(ttl=60, disk_dir=self.tmp.name, clock=self.clock)
+
+    def test_disk_entries_survive_new_instance(self):
+        """Test a restarted process reads answers from the disk tier"""
+        self.make_cache().set("k", response("answer"))
+
+        cache = self.make_cache()
+        self.assertEqual(cache.get("k")[0]["llm_response"], "answer")
+        self.assertEqual(cache.get("k")[0]["llm_response"], "answer")
+        stats = cache.stats()
+        self.assertEqual((stats["disk_hits"], stats["hits"]), (1, 1))
+
+    def test_prune_disk_removes_expired_entries(self):
+        """Test expired disk records are ignored and pruned"""
+        cache = self.make_cache()
+        cache.set("old", response("old"))
+        self.clock.now += 61
+        cache.set("new", response("new"))
+
+        self.assertIsNone(self.make_cache().get("old"))
+        self.assertEqual(cache.prune_disk(), 1)
+        self.assertEqual(
+            sorted(p.name for p in Path(self.tmp.name).glob("*.json")), ["new.json"]
+        )
+
+    def test_corrupt_disk_entry_is_a_miss(self):
+        """Test a torn disk record is treated as a miss and pruned"""
+        cache = self.make_cache()
+        (Path(self.tmp.name) / "torn.json").write_text('{"expires_at": 9', "utf-8")
+
+        self.assertIsNone(cache.get("torn"))
+        self.assertEqual(cache.prune_disk(), 1)
+
+    def test_async_disk_tier_runs_off_the_event_loop(self):
+        """Test aget/aset read and write the disk tier in worker threads"""
+        cache = self.make_cache()
+        threads = []
+        read_disk, write_disk = cache._read_disk, cache._write_disk
+        cache._read_disk = lambda *a: threads.append(current_thread()) or read_disk(*a)
+        cache._write_disk = lambda *a: threads.append(current_thread()) or write_disk(
+            *a
+        )
+
+        async def run():
+            await cache.aset("k", response("answer"))
+            cache.clear()
+            first = await cache.aget("k")
+            return first, await cache.aget("k")
+
+        first, second = asyncio.run(run())
+        self.assertEqual(first[0]["llm_response"], "answer")
+        self.assertEqual(second[0]["llm_response"], "answer")
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(main_thread(), threads)
+        stats = cache.stats()
+        self.assertEqual((stats["disk_hits"], stats["hits"]), (1, 1))
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    """SingleFlight testleri"""
+
+    async def test_errors_are_shared_and_key_is_released(self):
+        """Test joiners see the leader's error and the next call starts fresh"""
+        flight, started = SingleFlight(), []
+
+        async def failing():
+            started.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(
+            flight.run("k", failing), flight.run("k", failing), return_exceptions=True
+        )
+        self.assertEqual(len(started), 1)
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+        self.assertFalse(flight.in_flight("k"))
+
+        async def ok():
+            return "answer"
+
+        self.assertEqual(await flight.run("k", ok), "answer")
+        self.assertEqual(flight.stats(), {"in_flight": 0, "calls": 2, "coalesced": 1})
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Test cancelling the first caller leaves the shared call running"""
+        flight = SingleFlight()
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            return "answer"
+
+        leader = asyncio.ensure_future(flight.run("k", slow))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.run("k", slow))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        self.assertEqual(await follower, "answer")
+        self.assertTrue(leader.cancelled())
+
+    async def test_last_waiter_cancels_shared_call(self):
+        """Test the upstream call is cancelled once nobody waits for it"""
+        flight, finished = SingleFlight(), []
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            finished.append(1)
+
+        waiter = asyncio.ensure_future(flight.run("k", slow))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(finished, [])
+        self.assertFalse(flight.in_flight("k"))
+
+
+if __name__ == "__main__":
+    unittest.main()
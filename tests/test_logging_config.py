@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Logging Config Tests
+Kuyruk tabanlı logger'ın seviye filtresini, arka plan yazıcısını ve
+dolu kuyruk davranışını doğrular.
+"""
+
+import io
+import logging
+import queue
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from logging_config import (
+    NonBlockingQueueHandler,
+    logging_stats,
+    setup_logging,
+    shutdown_logging,
+)
+
+
+class CountingPayload:
+    """str() çağrılarını sayan log argümanı"""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self) -> str:
+        self.formatted += 1
+        return "payload"
+
+
+class TestLoggingConfig(unittest.TestCase):
+    """setup_logging testleri"""
+
+    def setUp(self):
+        self.root_level = logging.getLogger().level
+        self.stream = io.StringIO()
+        setup_logging("INFO", stream=self.stream)
+        self.logger = logging.getLogger("tests.logging_config")
+
+    def tearDown(self):
+        shutdown_logging()
+        logging.getLogger().setLevel(self.root_level)
+
+    def test_records_are_written_by_background_listener(self):
+        """Test enabled records reach the stream once the queue is drained"""
+        self.logger.info("✅ saved %s rows", 3)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            self.logger.exception("❌ failed")
+        shutdown_logging()
+
+        output = self.stream.getvalue()
+        self.assertIn("INFO    tests.logging_config: ✅ saved 3 rows", output)
+        self.assertIn("ValueError: boom", output)
+
+    def test_disabled_levels_are_never_formatted(self):
+        """Test debug payloads cost nothing when LOG_LEVEL is INFO"""
+        payload = CountingPayload()
+        for _ in range(100):
+            self.logger.debug("📝 payload: %s", payload)
+        shutdown_logging()
+
+        self.assertEqual(payload.formatted, 0)
+        self.assertEqual(self.stream.getvalue(), "")
+
+    def test_setup_is_idempotent(self):
+        """Test repeated setup does not add duplicate handlers"""
+        handlers = len(logging.getLogger().handlers)
+        setup_logging("WARNING")
+        self.assertEqual(len(logging.getLogger().handlers), handlers)
+        self.assertEqual(logging_stats()["level"], "WARNING")
+
+
+class TestNonBlockingQueueHandler(unittest.TestCase):
+    """Dolu kuyruk testleri"""
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test a stalled writer never blocks the caller"""
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+        logger = logging.getLogger("tests.logging_config.full")
+        logger.propagate = False
+        logger.addHandler(handler)
+        try:
+            for i in range(5):
+                logger.warning("message %s", i)
+        finally:
+            logger.removeHandler(handler)
+
+        self.assertEqual(handler.queue.qsize(), 2)
+        self.assertEqual(handler.dropped, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
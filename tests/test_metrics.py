@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Metrics Tests
+Counter/Gauge/Histogram davranışını, Prometheus çıktısını ve veritabanı
+sorgu enstrümantasyonunu doğrular.
+"""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+
+import httpx
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+
+from metrics import (
+    DB_QUERY_ERRORS,
+    DB_QUERY_SECONDS,
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+)
+from supabase_database import AsyncSupabaseDatabaseManager
+
+
+class TestMetricTypes(unittest.TestCase):
+    """Metrik tipleri ve exposition formatı testleri"""
+
+    def setUp(self):
+        self.registry = Registry()
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test observations land in inclusive, cumulative buckets"""
+        histogram = Histogram(
+            "latency_seconds",
+            "Latency",
+            ("route",),
+            buckets=(0.1, 1.0),
+            registry=self.registry,
+        )
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, "/api/x")
+
+        snapshot = histogram.snapshot("/api/x")
+        self.assertEqual(list(snapshot["buckets"].values()), [2, 3, 4])
+        self.assertEqual(snapshot["count"], 4)
+        self.assertAlmostEqual(snapshot["sum"], 3.65)
+
+    def test_render_prometheus_text(self):
+        """Test the registry renders HELP/TYPE lines and escaped labels"""
+        counter = Counter(
+            "requests_total", "Requests", ("route",), registry=self.registry
+        )
+        gauge = Gauge("in_flight", "In flight", registry=self.registry)
+        histogram = Histogram(
+            "db_seconds", "DB", buckets=(0.5,), registry=self.registry
+        )
+        counter.inc('/a"b')
+        counter.inc('/a"b', amount=2)
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+        histogram.observe(0.25)
+
+        text = self.registry.render()
+        self.assertIn("# TYPE requests_total counter", text)
+        self.assertIn('requests_total{route="/a\\"b"} 3', text)
+        self.assertIn("in_flight 1", text)
+        self.assertIn('db_seconds_bucket{le="0.5"} 1', text)
+        self.assertIn('db_seconds_bucket{le="+Inf"} 1', text)
+        self.assertIn("db_seconds_count 1", text)
+
+    def test_label_count_is_checked(self):
+        """Test wrong label arity fails loudly instead of mixing series"""
+        counter = Counter("c_total", "C", ("a", "b"), registry=self.registry)
+        with self.assertRaises(ValueError):
+            counter.inc("only-one")
+        with self.assertRaises(ValueError):
+            Counter("c_total", "Duplicate", registry=self.registry)
+
+
+class TestDatabaseInstrumentation(unittest.IsolatedAsyncioTestCase):
+    """execute_query metrik testleri"""
+
+    async def test_execute_query_records_latency_and_errors(self):
+        """Test each query is timed per table/operation and failures are counted"""
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "DELETE":
+                return httpx.Response(
+                    500,
+                    json={
+                        "code": "XX000",
+                        "details": None,
+                        "hint": None,
+                        "message": "boom",
+                    },
+                )
+            return httpx.Response(200, json=[{"id": 1}])
+
+        manager = AsyncSupabaseDatabaseManager("http://supabase.test", "test-anon-key")
+        manager.client.session = httpx.AsyncClient(
+            base_url="http://supabase.test/rest/v1",
+            headers=manager.client.session.headers,
+            transport=httpx.MockTransport(handler),
+        )
+        before = DB_QUERY_SECONDS.snapshot("metrics_probe", "select")["count"]
+        errors_before = DB_QUERY_ERRORS.value("metrics_probe", "delete")
+
+        await manager.execute_query("metrics_probe", "select")
+        await manager.execute_query("metrics_probe", "select")
+        self.assertEqual(
+            await manager.execute_query("metrics_probe", "delete", {"id": 1}), []
+        )
+        await manager.aclose()
+
+        self.assertEqual(
+            DB_QUERY_SECONDS.snapshot("metrics_probe", "select")["count"], before + 2
+        )
+        self.assertEqual(
+            DB_QUERY_ERRORS.value("metrics_probe", "delete"), errors_before + 1
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Quota Backends Tests
+Kota backend'lerinin paylaşımını, SharedQuota'nın artışları biriktirip
+senkronize etmesini ve hata durumunda artış kaybetmemesini doğrular.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from quota_backends import (
+    MemoryQuotaBackend,
+    QuotaBackend,
+    SharedQuota,
+    SQLiteQuotaBackend,
+    SupabaseQuotaBackend,
+    create_quota_backend,
+)
+from real_data_collector import RealDataCollector
+
+
+class FakeClock:
+    """Test için elle ilerletilen saat"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRpcDatabase:
+    """llm_quota_sync çağrılarını kaydeden sahte veritabanı"""
+
+    def __init__(self):
+        self.calls = []
+        self.totals = {}
+        self.fail = False
+
+    async def rpc(self, function_name: str, params: dict):
+        if self.fail:
+            raise ConnectionError("supabase down")
+        self.calls.append((function_name, params))
+        for service, amount in params["p_deltas"].items():
+            self.totals[service] = self.totals.get(service, 0) + amount
+        return [
+            {"quota_service": s, "used": self.totals[s]} for s in params["p_deltas"]
+        ]
+
+
+class TestSQLiteQuotaBackend(unittest.IsolatedAsyncioTestCase):
+    """Tek host paylaşımı testleri"""
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "quota.sqlite3")
+        self.clock = FakeClock()
+
+    async def asyncTearDown(self):
+        self.tmp.cleanup()
+
+    def make_quota(self) -> SharedQuota:
+        backend = SQLiteQuotaBackend(self.path, window=3600, clock=self.clock)
+        return SharedQuota(backend, ("google", "openrouter"))
+
+    async def test_workers_share_the_counter(self):
+        """Test two workers on the same file see each other's usage"""
+        worker_a, worker_b = self.make_quota(), self.make_quota()
+        for _ in range(3):
+            worker_a.add("google")
+        worker_b.add("google")
+        self.assertEqual(worker_a.count("google"), 3)
+
+        await worker_a.sync()
+        await worker_b.sync()
+        await worker_a.sync()
+        self.assertEqual(worker_a.count("google"), 4)
+        self.assertEqual(worker_b.count("google"), 4)
+        self.assertEqual(worker_b.count("openrouter"), 0)
+
+    async def test_window_expiry(self):
+        """Test buckets older than the window stop counting"""
+        quota = self.make_quota()
+        quota.add("google", 5)
+        await quota.sync()
+        self.clock.now += 3600
+        await quota.sync()
+        self.assertEqual(quota.count("google"), 0)
+
+
+class TestSharedQuota(unittest.IsolatedAsyncioTestCase):
+    """Biriktirme ve senkron testleri"""
+
+    async def test_increments_are_batched(self):
+        """Test many local increments become a single sync call"""
+        db = FakeRpcDatabase()
+        quota = SharedQuota(SupabaseQuotaBackend(db), ("google", "openrouter"))
+        for _ in range(10):
+            quota.add("google")
+        self.assertEqual(db.calls, [])
+
+        await quota.sync()
+        self.assertEqual(len(db.calls), 1)
+        self.assertEqual(db.calls[0][0], "llm_quota_sync")
+        self.assertEqual(db.calls[0][1], {"p_deltas": {"google": 10, "openrouter": 0}})
+        self.assertEqual(quota.count("google"), 10)
+        self.assertEqual(quota.stats()["pending"], {"google": 0, "openrouter": 0})
+
+    async def test_failed_sync_keeps_pending_increments(self):
+        """Test increments survive a failed sync and are sent later"""
+        db = FakeRpcDatabase()
+        quota = SharedQuota(SupabaseQuotaBackend(db), ("google",))
+        quota.add("google", 2)
+        db.fail = True
+        with self.assertLogs("quota_backends", "WARNING"):
+            self.assertFalse(await quota.sync())
+        self.assertEqual(quota.count("google"), 2)
+
+        db.fail = False
+        quota.add("google")
+        self.assertTrue(await quota.sync())
+        self.assertEqual(db.totals, {"google": 3})
+        self.assertEqual(quota.stats()["sync_errors"], 1)
+
+    async def test_memory_backend_is_immediate(self):
+        """Test the default backend counts without syncing"""
+        quota = SharedQuota(MemoryQuotaBackend(), ("google",))
+        quota.add("google")
+        self.assertEqual(quota.count("google"), 1)
+
+    def test_shared_backends_have_no_local_counters(self):
+        """Test the local-counter methods are explicit on the interface"""
+        backend = SupabaseQuotaBackend(FakeRpcDatabase())
+        self.assertFalse(backend.local)
+        with self.assertRaises(RuntimeError):
+            backend.add_local("google")
+        with self.assertRaises(RuntimeError):
+            backend.total_local("google")
+        with self.assertRaises(TypeError):
+            QuotaBackend()
+
+    def test_supabase_requires_service_role_key(self):
+        """Test the supabase backend is not used with the public anon key"""
+        with mock.patch.dict(os.environ, {"SUPABASE_SERVICE_ROLE_KEY": ""}):
+            with self.assertRaises(ValueError):
+                SupabaseQuotaBackend()
+            with self.assertLogs("quota_backends", "ERROR"):
+                backend = create_quota_backend("supabase")
+        self.assertEqual(backend.name, "memory")
+
+        with mock.patch.dict(os.environ, {"SUPABASE_SERVICE_ROLE_KEY": "service-key"}):
+            backend = SupabaseQuotaBackend()
+        self.assertEqual(backend.db.api_key, "service-key")
+
+
+class TestCollectorSharedQuota(unittest.IsolatedAsyncioTestCase):
+    """İki collector'ın (iki worker) ortak kotası"""
+
+    async def test_collectors_share_daily_quota(self):
+        """Test a quota exhausted by one worker blocks the other after sync"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "quota.sqlite3")
+            workers = []
+            for _ in range(2):
+                collector = RealDataCollector()
+                collector.daily_quotas["google"] = 2
+                collector.quota = SharedQuota(
+                    SQLiteQuotaBackend(path), collector.daily_quotas
+                )
+                workers.append(collector)
+
+            workers[0]._increment_request_count("google")
+            workers[1]._increment_request_count("google")
+            self.assertTrue(workers[0]._check_rate_limit("google"))
+
+            # İkinci tur, ilk turda diğer worker'ın gönderdiğini okur
+            for collector in workers + workers:
+                await collector.quota.sync()
+            for collector in workers:
+                self.assertFalse(collector._check_rate_limit("google"))
+            status = workers[0].get_collection_status()
+            self.assertEqual(status["google_gemini"]["quota_used"], 2)
+            self.assertEqual(status["quota_backend"]["backend"], "sqlite")
+
+    async def test_aclose_waits_for_in_flight_sync(self):
+        """Test shutdown's final sync runs after the periodic one is cancelled"""
+
+        class SlowBackend(QuotaBackend):
+            name = "slow"
+
+            def __init__(self):
+                self.entered = asyncio.Event()
+                self.active = self.max_active = 0
+                self.totals = {}
+
+            async def sync(self, deltas):
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+                try:
+                    if not self.entered.is_set():
+                        self.entered.set()
+                        await asyncio.Event().wait()
+                    for service, amount in deltas.items():
+                        self.totals[service] = self.totals.get(service, 0) + amount
+                    return dict(self.totals)
+                finally:
+                    self.active -= 1
+
+        backend = SlowBackend()
+        collector = RealDataCollector()
+        collector.quota = SharedQuota(backend, ("google",))
+        collector.quota.add("google")
+        collector._quota_sync_task = asyncio.ensure_future(collector.quota.run())
+        await backend.entered.wait()
+
+        await collector.aclose()
+        self.assertEqual(backend.max_active, 1)
+        self.assertEqual(backend.totals, {"google": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
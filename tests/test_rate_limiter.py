@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter Tests
+SlidingWindowCounter'ın bucket'lı pencere davranışını ve RateLimiter'ın
+anahtar başına limitlerini doğrular.
+"""
+
+import os
+import sys
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+
+from starlette.requests import Request
+
+import main
+from rate_limiter import RateLimiter, SlidingWindowCounter
+from real_data_collector import RealDataCollector
+
+
+class FakeClock:
+    """Test için elle ilerletilen saat"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSlidingWindowCounter(unittest.TestCase):
+    """Kayan pencere sayacı testleri"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.counter = SlidingWindowCounter(
+            window=3600, bucket_seconds=60, clock=self.clock
+        )
+
+    def test_counts_expire_bucket_by_bucket(self):
+        """Test requests leave the window one minute bucket at a time"""
+        self.counter.add()
+        self.clock.now += 30 * 60
+        self.counter.add(2)
+        self.assertEqual(self.counter.count(), 3)
+
+        self.clock.now += 30 * 60
+        self.assertEqual(self.counter.count(), 2)
+        self.clock.now += 30 * 60
+        self.assertEqual(self.counter.count(), 0)
+
+    def test_long_idle_gap_resets(self):
+        """Test a gap longer than the window clears every bucket"""
+        for _ in range(5):
+            self.counter.add()
+            self.clock.now += 60
+        self.clock.now += 10 * 3600
+        self.assertEqual(self.counter.count(), 0)
+        self.counter.add()
+        self.assertEqual(self.counter.count(), 1)
+
+    def test_clock_going_back_keeps_current_bucket(self):
+        """Test a backwards clock step does not corrupt the total"""
+        self.counter.add()
+        self.clock.now -= 600
+        self.counter.add()
+        self.assertEqual(self.counter.count(), 2)
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Anahtar başına limit testleri"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = RateLimiter(limit=2, window=3600, clock=self.clock)
+
+    def test_limits_are_per_key(self):
+        """Test one user exhausting the limit does not affect another"""
+        self.assertTrue(self.limiter.try_acquire("user:a"))
+        self.assertTrue(self.limiter.try_acquire("user:a"))
+        self.assertFalse(self.limiter.try_acquire("user:a"))
+        self.assertTrue(self.limiter.try_acquire("user:b"))
+        self.assertEqual(
+            self.limiter.usage("user:a"), {"used": 2, "limit": 2, "remaining": 0}
+        )
+
+        self.clock.now += 3600
+        self.assertTrue(self.limiter.allow("user:a"))
+
+    def test_disabled_limiter_tracks_nothing(self):
+        """Test limit=0 allows everything without keeping counters"""
+        limiter = RateLimiter(limit=0)
+        for _ in range(5):
+            self.assertTrue(limiter.try_acquire("user:a"))
+        self.assertEqual(len(limiter), 0)
+
+    def test_max_keys_prunes_idle_counters(self):
+        """Test the key table stays bounded"""
+        limiter = RateLimiter(limit=5, window=3600, max_keys=3, clock=self.clock)
+        for key in ("a", "b", "c"):
+            limiter.hit(key)
+        self.clock.now += 3600
+        limiter.hit("d")
+        self.assertEqual(len(limiter), 1)
+
+        for key in ("e", "f", "g"):
+            limiter.hit(key)
+        self.assertLessEqual(len(limiter), 3)
+
+    def test_limited_key_survives_key_churn(self):
+        """Test rotating keys cannot evict a client that is over the limit"""
+        limiter = RateLimiter(limit=2, window=3600, max_keys=3, clock=self.clock)
+        limiter.hit("abuser", amount=2)
+        self.assertFalse(limiter.try_acquire("abuser"))
+
+        for i in range(20):
+            self.assertTrue(limiter.try_acquire(f"rotating:{i}"))
+        self.assertFalse(limiter.try_acquire("abuser"))
+        self.assertLessEqual(len(limiter), 3)
+
+    def test_recently_used_keys_are_evicted_last(self):
+        """Test eviction under the limit is least recently used first"""
+        limiter = RateLimiter(limit=5, window=3600, max_keys=3, clock=self.clock)
+        for key in ("a", "b", "c"):
+            limiter.hit(key)
+        limiter.hit("a")
+        limiter.hit("d")
+        self.assertEqual(limiter.usage("a")["used"], 2)
+        self.assertEqual(limiter.usage("b")["used"], 0)
+
+
+class TestCollectorQuotas(unittest.TestCase):
+    """RealDataCollector kota entegrasyonu testleri"""
+
+    def test_service_quota_uses_sliding_window(self):
+        """Test the daily quota blocks once used and reports usage"""
+        collector = RealDataCollector()
+        collector.daily_quotas["google"] = 2
+        for _ in range(2):
+            self.assertTrue(collector._check_rate_limit("google"))
+            collector._increment_request_count("google")
+        self.assertFalse(collector._check_rate_limit("google"))
+
+        status = collector.get_collection_status()["google_gemini"]
+        self.assertEqual((status["quota_used"], status["quota_remaining"]), (2, 0))
+
+    def test_user_limit(self):
+        """Test per-user chat limits"""
+        collector = RealDataCollector()
+        collector.user_limiter = RateLimiter(limit=1)
+        self.assertTrue(collector.allow_user("ip:1.2.3.4"))
+        self.assertFalse(collector.allow_user("ip:1.2.3.4"))
+        self.assertTrue(collector.allow_user("user:42"))
+
+
+def make_request(headers: dict, client: str = "10.0.0.1") -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "path": "/api/chat",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+            "client": (client, 12345),
+        }
+    )
+
+
+class TestRateLimitKey(unittest.IsolatedAsyncioTestCase):
+    """Chat limiti anahtarı testleri"""
+
+    async def test_forwarded_for_is_ignored_without_trusted_proxy(self):
+        """Test a spoofed X-Forwarded-For does not change the key"""
+        with mock.patch.object(main, "TRUSTED_PROXY_HOPS", 0):
+            key = await main.rate_limit_key(
+                make_request({"X-Forwarded-For": "1.2.3.4"})
+            )
+        self.assertEqual(key, "ip:10.0.0.1")
+
+    async def test_trusted_proxy_hop_is_used(self):
+        """Test the entry appended by the trusted proxy wins over client-set hops"""
+        request = make_request({"X-Forwarded-For": "6.6.6.6, 203.0.113.7"})
+        with mock.patch.object(main, "TRUSTED_PROXY_HOPS", 1):
+            self.assertEqual(await main.rate_limit_key(request), "ip:203.0.113.7")
+        with mock.patch.object(main, "TRUSTED_PROXY_HOPS", 3):
+            self.assertEqual(await main.rate_limit_key(request), "ip:10.0.0.1")
+
+    async def test_token_is_verified_off_the_event_loop(self):
+        """Test a token cache miss runs verify_token in a worker thread"""
+        threads = []
+
+        def verify(token):
+            threads.append(threading.current_thread())
+            return {"sub": "42"}
+
+        request = make_request({"Authorization": "Bearer uncached-token"})
+        with mock.patch.object(main.auth_service, "verify_token", side_effect=verify):
+            self.assertEqual(await main.rate_limit_key(request), "user:42")
+        self.assertIsNot(threads[0], threading.main_thread())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Real Data Collector Tests
+LLM çağrılarının yerel stub sunucusuna karşı davranışını test eder.
+"""
+
+import asyncio
+import contextlib
+import io
+import sys
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from benchmarks.stub_server import STUB_STREAM_TOKENS, StubServer
+from circuit_breaker import AdaptiveTimeout
+from llm_cache import LLMResponseCache
+from metrics import (
+    LLM_HEDGES,
+    LLM_REQUEST_SECONDS,
+    LLM_REQUESTS,
+    LLM_STRATEGY_SECONDS,
+    LLM_TIME_TO_FIRST_TOKEN,
+)
+from real_data_collector import RealDataCollector
+
+
+def make_collector(
+    server: StubServer, cache: LLMResponseCache = None
+) -> RealDataCollector:
+    """Stub sunucusuna yönlendirilmiş collector oluştur (varsayılan: cache kapalı)"""
+    collector = RealDataCollector()
+    collector.openrouter_url = f"{server.base_url}/api/v1/chat/completions"
+    collector.gemini_base_url = f"{server.base_url}/v1beta"
+    collector.response_cache = cache or LLMResponseCache(ttl=0)
+    return collector
+
+
+class TestSharedHttpClient(unittest.IsolatedAsyncioTestCase):
+    """Paylaşılan, havuzlu HTTP client testleri"""
+
+    async def asyncSetUp(self):
+        self.server = StubServer(use_tls=False)
+        await self.server.start()
+        self.collector = make_collector(self.server)
+
+    async def asyncTearDown(self):
+        await self.collector.aclose()
+        await self.server.stop()
+
+    async def test_chat_calls_reuse_pooled_connections(self):
+        """Test repeated chats reuse keep-alive connections"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            await self.collector.startup()
+            client = self.collector._http_client
+            for _ in range(5):
+                results = await self.collector.collect_startup_data({}, "ping")
+                self.assertEqual(len(results["llm_analysis"]), 2)
+
+        self.assertIs(self.collector._http_client, client)
+        self.assertEqual(self.server.requests, 10)
+        self.assertLessEqual(self.server.connections, 2)
+
+    async def test_aclose_releases_client(self):
+        """Test shutdown closes the pool and a later call reopens it"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            await self.collector.startup()
+            await self.collector.aclose()
+            self.assertIsNone(self.collector._http_client)
+
+            results = await self.collector._try_openrouter_gpt_oss({}, [], "ping")
+        self.assertEqual(results[0]["status"], "success")
+
+    async def test_llm_calls_record_latency_and_outcome(self):
+        """Test per-model latency and outcome counters are updated"""
+        calls = LLM_REQUEST_SECONDS.snapshot("Google Gemini")["count"]
+        successes = LLM_REQUESTS.value("Google Gemini", "success")
+        with contextlib.redirect_stdout(io.StringIO()):
+            await self.collector._try_google_gemini({}, [], "ping")
+
+        self.assertEqual(
+            LLM_REQUEST_SECONDS.snapshot("Google Gemini")["count"], calls + 1
+        )
+        self.assertEqual(LLM_REQUESTS.value("Google Gemini", "success"), successes + 1)
+
+
+class TestResponseCache(unittest.IsolatedAsyncioTestCase):
+    """LLM yanıt cache'i entegrasyon testleri"""
+
+    async def asyncSetUp(self):
+        self.server = StubServer(use_tls=False)
+        await self.server.start()
+        self.collector = make_collector(self.server, LLMResponseCache(disk_dir=None))
+
+    async def asyncTearDown(self):
+        await self.collector.aclose()
+        await self.server.stop()
+
+    async def test_repeated_prompt_is_served_from_cache(self):
+        """Test a repeated question costs no upstream calls or quota"""
+        hits = LLM_REQUESTS.value("GPT-OSS-20B", "cache_hit")
+        with contextlib.redirect_stdout(io.StringIO()):
+            first = await self.collector.collect_startup_data({}, "Which startups?")
+            second = await self.collector.collect_startup_data(
+                {}, "  which   STARTUPS? "
+            )
+
+        self.assertEqual(self.server.requests, 2)
+        self.assertNotIn("cached", first["llm_analysis"][0])
+        self.assertTrue(all(item["cached"] for item in second["llm_analysis"]))
+        self.assertEqual(
+            [item["llm_response"] for item in second["llm_analysis"]],
+            [item["llm_response"] for item in first["llm_analysis"]],
+        )
+        self.assertEqual(LLM_REQUESTS.value("GPT-OSS-20B", "cache_hit"), hits + 1)
+
+        status = self.collector.get_collection_status()
+        self.assertEqual(status["openrouter"]["quota_used"], 1)
+        self.assertEqual(status["google_gemini"]["quota_used"], 1)
+        self.assertEqual(status["response_cache"]["hits"], 2)
+        self.assertEqual(status["response_cache"]["misses"], 2)
+
+    async def test_errors_are_not_cached(self):
+        """Test failed upstream calls are retried on the next request"""
+        self.server.responder = lambda method, path, body: (500, {"error": "boom"})
+        with contextlib.redirect_stdout(io.StringIO()):
+            await self.collector._try_openrouter_gpt_oss({}, [], "ping")
+            await self.collector._try_openrouter_gpt_oss({}, [], "ping")
+
+        self.assertEqual(self.server.requests, 2)
+        self.assertEqual(self.collector.response_cache.stats()["entries"], 0)
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    """Eşzamanlı aynı soruların birleştirilmesi testleri"""
+
+    async def asyncSetUp(self):
+        self.server = StubServer(use_tls=False, latency=0.1)
+        await self.server.start()
+        # Cache kapalı: tasarruf yalnızca single-flight'tan gelmeli
+        self.collector = make_collector(self.server)
+
+    async def asyncTearDown(self):
+        await self.collector.aclose()
+        await self.server.stop()
+
+    async def test_concurrent_identical_prompts_share_one_upstream_call(self):
+        """Test N concurrent callers produce one upstream call per model"""
+        callers = 20
+        coalesced = LLM_REQUESTS.value("Google Gemini", "coalesced")
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = await asyncio.gather(
+                *[
+                    self.collector.collect_startup_data({}, "Demo question")
+                    for _ in range(callers)
+                ]
+            )
+
+        self.assertEqual(self.server.requests, 2)
+        for result in results:
+            self.assertEqual(
+                [item["status"] for item in result["llm_analysis"]],
+                ["success", "success"],
+            )
+        status = self.collector.get_collection_status()
+        self.assertEqual(status["google_gemini"]["quota_used"], 1)
+        self.assertEqual(status["single_flight"]["coalesced"], 2 * (callers - 1))
+        self.assertEqual(status["single_flight"]["in_flight"], 0)
+        self.assertEqual(
+            LLM_REQUESTS.value("Google Gemini", "coalesced"), coalesced + callers - 1
+        )
+
+    async def test_different_prompts_are_not_coalesced(self):
+        """Test only identical prompts share a call"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            await asyncio.gather(
+                self.collector._try_google_gemini({}, [], "first"),
+                self.collector._try_google_gemini({}, [], "second"),
+            )
+        self.assertEqual(self.server.requests, 2)
+
+
+class TestStreamChat(unittest.IsolatedAsyncioTestCase):
+    """SSE stream testleri"""
+
+    async def asyncSetUp(self):
+        self.server = StubServer(use_tls=False, stream_delay=0.05)
+        await self.server.start()
+        self.collector = make_collector(self.server, LLMResponseCache(disk_dir=None))
+
+    async def asyncTearDown(self):
+        await self.collector.aclose()
+        await self.server.stop()
+
+    async def collect(self, message: str) -> list:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return [event async for event in self.collector.stream_chat({}, message)]
+
+    async def test_tokens_are_forwarded_per_model(self):
+        """Test both models stream tokens and finish with the full answer"""
+        ttft = LLM_TIME_TO_FIRST_TOKEN.snapshot("Google Gemini")["count"]
+        events = await self.collect("stream please")
+
+        for model in ("Google Gemini", "GPT-OSS-20B"):
+            tokens = [
+                e["text"]
+                for e in events
+                if e["model"] == model and e["event"] == "token"
+            ]
+            done = [e for e in events if e["model"] == model and e["event"] == "done"]
+            self.assertEqual(tokens, STUB_STREAM_TOKENS)
+            self.assertEqual(done[0]["llm_response"], "".join(STUB_STREAM_TOKENS))
+            self.assertFalse(done[0]["cached"])
+
+        # Modeller birbirini beklemez: token'lar iç içe gelir
+        first_done = next(i for i, e in enumerate(events) if e["event"] == "done")
+        self.assertGreater(
+            len([e for e in events[:first_done] if e["event"] == "token"]), 3
+        )
+        self.assertEqual(
+            LLM_TIME_TO_FIRST_TOKEN.snapshot("Google Gemini")["count"], ttft + 1
+        )
+        self.assertEqual(
+            self.collector.get_collection_status()["google_gemini"]["quota_used"], 1
+        )
+
+    async def test_completed_stream_is_cached(self):
+        """Test a finished stream populates the response cache"""
+        await self.collect("stream please")
+        events = await self.collect("Stream please")
+
+        self.assertEqual(self.server.requests, 2)
+        done = [e for e in events if e["event"] == "done"]
+        self.assertEqual(len(done), 2)
+        self.assertTrue(all(e["cached"] for e in done))
+
+    async def test_upstream_error_becomes_error_event(self):
+        """Test a failing model yields an error event without breaking the other"""
+        self.server.responder = lambda method, path, body: (503, {"error": "busy"})
+        events = await self.collect("stream please")
+
+        self.assertEqual(
+            sorted((e["model"], e["error"]) for e in events),
+            [("GPT-OSS-20B", "API Error: 503"), ("Google Gemini", "API Error: 503")],
+        )
+
+
+class TestLLMStrategies(unittest.IsolatedAsyncioTestCase):
+    """parallel / first_success / hedged strateji ve sağlayıcı failover testleri"""
+
+    async def start_servers(self, gemini_latency: float, openrouter_latency: float):
+        self.gemini = StubServer(use_tls=False, latency=gemini_latency)
+        self.openrouter = StubServer(use_tls=False, latency=openrouter_latency)
+        await self.gemini.start()
+        await self.openrouter.start()
+        self.collector = make_collector(self.openrouter)
+        self.collector.gemini_base_url = f"{self.gemini.base_url}/v1beta"
+
+    async def asyncTearDown(self):
+        await self.collector.aclose()
+        await self.gemini.stop()
+        await self.openrouter.stop()
+
+    async def chat(self, strategy: str) -> tuple:
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = await self.collector.collect_startup_data({}, "ping", strategy)
+        models = [item["model"] for item in results["llm_analysis"]]
+        return models, time.perf_counter() - started
+
+    async def test_parallel_waits_for_slowest(self):
+        """Test parallel returns both answers after the slowest model"""
+        await self.start_servers(gemini_latency=0.3, openrouter_latency=0.01)
+        count = LLM_STRATEGY_SECONDS.snapshot("parallel")["count"]
+        models, elapsed = await self.chat("parallel")
+
+        self.assertEqual(models, ["Google Gemini", "GPT-OSS-20B"])
+        self.assertGreaterEqual(elapsed, 0.3)
+        self.assertEqual(LLM_STRATEGY_SECONDS.snapshot("parallel")["count"], count + 1)
+
+    async def test_first_success_cancels_slower_model(self):
+        """Test the fastest successful model wins and the other is cancelled"""
+        await self.start_servers(gemini_latency=0.5, openrouter_latency=0.01)
+        models, elapsed = await self.chat("first_success")
+
+        self.assertEqual(models, ["GPT-OSS-20B"])
+        self.assertLess(elapsed, 0.3)
+        status = self.collector.get_collection_status()
+        self.assertEqual(status["google_gemini"]["quota_used"], 0)
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.collector.in_flight.stats()["in_flight"], 0)
+
+    async def test_hedged_skips_backup_when_primary_is_fast(self):
+        """Test no backup call is made while the primary beats its p95"""
+        await self.start_servers(gemini_latency=0.01, openrouter_latency=0.01)
+        self.collector._latencies["Google Gemini"].extend([0.3] * 20)
+        models, _ = await self.chat("hedged")
+
+        self.assertEqual(models, ["Google Gemini"])
+        self.assertEqual(self.openrouter.requests, 0)
+
+    async def test_hedged_starts_backup_after_p95_delay(self):
+        """Test a slow primary triggers the backup after the p95 delay"""
+        await self.start_servers(gemini_latency=1.0, openrouter_latency=0.01)
+        self.collector._latencies["Google Gemini"].extend([0.1] * 19 + [0.15])
+        self.assertEqual(self.collector.hedge_delay("Google Gemini"), 0.15)
+        hedges = LLM_HEDGES.value("GPT-OSS-20B", "slow")
+        models, elapsed = await self.chat("hedged")
+
+        self.assertEqual(models, ["GPT-OSS-20B"])
+        self.assertGreaterEqual(elapsed, 0.15)
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(LLM_HEDGES.value("GPT-OSS-20B", "slow"), hedges + 1)
+
+    async def test_hedged_starts_backup_immediately_on_failure(self):
+        """Test a failing primary does not wait for the hedge delay"""
+        await self.start_servers(gemini_latency=0.01, openrouter_latency=0.01)
+        self.gemini.responder = lambda method, path, body: (500, {"error": "boom"})
+        models, elapsed = await self.chat("hedged")
+
+        self.assertEqual(models, ["GPT-OSS-20B"])
+        self.assertLess(elapsed, 1.0)
+
+    async def test_on_result_reports_each_model_as_it_finishes(self):
+        """Test partial results arrive per model in completion order"""
+        await self.start_servers(gemini_latency=0.2, openrouter_latency=0.01)
+        partial = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = await self.collector.collect_startup_data(
+                {},
+                "ping",
+                "parallel",
+                on_result=lambda model, items: partial.append(model),
+            )
+
+        self.assertEqual(partial, ["GPT-OSS-20B", "Google Gemini"])
+        self.assertEqual(len(results["llm_analysis"]), 2)
+
+    async def test_open_breaker_fails_over_without_upstream_call(self):
+        """Test a provider with an open breaker is skipped immediately"""
+        await self.start_servers(gemini_latency=0.01, openrouter_latency=0.01)
+        self.gemini.responder = lambda method, path, body: (503, {"error": "busy"})
+        breaker = self.collector.breakers["google"]
+        breaker.failure_threshold = 2
+        rejected = LLM_REQUESTS.value("Google Gemini", "circuit_open")
+        for _ in range(3):
+            models, _ = await self.chat("first_success")
+            self.assertEqual(models, ["GPT-OSS-20B"])
+
+        self.assertEqual(self.gemini.requests, 2)
+        self.assertEqual(
+            LLM_REQUESTS.value("Google Gemini", "circuit_open"), rejected + 1
+        )
+        status = self.collector.get_collection_status()["circuit_breakers"]
+        self.assertEqual(status["google"]["state"], "open")
+        self.assertEqual(status["openrouter"]["state"], "closed")
+
+    async def test_adaptive_timeout_cuts_slow_provider(self):
+        """Test a hung provider fails after the learned timeout, not 30 seconds"""
+        await self.start_servers(gemini_latency=2.0, openrouter_latency=0.01)
+        timeouts = AdaptiveTimeout(minimum=0.05, min_samples=5)
+        for _ in range(5):
+            timeouts.observe(0.1)
+        self.collector.timeouts["google"] = timeouts
+        self.assertAlmostEqual(timeouts.timeout(), 0.2)
+        timed_out = LLM_REQUESTS.value("Google Gemini", "timeout")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            results = await self.collector._try_google_gemini({}, [], "ping")
+            elapsed = time.perf_counter() - started
+
+        self.assertEqual(results[0]["status"], "error")
+        self.assertIn("timed out", results[0]["llm_response"])
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(LLM_REQUESTS.value("Google Gemini", "timeout"), timed_out + 1)
+        self.assertEqual(self.collector.breakers["google"].consecutive_failures, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
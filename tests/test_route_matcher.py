@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Route Matcher Tests
+Public route kurallarının method, segment sınırı ve parametre
+eşleştirmesini doğrular.
+"""
+
+import os
+import sys
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import httpx
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+
+import main
+from route_matcher import RouteMatcher, parse_rule
+
+
+class TestRouteMatcher(unittest.TestCase):
+    """RouteMatcher testleri"""
+
+    def setUp(self):
+        self.matcher = RouteMatcher(
+            [
+                "GET /",
+                "/api/health",
+                "POST /api/auth/login",
+                "/api/chat/**",
+                "GET /api/tenders/{tender_id}/pdf",
+            ]
+        )
+
+    def test_root_is_exact(self):
+        """Test "/" no longer makes every path public"""
+        self.assertTrue(self.matcher.matches("GET", "/"))
+        self.assertFalse(self.matcher.matches("GET", "/api/users/profile"))
+
+    def test_method_specific_rules(self):
+        """Test rules with a method only match that method"""
+        self.assertTrue(self.matcher.matches("POST", "/api/auth/login"))
+        self.assertFalse(self.matcher.matches("GET", "/api/auth/login"))
+        self.assertTrue(self.matcher.matches("DELETE", "/api/health"))
+
+    def test_subtree_stops_at_segment_boundary(self):
+        """Test /** rules cover the prefix and its children only"""
+        self.assertTrue(self.matcher.matches("POST", "/api/chat"))
+        self.assertTrue(self.matcher.matches("GET", "/api/chat/history"))
+        self.assertTrue(self.matcher.matches("GET", "/api/chat/history/42"))
+        self.assertFalse(self.matcher.matches("GET", "/api/chatx"))
+        self.assertFalse(self.matcher.matches("GET", "/api"))
+
+    def test_param_segments(self):
+        """Test {param} matches exactly one segment"""
+        self.assertTrue(self.matcher.matches("GET", "/api/tenders/abc-123/pdf"))
+        self.assertFalse(self.matcher.matches("GET", "/api/tenders/abc-123"))
+        self.assertFalse(self.matcher.matches("GET", "/api/tenders/a/b/pdf"))
+        self.assertFalse(self.matcher.matches("POST", "/api/tenders/abc-123/pdf"))
+
+    def test_trailing_slash_is_ignored(self):
+        """Test trailing slashes match the same rule"""
+        self.assertTrue(self.matcher.matches("GET", "/api/health/"))
+        self.assertTrue(self.matcher.matches("GET", "/api/chat/"))
+
+    def test_invalid_rules(self):
+        """Test malformed rules are rejected when compiled"""
+        self.assertEqual(parse_rule("get /api/x/"), ("GET", "/api/x"))
+        with self.assertRaises(ValueError):
+            parse_rule("GET api/x")
+        with self.assertRaises(ValueError):
+            RouteMatcher(["/api/tenders/{tender_id}/**"])
+
+
+class TestAuthMiddleware(unittest.IsolatedAsyncioTestCase):
+    """Korumalı route'larda token doğrulama testleri"""
+
+    async def test_token_lookups_run_off_the_event_loop(self):
+        """Test middleware and get_current_user verify tokens in worker threads"""
+        threads = []
+        profile = {"id": "42", "email": "user@example.com", "is_active": True}
+
+        def verify(token):
+            threads.append(threading.current_thread())
+            return {"sub": "42", "profile": profile}
+
+        def get_user(user_id):
+            threads.append(threading.current_thread())
+            return profile
+
+        transport = httpx.ASGITransport(app=main.app)
+        with mock.patch.object(
+            main.auth_service, "verify_token", side_effect=verify
+        ), mock.patch.object(main.auth_service, "get_user_by_id", side_effect=get_user):
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://t"
+            ) as client:
+                response = await client.get(
+                    "/api/auth/profile", headers={"Authorization": "Bearer uncached"}
+                )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["user"]["id"], "42")
+        self.assertEqual(len(threads), 3)
+        self.assertNotIn(threading.main_thread(), threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Startup Tests
+main.py import'unun Supabase'e ağ isteği yapmadığını, ağır paketleri
+yüklemediğini ve tüm katmanların tek bir client paylaştığını doğrular.
+"""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+
+from benchmarks.bench_startup import measure_import
+from benchmarks.profile_imports import profile_imports
+
+
+class TestStartup(unittest.IsolatedAsyncioTestCase):
+    """Başlangıç maliyeti testleri"""
+
+    async def test_import_main_makes_no_supabase_requests(self):
+        """Test importing main does not block on table probes"""
+        result = await measure_import("main", latency=0.2)
+        print(f"⏱️ import main: {result['seconds'] * 1000:.0f}ms")
+        self.assertEqual(result["requests"], 0)
+
+    def test_heavy_packages_are_imported_lazily(self):
+        """Test the supabase SDK and PDF engines stay out of the import path"""
+        profile = profile_imports("main")
+        print(f"⏱️ import main (-X importtime): {profile['total_us'] / 1000:.0f}ms")
+        for package in ("supabase", "gotrue", "reportlab", "weasyprint"):
+            self.assertNotIn(package, profile["modules"])
+
+    def test_repositories_share_the_global_client(self):
+        """Test auth and repositories reuse the process-wide database manager"""
+        import supabase_database
+        from repositories import project_management_repo
+        from supabase_auth import auth_service
+
+        self.assertIs(project_management_repo.db, supabase_database.db)
+        self.assertIs(auth_service.db, supabase_database.db)
+
+
+if __name__ == "__main__":
+    unittest.main()
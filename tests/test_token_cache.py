@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Token Cache Tests
+TokenCache'in TTL, LRU sınırı, exp claim'i ve invalidation davranışını doğrular.
+"""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from token_cache import TokenCache
+
+
+class FakeClock:
+    """Test için elle ilerletilen saat"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def payload(user_id: str) -> dict:
+    return {"sub": user_id, "user_id": user_id, "profile": {"id": user_id}}
+
+
+class TestTokenCache(unittest.TestCase):
+    """TokenCache testleri"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = TokenCache(max_entries=3, ttl=60.0, clock=self.clock)
+
+    def test_hit_and_ttl_expiry(self):
+        """Test cached payload is served until the TTL elapses"""
+        self.cache.set("tok-a", payload("u1"))
+        self.assertEqual(self.cache.get("tok-a")["sub"], "u1")
+
+        self.clock.now += 61
+        self.assertIsNone(self.cache.get("tok-a"))
+        self.assertEqual(self.cache.stats()["tokens"], 0)
+
+    def test_exp_claim_caps_entry_lifetime(self):
+        """Test entries never outlive the token's exp claim"""
+        self.cache.set("tok-a", payload("u1"), exp=time.time() + 5)
+        self.assertIsNotNone(self.cache.get("tok-a"))
+
+        self.clock.now += 6
+        self.assertIsNone(self.cache.get("tok-a"))
+
+        # Süresi geçmiş token hiç cache'lenmez
+        self.cache.set("tok-b", payload("u1"), exp=time.time() - 1)
+        self.assertIsNone(self.cache.get("tok-b"))
+
+    def test_lru_bound(self):
+        """Test least recently used token is evicted at capacity"""
+        for name in ("a", "b", "c"):
+            self.cache.set(f"tok-{name}", payload(f"u-{name}"))
+        self.cache.get("tok-a")
+        self.cache.set("tok-d", payload("u-d"))
+
+        self.assertIsNotNone(self.cache.get("tok-a"))
+        self.assertIsNone(self.cache.get("tok-b"))
+        self.assertEqual(self.cache.stats()["tokens"], 3)
+
+    def test_invalidate_user_drops_tokens_and_profile(self):
+        """Test profile updates invalidate every token of that user"""
+        self.cache.set("tok-a", payload("u1"))
+        self.cache.set("tok-b", payload("u1"))
+        self.cache.set("tok-c", payload("u2"))
+        self.cache.set_user("u1", {"id": "u1", "is_admin": False})
+
+        self.cache.invalidate_user("u1")
+
+        self.assertIsNone(self.cache.get("tok-a"))
+        self.assertIsNone(self.cache.get("tok-b"))
+        self.assertIsNone(self.cache.get_user("u1"))
+        self.assertIsNotNone(self.cache.get("tok-c"))
+
+    def test_raw_token_not_stored(self):
+        """Test only token hashes are kept in memory"""
+        self.cache.set("secret-token", payload("u1"))
+        self.assertNotIn("secret-token", self.cache._tokens)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Token Verification Cache
+Doğrulanmış JWT payload'ları ve kullanıcı profilleri için sınırlı TTL cache'i
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Set
+
+
+class TokenCache:
+    """Token hash'i ile anahtarlanan, LRU sınırlı TTL cache
+
+    Token'lar hash'lenerek saklanır (ham token bellekte tutulmaz). Kayıtlar
+    en geç token'ın `exp` zamanında düşer. Kullanıcı profilleri user_id ile
+    ayrıca tutulur; `invalidate_user` hem profili hem de o kullanıcıya ait
+    tüm token kayıtlarını siler.
+
+    Not: Cache process başınadır; diğer worker'lardaki kayıtlar en geç TTL
+    sonunda tazelenir.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # token_hash -> (expires_at, user_id, payload)
+        self._tokens: "OrderedDict[str, tuple]" = OrderedDict()
+        # user_id -> (expires_at, profile)
+        self._users: "OrderedDict[str, tuple]" = OrderedDict()
+        # user_id -> token hash'leri (invalidation için)
+        self._user_tokens: Dict[str, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _hash(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def _expiry(self, exp: Optional[float]) -> float:
+        """TTL'i token'ın exp claim'i ile sınırla (monotonic saate çevirerek)"""
+        now = self._clock()
+        expires_at = now + self.ttl
+        if exp is not None:
+            expires_at = min(expires_at, now + (float(exp) - time.time()))
+        return expires_at
+
+    def get(self, token: str) -> Optional[Dict]:
+        """Token için cache'lenmiş payload'ı döndür"""
+        key = self._hash(token)
+        with self._lock:
+            entry = self._tokens.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, user_id, payload = entry
+            if expires_at <= self._clock():
+                self._drop_token(key)
+                self.misses += 1
+                return None
+            self._tokens.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def set(self, token: str, payload: Dict, exp: Optional[float] = None):
+        """Doğrulanmış token payload'ını cache'le"""
+        user_id = payload.get("sub")
+        if not user_id:
+            return
+        key = self._hash(token)
+        expires_at = self._expiry(exp)
+        if expires_at <= self._clock():
+            return
+        with self._lock:
+            self._tokens[key] = (expires_at, user_id, payload)
+            self._tokens.move_to_end(key)
+            self._user_tokens.setdefault(user_id, set()).add(key)
+            while len(self._tokens) > self.max_entries:
+                oldest = next(iter(self._tokens))
+                self._drop_token(oldest)
+
+    def get_user(self, user_id: str) -> Optional[Dict]:
+        """Cache'lenmiş kullanıcı profilini döndür"""
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, profile = entry
+            if expires_at <= self._clock():
+                del self._users[user_id]
+                self.misses += 1
+                return None
+            self._users.move_to_end(user_id)
+            self.hits += 1
+            return profile
+
+    def set_user(self, user_id: str, profile: Dict):
+        """Kullanıcı profilini cache'le"""
+        with self._lock:
+            self._users[user_id] = (self._clock() + self.ttl, profile)
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_entries:
+                self._users.popitem(last=False)
+
+    def invalidate_user(self, user_id: str):
+        """Kullanıcının profilini ve tüm token kayıtlarını sil"""
+        with self._lock:
+            self._users.pop(user_id, None)
+            for key in self._user_tokens.pop(user_id, set()):
+                self._tokens.pop(key, None)
+
+    def clear(self):
+        """Tüm cache'i temizle"""
+        with self._lock:
+            self._tokens.clear()
+            self._users.clear()
+            self._user_tokens.clear()
+
+    def stats(self) -> Dict:
+        """Cache istatistiklerini döndür"""
+        with self._lock:
+            return {
+                "tokens": len(self._tokens),
+                "users": len(self._users),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _drop_token(self, key: str):
+        """Token kaydını sil (lock tutulurken çağrılır)"""
+        entry = self._tokens.pop(key, None)
+        if entry is None:
+            return
+        user_keys = self._user_tokens.get(entry[1])
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._user_tokens[entry[1]]